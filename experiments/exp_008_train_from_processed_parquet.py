@@ -82,28 +82,28 @@ def main() -> None:
     }
     winner = select_winner_by_rmse_then_mae(all_metrics)
 
+    schema = build_schema_v2(contract.feature_columns)
     if winner == "linear_regression":
-        weights = [float(value) for value in model_a.coef_.tolist()]
-        bias = float(model_a.intercept_)
+        model_artifact = {
+            "model_id": model_id,
+            "type": "linear",
+            "bias": float(model_a.intercept_),
+            "weights": [float(value) for value in model_a.coef_.tolist()],
+            "schema": schema,
+        }
     else:
+        # Exported as fitted; the registry folds the scaler in at load time.
         scaler: StandardScaler = model_b.named_steps["scaler"]
         ridge: Ridge = model_b.named_steps["ridge"]
-        weights_scaled = ridge.coef_
-        weights_original = weights_scaled / scaler.scale_
-        bias_original = ridge.intercept_ - np.sum(
-            (scaler.mean_ / scaler.scale_) * weights_scaled
-        )
-        weights = [float(value) for value in weights_original.tolist()]
-        bias = float(bias_original)
-
-    schema = build_schema_v2(contract.feature_columns)
-    model_artifact = {
-        "model_id": model_id,
-        "type": "linear",
-        "bias": bias,
-        "weights": weights,
-        "schema": schema,
-    }
+        model_artifact = {
+            "model_id": model_id,
+            "type": "scaled_linear",
+            "bias": float(ridge.intercept_),
+            "weights": [float(value) for value in ridge.coef_.tolist()],
+            "mean": [float(value) for value in scaler.mean_.tolist()],
+            "scale": [float(value) for value in scaler.scale_.tolist()],
+            "schema": schema,
+        }
 
     model_out_dir = Path("artifacts") / "models" / model_id
     model_out_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,118 @@
+"""Experiment 009: recall/latency of IVF cross-case evidence search.
+
+Builds a synthetic multi-case evidence index under a temporary directory,
+runs the same queries through exact and IVF (`EVIDENCE_ANN_MODE=ivf`) portfolio
+search for a sweep of `nprobe` values, and reports recall@k against the exact
+top-k plus median/p95 query latency. No external inputs are required.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from caseflow.core.settings import clear_settings_cache
+from caseflow.domain.mortgage.evidence import EvidenceChunk
+from caseflow.ml.ann import recall_at_k
+from caseflow.ml.vector_store import FileVectorStore
+
+NUM_CASES = 200
+CHUNKS_PER_CASE = 100
+NUM_QUERIES = 100
+TOP_K = 10
+NPROBE_SWEEP = [1, 4, 8, 16, 32, 64]
+
+
+def _corpus(rng: np.random.Generator) -> tuple[list[EvidenceChunk], list[str]]:
+    vocabulary = [f"term{index}" for index in range(2_000)]
+    chunks = []
+    for case_index in range(NUM_CASES):
+        case_id = f"case_{case_index:04d}"
+        for chunk_index in range(CHUNKS_PER_CASE):
+            text = " ".join(rng.choice(vocabulary, size=40))
+            chunks.append(
+                EvidenceChunk(
+                    case_id=case_id,
+                    document_id=f"doc_{chunk_index % 5}",
+                    chunk_id=f"{case_id}_{chunk_index:04d}",
+                    text=text,
+                    start_char=0,
+                    end_char=len(text),
+                    source="synthetic",
+                    page=None,
+                )
+            )
+    queries = [" ".join(rng.choice(vocabulary, size=6)) for _ in range(NUM_QUERIES)]
+    return chunks, queries
+
+
+def _run(store: FileVectorStore, queries: list[str]) -> tuple[list[list[str]], dict]:
+    store.search(queries[0], top_k=TOP_K)
+    results = []
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        hits = store.search(query, top_k=TOP_K)
+        timings.append((time.perf_counter() - started) * 1000.0)
+        results.append([hit.chunk.chunk_id for hit in hits])
+    latency = {
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p95_ms": float(np.percentile(timings, 95)),
+    }
+    return results, latency
+
+
+def main() -> None:
+    rng = np.random.default_rng(9)
+    chunks, queries = _corpus(rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = Path(tmp) / "index.json"
+        writer = FileVectorStore(index_file=index_file, ann_mode="exact")
+        writer.add_documents(chunks)
+        writer.compact()
+
+        exact_results, exact_latency = _run(writer, queries)
+        print(
+            f"[stage] exact: chunks={len(chunks)} "
+            f"p50_ms={exact_latency['p50_ms']:.3f} p95_ms={exact_latency['p95_ms']:.3f}"
+        )
+
+        sweep = []
+        for nprobe in NPROBE_SWEEP:
+            os.environ["EVIDENCE_ANN_NPROBE"] = str(nprobe)
+            clear_settings_cache()
+            store = FileVectorStore(index_file=index_file, ann_mode="ivf")
+            approximate, latency = _run(store, queries)
+            recall = recall_at_k(exact_results, approximate)
+            sweep.append({"nprobe": nprobe, "recall_at_k": recall, **latency})
+            print(
+                f"[stage] ivf nprobe={nprobe}: recall@{TOP_K}={recall:.4f} "
+                f"p50_ms={latency['p50_ms']:.3f} p95_ms={latency['p95_ms']:.3f}"
+            )
+        os.environ.pop("EVIDENCE_ANN_NPROBE", None)
+        clear_settings_cache()
+
+    report = {
+        "experiment": "exp_009_evidence_ann_recall",
+        "num_cases": NUM_CASES,
+        "chunks_per_case": CHUNKS_PER_CASE,
+        "num_queries": NUM_QUERIES,
+        "top_k": TOP_K,
+        "exact": exact_latency,
+        "ivf": sweep,
+    }
+    report_dir = Path("artifacts") / "reports"
+    report_dir.mkdir(parents=True, exist_ok=True)
+    report_path = report_dir / "exp_009_metrics.json"
+    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"[stage] export_report={report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Experiment 010: memory, latency and score drift of quantized evidence storage.
+
+Builds the same synthetic multi-case evidence index once per
+`EVIDENCE_EMBEDDING_STORAGE` (float32, float16, int8) under a temporary
+directory and reports, relative to float32:
+
+- on-disk and resident bytes of the embedding matrix (codes plus int8 scales),
+- median/p95 latency of exact cross-case search,
+- score drift (mean/max absolute cosine error over every query/chunk pair),
+- recall@k of the top-k chunk ids.
+
+No external inputs are required.
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from caseflow.domain.mortgage.evidence import EvidenceChunk
+from caseflow.ml.ann import recall_at_k
+from caseflow.ml.embeddings import embed_texts
+from caseflow.ml.quantization import quantize, quantized_scores
+from caseflow.ml.vector_store import FileVectorStore
+
+NUM_CASES = 200
+CHUNKS_PER_CASE = 100
+NUM_QUERIES = 100
+TOP_K = 10
+STORAGES = ["float32", "float16", "int8"]
+
+
+def _corpus(rng: np.random.Generator) -> tuple[list[EvidenceChunk], list[str]]:
+    vocabulary = [f"term{index}" for index in range(2_000)]
+    chunks = []
+    for case_index in range(NUM_CASES):
+        case_id = f"case_{case_index:04d}"
+        for chunk_index in range(CHUNKS_PER_CASE):
+            text = " ".join(rng.choice(vocabulary, size=40))
+            chunks.append(
+                EvidenceChunk(
+                    case_id=case_id,
+                    document_id=f"doc_{chunk_index % 5}",
+                    chunk_id=f"{case_id}_{chunk_index:04d}",
+                    text=text,
+                    start_char=0,
+                    end_char=len(text),
+                    source="synthetic",
+                    page=None,
+                )
+            )
+    queries = [" ".join(rng.choice(vocabulary, size=6)) for _ in range(NUM_QUERIES)]
+    return chunks, queries
+
+
+def _run(store: FileVectorStore, queries: list[str]) -> tuple[list[list[str]], dict]:
+    store.search(queries[0], top_k=TOP_K)
+    results = []
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        hits = store.search(query, top_k=TOP_K)
+        timings.append((time.perf_counter() - started) * 1000.0)
+        results.append([hit.chunk.chunk_id for hit in hits])
+    latency = {
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p95_ms": float(np.percentile(timings, 95)),
+    }
+    return results, latency
+
+
+def _disk_bytes(root: Path) -> int:
+    suffixes = {".f32", ".f16", ".i8", ".scale"}
+    return sum(
+        path.stat().st_size
+        for path in (root / "cases").rglob("seg-*")
+        if path.suffix in suffixes
+    )
+
+
+def _drift(
+    embeddings: np.ndarray, queries: np.ndarray, storage: str
+) -> dict[str, float]:
+    exact = embeddings @ queries.T
+    codes, scales = quantize(embeddings, storage)
+    errors = np.abs(quantized_scores(codes, scales, queries.T) - exact)
+    return {
+        "mean_abs_score_error": float(errors.mean()),
+        "max_abs_score_error": float(errors.max()),
+        "resident_bytes": int(
+            codes.nbytes + (scales.nbytes if scales is not None else 0)
+        ),
+    }
+
+
+def main() -> None:
+    rng = np.random.default_rng(10)
+    chunks, queries = _corpus(rng)
+    dims = FileVectorStore().dims
+    embeddings = embed_texts([chunk.text for chunk in chunks], dims=dims)
+    query_matrix = embed_texts(queries, dims=dims)
+
+    rows = []
+    baseline: list[list[str]] | None = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for storage in STORAGES:
+            root = Path(tmp) / storage
+            store = FileVectorStore(
+                index_file=root / "index.json", ann_mode="exact", storage=storage
+            )
+            store.add_documents(chunks)
+            store.compact()
+
+            results, latency = _run(store, queries)
+            baseline = baseline or results
+            row = {
+                "storage": storage,
+                "disk_bytes": _disk_bytes(root),
+                **_drift(embeddings, query_matrix, storage),
+                "recall_at_k": recall_at_k(baseline, results),
+                **latency,
+            }
+            rows.append(row)
+            print(
+                f"[stage] {storage}: disk_bytes={row['disk_bytes']} "
+                f"resident_bytes={row['resident_bytes']} "
+                f"max_abs_score_error={row['max_abs_score_error']:.5f} "
+                f"recall@{TOP_K}={row['recall_at_k']:.4f} "
+                f"p50_ms={latency['p50_ms']:.3f} p95_ms={latency['p95_ms']:.3f}"
+            )
+
+    report = {
+        "experiment": "exp_010_evidence_quantized_storage",
+        "num_cases": NUM_CASES,
+        "chunks_per_case": CHUNKS_PER_CASE,
+        "num_queries": NUM_QUERIES,
+        "dims": dims,
+        "top_k": TOP_K,
+        "storages": rows,
+    }
+    report_dir = Path("artifacts") / "reports"
+    report_dir.mkdir(parents=True, exist_ok=True)
+    report_path = report_dir / "exp_010_metrics.json"
+    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"[stage] export_report={report_path}")
+
+
+if __name__ == "__main__":
+    main()
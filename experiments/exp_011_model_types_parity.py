@@ -0,0 +1,193 @@
+"""Experiment 011: NumPy scoring of registry model types vs scikit-learn.
+
+Trains a `LogisticRegression`, a `StandardScaler` + `Ridge` pipeline and a
+`GradientBoostingRegressor` on synthetic data, exports each to its registry
+format (`logistic`, `scaled_linear`, and `tree_ensemble` with an `.npz`
+sidecar) under a temporary registry, loads them back through
+`caseflow.ml.registry.load_model` and reports, per model type:
+
+- max absolute score difference against the scikit-learn prediction,
+- batch scoring time for all rows, NumPy runtime vs scikit-learn,
+- single-row `predict` latency of the NumPy runtime.
+
+Requires the `ml` dependency group (scikit-learn); no external inputs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.linear_model import LogisticRegression, Ridge
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml.registry import load_model
+
+NUM_ROWS = 20_000
+NUM_FEATURES = 8
+SINGLE_ROW_CALLS = 2_000
+
+
+def _data(rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    X = rng.normal(size=(NUM_ROWS, NUM_FEATURES)) * rng.uniform(0.5, 20.0, NUM_FEATURES)
+    signal = X @ rng.normal(size=NUM_FEATURES) + np.sin(X[:, 0])
+    y_reg = signal + rng.normal(scale=0.5, size=NUM_ROWS)
+    y_cls = (signal > np.median(signal)).astype(int)
+    return X, y_reg, y_cls
+
+
+def _export_logistic(model: LogisticRegression) -> dict:
+    return {
+        "type": "logistic",
+        "bias": float(model.intercept_[0]),
+        "weights": model.coef_[0].tolist(),
+    }
+
+
+def _export_scaled_ridge(pipeline: Pipeline) -> dict:
+    scaler: StandardScaler = pipeline.named_steps["scaler"]
+    ridge: Ridge = pipeline.named_steps["ridge"]
+    return {
+        "type": "scaled_linear",
+        "bias": float(ridge.intercept_),
+        "weights": ridge.coef_.tolist(),
+        "mean": scaler.mean_.tolist(),
+        "scale": scaler.scale_.tolist(),
+    }
+
+
+def _export_boosting(
+    model: GradientBoostingRegressor, X: np.ndarray
+) -> tuple[dict, dict[str, np.ndarray]]:
+    """Flatten the boosted trees into shared node arrays.
+
+    Leaf values are pre-multiplied by the learning rate, and the initial
+    estimator's constant prediction becomes ``base_score``.
+    """
+    roots, feature, threshold, left, right, value = [], [], [], [], [], []
+    offset = 0
+    for estimator in model.estimators_[:, 0]:
+        tree = estimator.tree_
+        is_leaf = tree.children_left < 0
+        roots.append(offset)
+        feature.append(np.where(is_leaf, -1, tree.feature))
+        threshold.append(tree.threshold)
+        left.append(np.where(is_leaf, -1, tree.children_left + offset))
+        right.append(np.where(is_leaf, -1, tree.children_right + offset))
+        value.append(tree.value[:, 0, 0] * model.learning_rate)
+        offset += tree.node_count
+
+    arrays = {
+        "roots": np.asarray(roots, dtype=np.int32),
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold),
+        "left": np.concatenate(left).astype(np.int32),
+        "right": np.concatenate(right).astype(np.int32),
+        "value": np.concatenate(value),
+    }
+    payload = {
+        "type": "tree_ensemble",
+        "n_features": NUM_FEATURES,
+        "base_score": float(model.init_.predict(X[:1])[0]),
+        "arrays": "trees.npz",
+    }
+    return payload, arrays
+
+
+def _timed(function, *args) -> tuple[np.ndarray, float]:
+    started = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - started) * 1000.0
+
+
+def main() -> None:
+    rng = np.random.default_rng(11)
+    X, y_reg, y_cls = _data(rng)
+
+    logistic = LogisticRegression(max_iter=1_000).fit(X, y_cls)
+    scaled_ridge = Pipeline(
+        [("scaler", StandardScaler()), ("ridge", Ridge(alpha=1.0))]
+    ).fit(X, y_reg)
+    boosting = GradientBoostingRegressor(
+        n_estimators=100, max_depth=3, random_state=11
+    ).fit(X, y_reg)
+
+    candidates = {
+        "logistic_v1": (
+            _export_logistic(logistic),
+            {},
+            lambda rows: logistic.predict_proba(rows)[:, 1],
+        ),
+        "scaled_ridge_v1": (
+            _export_scaled_ridge(scaled_ridge),
+            {},
+            scaled_ridge.predict,
+        ),
+        "boosted_trees_v1": (
+            *_export_boosting(boosting, X),
+            boosting.predict,
+        ),
+    }
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["MODEL_REGISTRY_DIR"] = tmp
+        clear_settings_cache()
+        for model_id, (payload, arrays, reference) in candidates.items():
+            model_dir = Path(tmp) / model_id
+            model_dir.mkdir()
+            if arrays:
+                np.savez(model_dir / payload["arrays"], **arrays)
+            (model_dir / "model.json").write_text(
+                json.dumps({"model_id": model_id, **payload}), encoding="utf-8"
+            )
+
+            model = load_model(model_id)
+            expected, sklearn_ms = _timed(reference, X)
+            scores, numpy_ms = _timed(model.predict_batch, X)
+
+            single = X[:SINGLE_ROW_CALLS].tolist()
+            started = time.perf_counter()
+            for features in single:
+                model.predict(features)
+            single_us = (time.perf_counter() - started) * 1e6 / len(single)
+
+            row = {
+                "model_id": model_id,
+                "type": model.type,
+                "max_abs_score_diff": float(np.max(np.abs(scores - expected))),
+                "batch_ms_numpy": numpy_ms,
+                "batch_ms_sklearn": sklearn_ms,
+                "single_row_us_numpy": single_us,
+            }
+            rows.append(row)
+            print(
+                f"[stage] {model_id}: type={row['type']} "
+                f"max_abs_score_diff={row['max_abs_score_diff']:.3e} "
+                f"batch_ms numpy={numpy_ms:.2f} sklearn={sklearn_ms:.2f} "
+                f"single_row_us={single_us:.1f}"
+            )
+        clear_settings_cache()
+
+    report = {
+        "experiment": "exp_011_model_types_parity",
+        "num_rows": NUM_ROWS,
+        "num_features": NUM_FEATURES,
+        "models": rows,
+    }
+    report_dir = Path("artifacts") / "reports"
+    report_dir.mkdir(parents=True, exist_ok=True)
+    report_path = report_dir / "exp_011_metrics.json"
+    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"[stage] export_report={report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,7 +27,15 @@ from caseflow.core.rate_limit import (
 )
 from caseflow.core.request_id import install_request_id_middleware
 from caseflow.core.settings import get_settings
-from caseflow.ml.registry import clear_active_model, set_active_model
+from caseflow.ml.evidence_indexer import shutdown_index_jobs, shutdown_index_pool
+from caseflow.ml.registry import (
+    clear_active_model,
+    clear_model_cache,
+    load_active_model,
+    start_model_watcher,
+    stop_model_watcher,
+)
+from caseflow.ml.shadow import shutdown_shadow_executor
 
 configure_logging()
 
@@ -49,13 +57,14 @@ def _safe_error_message(message: str, max_length: int = 180) -> str:
 async def lifespan(app: FastAPI):
     settings = get_settings()
     clear_active_model()
+    clear_model_cache()
     clear_rate_limiter_cache()
     clear_audit_sink_cache()
     clear_metrics()
     clear_policy_cache()
 
     try:
-        set_active_model(settings.active_model_id)
+        active_model = load_active_model()
     except Exception as exc:  # pragma: no cover - broad on purpose for startup safety
         error_message = _safe_error_message(str(exc))
         app.state.startup_model_status = {
@@ -83,18 +92,25 @@ async def lifespan(app: FastAPI):
             "startup model loaded",
             extra={
                 "event": "startup_model_loaded",
-                "active_model_id": settings.active_model_id,
+                "active_model_id": active_model.model_id,
             },
         )
 
+    start_model_watcher()
+
     try:
         yield
     finally:
+        stop_model_watcher()
+        shutdown_shadow_executor()
         clear_active_model()
+        clear_model_cache()
         clear_rate_limiter_cache()
         clear_audit_sink_cache()
         clear_metrics()
         clear_policy_cache()
+        shutdown_index_jobs()
+        shutdown_index_pool()
 
 
 app = FastAPI(title="caseflow-decision-lab API", lifespan=lifespan)
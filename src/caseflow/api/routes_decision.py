@@ -1,14 +1,28 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from datetime import datetime, timezone
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Request
-
+from fastapi.responses import StreamingResponse
+
+from caseflow.api.routes_predict import (
+    batch_row_error,
+    batch_row_header,
+    feature_vector,
+    resolve_model,
+    score_batch_rows,
+    shadow_batch,
+    stream_batch,
+)
 from caseflow.core.audit import get_audit_sink
+from caseflow.core.ndjson import NDJSON_MEDIA_TYPE, encode_ndjson, read_batch_rows
 from caseflow.core.policy import evaluate_policy, load_policy
-from caseflow.ml.registry import get_active_model
+from caseflow.ml.registry import RegistryModel
+from caseflow.ml.shadow import submit_shadow_scores
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -17,6 +31,43 @@ APPROVE_THRESHOLD = 200.0
 DECLINE_THRESHOLD = 120.0
 
 
+def _policy_features(model: RegistryModel, features: object) -> dict[str, Any]:
+    if isinstance(features, dict):
+        return features
+    if model.feature_names is not None and isinstance(features, list):
+        if len(features) == len(model.feature_names):
+            return {name: value for name, value in zip(model.feature_names, features)}
+    return {}
+
+
+def _decide(policy_features: dict[str, Any], score: float) -> tuple[str, list[str]]:
+    try:
+        return evaluate_policy(policy_features)
+    except ValueError:
+        if score >= APPROVE_THRESHOLD:
+            return "approve", ["score_above_approve_threshold"]
+        if score <= DECLINE_THRESHOLD:
+            return "decline", ["score_below_decline_threshold"]
+        return "review", ["score_in_review_band"]
+
+
+def _timestamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _log_audit_failure(exc: Exception, request_id: str, model_id: str) -> None:
+    logger.error(
+        "decision_audit_emit_failed",
+        extra={
+            "event": "decision_audit_emit_failed",
+            "request_id": request_id,
+            "model_id": model_id,
+            "error_type": exc.__class__.__name__,
+            "error_message": str(exc),
+        },
+    )
+
+
 @router.post("/decision")
 async def decision_endpoint(request: Request) -> dict[str, Any]:
     try:
@@ -30,56 +81,19 @@ async def decision_endpoint(request: Request) -> dict[str, Any]:
         )
 
     features = payload.get("features")
-    model = get_active_model()
-
-    if isinstance(features, list):
-        try:
-            numeric_features = [float(value) for value in features]
-        except (TypeError, ValueError) as exc:
-            raise HTTPException(
-                status_code=400,
-                detail="'features' must contain only numeric values",
-            ) from exc
-    elif isinstance(features, dict):
-        try:
-            numeric_features = model.vector_from_named_features(features)
-        except ValueError as exc:
-            raise HTTPException(status_code=422, detail=str(exc)) from exc
-    else:
-        raise HTTPException(
-            status_code=400,
-            detail="'features' must be a list of numbers or an object",
-        )
+    model = resolve_model(request, payload)
+    numeric_features = feature_vector(model, features)
 
     try:
         score = model.predict(numeric_features)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
+    submit_shadow_scores(model, [features], [score])
+
     policy = load_policy()
     policy_version = str(policy["policy_version"])
-
-    policy_features: dict[str, Any] = {}
-    if isinstance(features, dict):
-        policy_features = features
-    elif model.feature_names is not None and isinstance(features, list):
-        if len(features) == len(model.feature_names):
-            policy_features = {
-                name: value for name, value in zip(model.feature_names, features)
-            }
-
-    try:
-        decision, reasons = evaluate_policy(policy_features)
-    except ValueError:
-        if score >= APPROVE_THRESHOLD:
-            decision = "approve"
-            reasons = ["score_above_approve_threshold"]
-        elif score <= DECLINE_THRESHOLD:
-            decision = "decline"
-            reasons = ["score_below_decline_threshold"]
-        else:
-            decision = "review"
-            reasons = ["score_in_review_band"]
+    decision, reasons = _decide(_policy_features(model, features), score)
 
     request_id = getattr(request.state, "request_id", "") or ""
     logger.info(
@@ -94,7 +108,7 @@ async def decision_endpoint(request: Request) -> dict[str, Any]:
     )
 
     audit_event = {
-        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "timestamp": _timestamp(),
         "request_id": request_id,
         "model_id": model.model_id,
         "score": score,
@@ -105,16 +119,7 @@ async def decision_endpoint(request: Request) -> dict[str, Any]:
     try:
         get_audit_sink().emit_decision_event(audit_event)
     except Exception as exc:  # pragma: no cover - defensive
-        logger.error(
-            "decision_audit_emit_failed",
-            extra={
-                "event": "decision_audit_emit_failed",
-                "request_id": request_id,
-                "model_id": model.model_id,
-                "error_type": exc.__class__.__name__,
-                "error_message": str(exc),
-            },
-        )
+        _log_audit_failure(exc, request_id, model.model_id)
 
     return {
         "model_id": model.model_id,
@@ -124,3 +129,83 @@ async def decision_endpoint(request: Request) -> dict[str, Any]:
         "policy_version": policy_version,
         "request_id": request_id,
     }
+
+
+@router.post("/decision/batch")
+async def decision_batch_endpoint(request: Request) -> StreamingResponse:
+    """Decide a JSON array or NDJSON stream of ``/decision`` payloads.
+
+    Scores are computed per chunk in one product, policy is evaluated per
+    row, and each chunk's audit events are emitted in a single sink call.
+    Audit events carry the batch ``request_id`` plus the row ``index``.
+    """
+    model = resolve_model(request)
+    policy_version = str(load_policy()["policy_version"])
+    rows = await read_batch_rows(request)
+    request_id = getattr(request.state, "request_id", "") or ""
+    counts: dict[str, int] = {}
+
+    def encode_chunk(chunk: list[Any], start: int) -> bytes:
+        scores, errors = score_batch_rows(model, chunk)
+        shadow_batch(model, chunk, scores, errors)
+        timestamp = _timestamp()
+        lines = []
+        audit_events = []
+        for offset, (row, score, error) in enumerate(zip(chunk, scores, errors)):
+            line = batch_row_header(row, start + offset)
+            if error is not None:
+                line.update(batch_row_error(error))
+                counts["error"] = counts.get("error", 0) + 1
+                lines.append(encode_ndjson(line))
+                continue
+
+            score = float(score)
+            decision, reasons = _decide(
+                _policy_features(model, row.get("features")), score
+            )
+            counts[decision] = counts.get(decision, 0) + 1
+            line.update(
+                {
+                    "model_id": model.model_id,
+                    "score": score,
+                    "decision": decision,
+                    "reasons": reasons,
+                    "policy_version": policy_version,
+                }
+            )
+            lines.append(encode_ndjson(line))
+            audit_events.append(
+                {
+                    "timestamp": timestamp,
+                    "request_id": request_id,
+                    "index": start + offset,
+                    "model_id": model.model_id,
+                    "score": score,
+                    "policy_version": policy_version,
+                    "decision": decision,
+                    "reasons": reasons,
+                }
+            )
+
+        if audit_events:
+            try:
+                get_audit_sink().emit_decision_events(audit_events)
+            except Exception as exc:  # pragma: no cover - defensive
+                _log_audit_failure(exc, request_id, model.model_id)
+        return b"".join(lines)
+
+    async def body() -> AsyncIterator[bytes]:
+        async with aclosing(stream_batch(rows, encode_chunk)) as chunks:
+            async for lines in chunks:
+                yield lines
+        logger.info(
+            "decision_batch_made",
+            extra={
+                "event": "decision_batch_made",
+                "model_id": model.model_id,
+                "request_id": request_id,
+                "counts": counts,
+            },
+        )
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
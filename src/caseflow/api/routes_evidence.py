@@ -2,15 +2,32 @@ from __future__ import annotations
 
 import logging
 import time
-
-from fastapi import APIRouter, HTTPException, Query, Request
+from pathlib import Path
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 from caseflow.core.metrics import increment_metric, observe_ms_metric, set_gauge_metric
 from caseflow.core.settings import get_settings
-from caseflow.domain.mortgage.evidence import chunk_text
-from caseflow.domain.mortgage.provenance import load_extracted_text
-from caseflow.ml.vector_store import FileVectorStore
+from caseflow.domain.mortgage.provenance import (
+    extracted_text_path,
+    source_fingerprint,
+)
+from caseflow.ml.evidence_indexer import (
+    compact_case_index,
+    get_index_job,
+    submit_index_job,
+    write_case_documents,
+)
+from caseflow.ml.vector_store import FileVectorStore, SearchResult
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -29,18 +46,32 @@ class EvidenceReindexRequest(BaseModel):
     documents: list[EvidenceDocumentRef]
 
 
-def _collect_chunks(
+class EvidenceSearchQuery(BaseModel):
+    case_id: str
+    q: str
+
+
+class EvidenceSearchBatchRequest(BaseModel):
+    queries: list[EvidenceSearchQuery]
+    top_k: int = 5
+
+
+MAX_BATCH_QUERIES = 256
+
+
+def _resolve_documents(
     *,
     case_id: str,
     documents: list[EvidenceDocumentRef],
-) -> list:
+) -> tuple[list[tuple[str, Path]], dict[str, str]]:
     if not documents:
         raise HTTPException(
             status_code=422,
             detail="'documents' must be a non-empty list",
         )
 
-    all_chunks = []
+    resolved = []
+    fingerprints = {}
     for item in documents:
         document_id = item.document_id.strip()
         if not document_id:
@@ -50,22 +81,66 @@ def _collect_chunks(
             )
 
         try:
-            extracted = load_extracted_text(case_id, document_id)
+            text_path = extracted_text_path(case_id, document_id)
+            fingerprints[document_id] = source_fingerprint(case_id, document_id)
         except FileNotFoundError as exc:
             raise HTTPException(status_code=422, detail=str(exc)) from exc
         except ValueError as exc:
             raise HTTPException(status_code=422, detail=str(exc)) from exc
 
-        all_chunks.extend(
-            chunk_text(
-                case_id=case_id,
-                document_id=document_id,
-                text=extracted,
-                source="provenance",
-            )
-        )
+        resolved.append((document_id, text_path))
 
-    return all_chunks
+    return resolved, fingerprints
+
+
+def _search_result_payload(item: SearchResult) -> dict[str, object]:
+    return {
+        "score": item.score,
+        "document_id": item.chunk.document_id,
+        "chunk_id": item.chunk.chunk_id,
+        "start_char": item.chunk.start_char,
+        "end_char": item.chunk.end_char,
+        "text": item.chunk.text,
+    }
+
+
+def _submit_job(
+    *,
+    case_id: str,
+    documents: list[tuple[str, Path]],
+    fingerprints: dict[str, str],
+    overwrite: bool,
+    skip_unchanged: bool,
+    request: Request,
+    response: Response,
+) -> dict[str, object]:
+    job, created = submit_index_job(
+        case_id=case_id,
+        documents=documents,
+        overwrite=overwrite,
+        fingerprints=fingerprints,
+        skip_unchanged=skip_unchanged,
+    )
+    response.status_code = 202
+
+    request_id = getattr(request.state, "request_id", "") or ""
+    logger.info(
+        "evidence_index_job_submitted",
+        extra={
+            "event": "evidence_index_job_submitted",
+            "case_id": case_id,
+            "job_id": job.job_id,
+            "coalesced": not created,
+            "doc_count": len(documents),
+            "request_id": request_id,
+        },
+    )
+
+    return {
+        **job.as_dict(),
+        "coalesced": not created,
+        "request_id": request_id,
+    }
 
 
 @router.post("/mortgage/{case_id}/evidence/index")
@@ -73,6 +148,9 @@ async def mortgage_evidence_index_endpoint(
     case_id: str,
     payload: EvidenceIndexRequest,
     request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    mode: str = Query("sync", pattern="^(sync|job)$"),
 ) -> dict[str, object]:
     started = time.perf_counter()
     increment_metric("evidence_index_requests_total")
@@ -81,16 +159,32 @@ async def mortgage_evidence_index_endpoint(
     if not normalized_case_id:
         raise HTTPException(status_code=422, detail="'case_id' must be non-empty")
 
-    all_chunks = _collect_chunks(
+    documents, fingerprints = _resolve_documents(
         case_id=normalized_case_id, documents=payload.documents
     )
+    if mode == "job":
+        return _submit_job(
+            case_id=normalized_case_id,
+            documents=documents,
+            fingerprints=fingerprints,
+            overwrite=payload.overwrite,
+            skip_unchanged=False,
+            request=request,
+            response=response,
+        )
 
-    store = FileVectorStore()
-    if payload.overwrite:
-        indexed_chunks = store.overwrite_case(normalized_case_id, all_chunks)
-    else:
-        indexed_chunks = store.add_documents(all_chunks)
+    # Chunking and embedding run off the event loop; the store merge inside
+    # write_case_documents stays single-writer.
+    result = await run_in_threadpool(
+        write_case_documents,
+        case_id=normalized_case_id,
+        documents=documents,
+        overwrite=payload.overwrite,
+        fingerprints=fingerprints,
+    )
+    indexed_chunks = result.indexed_chunks
     increment_metric("evidence_index_chunks_total", float(indexed_chunks))
+    background_tasks.add_task(compact_case_index, normalized_case_id)
     observe_ms_metric(
         "evidence_index_latency_ms", (time.perf_counter() - started) * 1000
     )
@@ -119,24 +213,74 @@ async def mortgage_evidence_reindex_endpoint(
     case_id: str,
     payload: EvidenceReindexRequest,
     request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    mode: str = Query("sync", pattern="^(sync|job)$"),
 ) -> dict[str, object]:
     normalized_case_id = case_id.strip()
     if not normalized_case_id:
         raise HTTPException(status_code=422, detail="'case_id' must be non-empty")
 
-    chunks = _collect_chunks(case_id=normalized_case_id, documents=payload.documents)
-    indexed_chunks = FileVectorStore().overwrite_case(normalized_case_id, chunks)
+    documents, fingerprints = _resolve_documents(
+        case_id=normalized_case_id, documents=payload.documents
+    )
     increment_metric("evidence_index_requests_total")
-    increment_metric("evidence_index_chunks_total", float(indexed_chunks))
+    if mode == "job":
+        return _submit_job(
+            case_id=normalized_case_id,
+            documents=documents,
+            fingerprints=fingerprints,
+            overwrite=True,
+            skip_unchanged=True,
+            request=request,
+            response=response,
+        )
+
+    result = await run_in_threadpool(
+        write_case_documents,
+        case_id=normalized_case_id,
+        documents=documents,
+        overwrite=True,
+        fingerprints=fingerprints,
+        skip_unchanged=True,
+    )
+    increment_metric("evidence_index_chunks_total", float(result.indexed_chunks))
+    increment_metric(
+        "evidence_index_documents_skipped_total", float(result.skipped_documents)
+    )
+    background_tasks.add_task(compact_case_index, normalized_case_id)
 
     request_id = getattr(request.state, "request_id", "") or ""
     return {
         "case_id": normalized_case_id,
-        "indexed_chunks": indexed_chunks,
+        "indexed_chunks": result.indexed_chunks,
+        "skipped_documents": result.skipped_documents,
         "request_id": request_id,
     }
 
 
+@router.get("/mortgage/{case_id}/evidence/jobs/{job_id}")
+async def mortgage_evidence_job_status_endpoint(
+    case_id: str,
+    job_id: str,
+    request: Request,
+) -> dict[str, object]:
+    normalized_case_id = case_id.strip()
+    if not normalized_case_id:
+        raise HTTPException(status_code=422, detail="'case_id' must be non-empty")
+
+    job = get_index_job(job_id.strip())
+    if job is None or job.case_id != normalized_case_id:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Evidence index job '{job_id}' not found for case "
+            f"'{normalized_case_id}'",
+        )
+
+    request_id = getattr(request.state, "request_id", "") or ""
+    return {**job.as_dict(), "request_id": request_id}
+
+
 @router.get("/mortgage/{case_id}/evidence/stats")
 async def mortgage_evidence_stats_endpoint(
     case_id: str,
@@ -223,16 +367,73 @@ async def mortgage_evidence_search_endpoint(
         "query": q,
         "top_k": top_k,
         "min_score": min_score,
+        "results": [_search_result_payload(item) for item in matches],
+        "request_id": request_id,
+    }
+
+
+@router.post("/mortgage/evidence/search/batch")
+async def mortgage_evidence_search_batch_endpoint(
+    payload: EvidenceSearchBatchRequest,
+    request: Request,
+) -> dict[str, object]:
+    started = time.perf_counter()
+    increment_metric("evidence_search_batch_requests_total")
+
+    if not payload.queries:
+        raise HTTPException(status_code=422, detail="'queries' must be non-empty")
+    if len(payload.queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"'queries' must contain at most {MAX_BATCH_QUERIES} items",
+        )
+    if not 1 <= payload.top_k <= 50:
+        raise HTTPException(status_code=422, detail="'top_k' must be in [1, 50]")
+
+    queries = [(item.case_id.strip(), item.q) for item in payload.queries]
+    if any(not case_id for case_id, _ in queries):
+        raise HTTPException(status_code=422, detail="'case_id' must be non-empty")
+    if any(not query.strip() for _, query in queries):
+        raise HTTPException(status_code=422, detail="'q' must be non-empty")
+
+    min_score = get_settings().evidence_min_score
+    try:
+        matches = await run_in_threadpool(
+            FileVectorStore().search_many,
+            queries,
+            top_k=payload.top_k,
+            min_score=min_score,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    increment_metric("evidence_search_requests_total", float(len(queries)))
+    observe_ms_metric(
+        "evidence_search_batch_latency_ms", (time.perf_counter() - started) * 1000
+    )
+
+    request_id = getattr(request.state, "request_id", "") or ""
+    logger.info(
+        "evidence_searched_batch",
+        extra={
+            "event": "evidence_searched_batch",
+            "query_count": len(queries),
+            "case_count": len({case_id for case_id, _ in queries}),
+            "top_k": payload.top_k,
+            "request_id": request_id,
+        },
+    )
+
+    return {
+        "top_k": payload.top_k,
+        "min_score": min_score,
         "results": [
             {
-                "score": item.score,
-                "document_id": item.chunk.document_id,
-                "chunk_id": item.chunk.chunk_id,
-                "start_char": item.chunk.start_char,
-                "end_char": item.chunk.end_char,
-                "text": item.chunk.text,
+                "case_id": case_id,
+                "query": query,
+                "results": [_search_result_payload(item) for item in case_matches],
             }
-            for item in matches
+            for (case_id, query), case_matches in zip(queries, matches)
         ],
         "request_id": request_id,
     }
@@ -1,53 +1,175 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Callable, Iterator
+from itertools import islice
+from pathlib import Path
 from typing import Any
 
+import numpy as np
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
-from caseflow.ml.registry import get_active_model
+from caseflow.core.ndjson import (
+    NDJSON_MEDIA_TYPE,
+    InvalidLine,
+    encode_ndjson,
+    read_batch_rows,
+)
+from caseflow.ml.registry import RegistryModel, get_active_model, get_model
+from caseflow.ml.shadow import submit_shadow_scores
 
 router = APIRouter()
 
+BATCH_CHUNK_ROWS = 1024
+MODEL_ID_HEADER = "X-Model-Id"
 
-@router.post("/predict")
-async def predict_endpoint(request: Request) -> dict[str, Any]:
-    try:
-        payload = await request.json()
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail="Invalid JSON body") from exc
 
-    if not isinstance(payload, dict):
+def resolve_model(
+    request: Request, payload: dict[str, Any] | None = None
+) -> RegistryModel:
+    """Pick the model for a request: body ``model_id``, then the
+    ``X-Model-Id`` header, then the active model."""
+    model_id = payload.get("model_id") if payload is not None else None
+    if model_id is None:
+        model_id = request.headers.get(MODEL_ID_HEADER)
+    if not model_id:
+        return get_active_model()
+    if not isinstance(model_id, str):
+        raise HTTPException(status_code=400, detail="'model_id' must be a string")
+    if model_id.startswith(".") or Path(model_id).name != model_id:
         raise HTTPException(
-            status_code=400, detail="Request body must be a JSON object"
+            status_code=404,
+            detail=f"Model '{model_id}' was not found in the registry",
         )
 
-    features = payload.get("features")
-    model = get_active_model()
+    try:
+        return get_model(model_id)
+    except (FileNotFoundError, ValueError) as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
 
+def feature_vector(model: RegistryModel, features: object) -> list[float]:
     if isinstance(features, list):
         try:
-            numeric_features = [float(value) for value in features]
+            return [float(value) for value in features]
         except (TypeError, ValueError) as exc:
             raise HTTPException(
                 status_code=400,
                 detail="'features' must contain only numeric values",
             ) from exc
-    elif isinstance(features, dict):
+    if isinstance(features, dict):
         try:
-            numeric_features = model.vector_from_named_features(features)
+            return model.vector_from_named_features(features)
         except ValueError as exc:
             raise HTTPException(status_code=422, detail=str(exc)) from exc
-    else:
+    raise HTTPException(
+        status_code=400,
+        detail="'features' must be a list of numbers or an object",
+    )
+
+
+def score_batch_rows(
+    model: RegistryModel, rows: list[Any]
+) -> tuple[np.ndarray, list[HTTPException | None]]:
+    """Validate batch rows like the single-row endpoints and score them with
+    one matrix-vector product.
+
+    Returns per-row scores and per-row errors; rows with an error keep a
+    zero feature vector and their score must be ignored.
+    """
+    matrix = np.zeros((len(rows), model.n_features), dtype=np.float64)
+    errors: list[HTTPException | None] = [None] * len(rows)
+    for position, row in enumerate(rows):
+        try:
+            if isinstance(row, InvalidLine):
+                raise HTTPException(status_code=400, detail=row.detail)
+            if not isinstance(row, dict):
+                raise HTTPException(status_code=400, detail="Row must be a JSON object")
+            vector = feature_vector(model, row.get("features"))
+            try:
+                model.check_width(len(vector))
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc)) from exc
+            matrix[position] = vector
+        except HTTPException as exc:
+            errors[position] = exc
+    return model.predict_batch(matrix), errors
+
+
+def shadow_batch(
+    model: RegistryModel,
+    rows: list[Any],
+    scores: np.ndarray,
+    errors: list[HTTPException | None],
+) -> None:
+    scored = [position for position, error in enumerate(errors) if error is None]
+    submit_shadow_scores(
+        model,
+        [rows[position]["features"] for position in scored],
+        scores[scored].tolist(),
+    )
+
+
+def batch_row_header(row: Any, index: int) -> dict[str, Any]:
+    header: dict[str, Any] = {"index": index}
+    if isinstance(row, dict) and "id" in row:
+        header["id"] = row["id"]
+    return header
+
+
+def batch_row_error(exc: HTTPException) -> dict[str, Any]:
+    return {"error": {"status": exc.status_code, "detail": exc.detail}}
+
+
+async def stream_batch(
+    rows: Iterator[Any], encode_chunk: Callable[[list[Any], int], bytes]
+) -> AsyncIterator[bytes]:
+    """Feed ``rows`` to ``encode_chunk(rows, start)`` in fixed-size chunks on
+    the threadpool, yielding each chunk's encoded NDJSON.
+
+    ``rows`` is closed when the stream ends, fails or is abandoned by the
+    client, which releases a spooled request body.
+    """
+    start = 0
+    try:
+        while True:
+            chunk = await run_in_threadpool(
+                lambda: list(islice(rows, BATCH_CHUNK_ROWS))
+            )
+            if not chunk:
+                return
+            yield await run_in_threadpool(encode_chunk, chunk, start)
+            start += len(chunk)
+    finally:
+        close = getattr(rows, "close", None)
+        if close is not None:
+            close()
+
+
+@router.post("/predict")
+async def predict_endpoint(request: Request) -> dict[str, Any]:
+    try:
+        payload = await request.json()
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="Invalid JSON body") from exc
+
+    if not isinstance(payload, dict):
         raise HTTPException(
-            status_code=400,
-            detail="'features' must be a list of numbers or an object",
+            status_code=400, detail="Request body must be a JSON object"
         )
 
+    features = payload.get("features")
+    model = resolve_model(request, payload)
+    numeric_features = feature_vector(model, features)
+
     try:
         score = model.predict(numeric_features)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
+    submit_shadow_scores(model, [features], [score])
+
     request_id = getattr(request.state, "request_id", "") or ""
 
     return {
@@ -55,3 +177,33 @@ async def predict_endpoint(request: Request) -> dict[str, Any]:
         "score": score,
         "request_id": request_id,
     }
+
+
+@router.post("/predict/batch")
+async def predict_batch_endpoint(request: Request) -> StreamingResponse:
+    """Score a JSON array or NDJSON stream of ``/predict`` payloads.
+
+    Streams one NDJSON line per row, in input order. A row that fails
+    validation gets an ``error`` line; the rest of the batch still scores.
+    """
+    # Resolve before reading so an unknown model is rejected without
+    # spooling the body.
+    model = resolve_model(request)
+    rows = await read_batch_rows(request)
+
+    def encode_chunk(chunk: list[Any], start: int) -> bytes:
+        scores, errors = score_batch_rows(model, chunk)
+        shadow_batch(model, chunk, scores, errors)
+        lines = []
+        for offset, (row, score, error) in enumerate(zip(chunk, scores, errors)):
+            line = batch_row_header(row, start + offset)
+            if error is not None:
+                line.update(batch_row_error(error))
+            else:
+                line.update({"model_id": model.model_id, "score": float(score)})
+            lines.append(encode_ndjson(line))
+        return b"".join(lines)
+
+    return StreamingResponse(
+        stream_batch(rows, encode_chunk), media_type=NDJSON_MEDIA_TYPE
+    )
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from caseflow.core.settings import get_settings
+from caseflow.ml.evidence_indexer import reembed_index
+from caseflow.ml.quantization import EMBEDDING_STORAGES
+from caseflow.ml.vector_store import FileVectorStore
+
+
+def _index_file(args: argparse.Namespace) -> Path:
+    index_dir = args.index_dir or Path(get_settings().evidence_index_dir)
+    return Path(index_dir) / "index.json"
+
+
+def _store(args: argparse.Namespace) -> FileVectorStore:
+    return FileVectorStore.for_existing_index(_index_file(args))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the evidence index")
+    parser.add_argument(
+        "--index-dir",
+        type=Path,
+        default=None,
+        help="Evidence index directory (defaults to EVIDENCE_INDEX_DIR)",
+    )
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser(
+        "migrate",
+        help="Split a monolithic index.json into per-case shards",
+    )
+    compact = subcommands.add_parser(
+        "compact",
+        help="Fold pending WAL entries into fresh base segments",
+    )
+    compact.add_argument("--case-id", type=str, default=None)
+    compact.add_argument(
+        "--min-wal-bytes",
+        type=int,
+        default=0,
+        help="Only compact shards whose WAL is at least this large",
+    )
+    compact.add_argument(
+        "--min-wal-ratio",
+        type=float,
+        default=None,
+        help="Also compact shards whose WAL is at least this fraction of "
+        "their base segment",
+    )
+    reembed = subcommands.add_parser(
+        "reembed",
+        help="Re-embed every case into a new index directory at another dims",
+    )
+    reembed.add_argument("--target-dir", type=Path, required=True)
+    reembed.add_argument("--dims", type=int, required=True)
+    reembed.add_argument(
+        "--storage",
+        choices=sorted(EMBEDDING_STORAGES),
+        default=None,
+        help="Embedding storage of the new index (defaults to "
+        "EVIDENCE_EMBEDDING_STORAGE)",
+    )
+    reembed.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Embedding worker processes (0 embeds in this process)",
+    )
+    reembed.add_argument(
+        "--batch-chunks",
+        type=int,
+        default=None,
+        help="Chunks per streamed batch (defaults to EVIDENCE_INDEX_BATCH_CHUNKS)",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        store = _store(args)
+        migrated = store.migrate_monolithic_index()
+        print(
+            f"[evidence-index] migrated_records={migrated} "
+            f"cases={len(store.list_case_ids())}"
+        )
+    elif args.command == "compact":
+        compacted = _store(args).compact(
+            args.case_id,
+            min_wal_bytes=args.min_wal_bytes,
+            min_wal_ratio=args.min_wal_ratio,
+        )
+        print(f"[evidence-index] compacted_cases={compacted}")
+    elif args.command == "reembed":
+        source = _store(args)
+        target = FileVectorStore(
+            index_file=args.target_dir / "index.json",
+            dims=args.dims,
+            storage=args.storage,
+        )
+        reembedded = reembed_index(
+            source=source,
+            target=target,
+            workers=args.workers,
+            batch_size=args.batch_chunks,
+        )
+        # Fold the streamed WAL into segments so the new index opens memory-mapped.
+        target.compact()
+        print(
+            f"[evidence-index] reembedded_chunks={reembedded} "
+            f"cases={len(target.list_case_ids())} "
+            f"dims={source.dims}->{target.dims} storage={target.storage} "
+            f"target_dir={args.target_dir}"
+        )
+
+
+if __name__ == "__main__":
+    main()
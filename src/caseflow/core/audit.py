@@ -14,6 +14,8 @@ logger = logging.getLogger(__name__)
 class AuditSink(Protocol):
     def emit_decision_event(self, event: dict) -> None: ...
 
+    def emit_decision_events(self, events: list[dict]) -> None: ...
+
 
 @dataclass
 class LogAuditSink:
@@ -29,6 +31,10 @@ class LogAuditSink:
             },
         )
 
+    def emit_decision_events(self, events: list[dict]) -> None:
+        for event in events:
+            self.emit_decision_event(event)
+
 
 @dataclass
 class JsonlAuditSink:
@@ -39,6 +45,15 @@ class JsonlAuditSink:
         with self.path.open("a", encoding="utf-8") as sink_file:
             sink_file.write(json.dumps(event, separators=(",", ":")) + "\n")
 
+    def emit_decision_events(self, events: list[dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as sink_file:
+            sink_file.write(
+                "".join(
+                    json.dumps(event, separators=(",", ":")) + "\n" for event in events
+                )
+            )
+
 
 _audit_sink: AuditSink | None = None
 
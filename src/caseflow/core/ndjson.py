@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import IO, Any
+
+from fastapi import HTTPException, Request
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_CONTENT_TYPES = {
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/x-jsonlines",
+}
+
+# Uploads beyond this size are buffered on disk instead of in memory.
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class InvalidLine:
+    detail: str
+
+
+def is_ndjson_request(request: Request) -> bool:
+    content_type = request.headers.get("content-type", "")
+    return content_type.split(";", 1)[0].strip().lower() in NDJSON_CONTENT_TYPES
+
+
+async def spool_request_body(request: Request) -> IO[bytes]:
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        async for chunk in request.stream():
+            spool.write(chunk)
+    except BaseException:
+        # A client that disconnects mid-upload must not leak a temp file.
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+class _NdjsonRows(Iterator[Any]):
+    # A class rather than a generator so that close() releases the handle
+    # even when iteration never started.
+    def __init__(self, handle: IO[bytes]) -> None:
+        self._handle = handle
+
+    def __next__(self) -> Any:
+        if self._handle.closed:
+            raise StopIteration
+        for line in self._handle:
+            if not line.strip():
+                continue
+            try:
+                return json.loads(line)
+            except ValueError:
+                return InvalidLine("Invalid JSON line")
+        self.close()
+        raise StopIteration
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+def iter_ndjson(handle: IO[bytes]) -> Iterator[Any]:
+    """Yield one decoded value per non-blank line of ``handle``, closing it
+    when exhausted or when the iterator's ``close()`` is called. Undecodable
+    lines yield :class:`InvalidLine`."""
+    return _NdjsonRows(handle)
+
+
+async def read_batch_rows(request: Request) -> Iterator[Any]:
+    """Rows of a batch body: an NDJSON stream, or a JSON array read in full.
+
+    Call this only once the request is known to be servable: an NDJSON body
+    is spooled before it returns, and the spool is released by closing the
+    returned iterator.
+    """
+    if is_ndjson_request(request):
+        return iter_ndjson(await spool_request_body(request))
+
+    try:
+        payload = await request.json()
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="Invalid JSON body") from exc
+
+    if not isinstance(payload, list):
+        raise HTTPException(
+            status_code=400,
+            detail="Request body must be a JSON array or an NDJSON stream",
+        )
+    return iter(payload)
+
+
+def encode_ndjson(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8") + b"\n"
@@ -14,7 +14,8 @@ from caseflow.core.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
-LIMITED_PATHS = {"/predict", "/decision"}
+# A batch request spends one token however many rows it carries.
+LIMITED_PATHS = {"/predict", "/decision", "/predict/batch", "/decision/batch"}
 
 
 @dataclass
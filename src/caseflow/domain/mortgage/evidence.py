@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 
 
@@ -16,15 +17,7 @@ class EvidenceChunk:
     page: int | None = None
 
 
-def chunk_text(
-    *,
-    case_id: str,
-    document_id: str,
-    text: str,
-    source: str = "provenance",
-    chunk_size: int = 700,
-    overlap: int = 100,
-) -> list[EvidenceChunk]:
+def _validate_chunking(chunk_size: int, overlap: int) -> None:
     if chunk_size <= 0:
         raise ValueError("chunk_size must be > 0")
     if overlap < 0:
@@ -32,31 +25,76 @@ def chunk_text(
     if overlap >= chunk_size:
         raise ValueError("overlap must be smaller than chunk_size")
 
-    if not text:
-        return []
+
+def iter_text_chunks(
+    *,
+    case_id: str,
+    document_id: str,
+    pieces: Iterable[str],
+    source: str = "provenance",
+    chunk_size: int = 700,
+    overlap: int = 100,
+) -> Iterator[EvidenceChunk]:
+    _validate_chunking(chunk_size, overlap)
 
     step = chunk_size - overlap
-    chunks: list[EvidenceChunk] = []
-    text_len = len(text)
+    pieces_iter = iter(pieces)
+    buffer = ""
+    buffer_start = 0
+    exhausted = False
+    start = 0
+
+    while True:
+        # Hold one character past the window so the final chunk is detected
+        # without buffering the rest of the input.
+        while not exhausted and len(buffer) <= start - buffer_start + chunk_size:
+            piece = next(pieces_iter, None)
+            if piece is None:
+                exhausted = True
+            else:
+                buffer = buffer[start - buffer_start :] + piece
+                buffer_start = start
 
-    for start in range(0, text_len, step):
-        end = min(start + chunk_size, text_len)
-        chunk_text_value = text[start:end]
+        offset = start - buffer_start
+        chunk_text_value = buffer[offset : offset + chunk_size]
+        if not chunk_text_value:
+            return
+
+        end = start + len(chunk_text_value)
         chunk_key = f"{case_id}|{document_id}|{start}|{end}"
         chunk_id = hashlib.sha256(chunk_key.encode("utf-8")).hexdigest()[:16]
-        chunks.append(
-            EvidenceChunk(
-                case_id=case_id,
-                document_id=document_id,
-                chunk_id=chunk_id,
-                text=chunk_text_value,
-                start_char=start,
-                end_char=end,
-                source=source,
-                page=None,
-            )
+        yield EvidenceChunk(
+            case_id=case_id,
+            document_id=document_id,
+            chunk_id=chunk_id,
+            text=chunk_text_value,
+            start_char=start,
+            end_char=end,
+            source=source,
+            page=None,
         )
-        if end >= text_len:
-            break
+        if exhausted and end >= buffer_start + len(buffer):
+            return
+
+        start += step
 
-    return chunks
+
+def chunk_text(
+    *,
+    case_id: str,
+    document_id: str,
+    text: str,
+    source: str = "provenance",
+    chunk_size: int = 700,
+    overlap: int = 100,
+) -> list[EvidenceChunk]:
+    return list(
+        iter_text_chunks(
+            case_id=case_id,
+            document_id=document_id,
+            pieces=[text],
+            source=source,
+            chunk_size=chunk_size,
+            overlap=overlap,
+        )
+    )
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import hashlib
 import json
+from collections.abc import Iterator
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 from caseflow.core.settings import get_settings
 
+_TEXT_BLOCK_CHARS = 65_536
+
 
 def _iso_utc_now() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -84,7 +87,25 @@ def load_provenance_event(case_id: str, document_id: str) -> dict[str, Any]:
     return payload
 
 
-def load_extracted_text(case_id: str, document_id: str) -> str:
+def source_fingerprint(case_id: str, document_id: str) -> str:
+    payload = load_provenance_event(case_id, document_id)
+    source_sha256 = payload.get("sha256")
+    if not isinstance(source_sha256, str) or not source_sha256:
+        raise ValueError(
+            f"Provenance sha256 is missing for case_id={case_id}, "
+            f"document_id={document_id}"
+        )
+
+    # The same bytes extracted by a different engine yield different text.
+    basis = json.dumps(
+        {"sha256": source_sha256, "extraction_meta": payload.get("extraction_meta")},
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+    return hashlib.sha256(basis.encode("utf-8")).hexdigest()
+
+
+def extracted_text_path(case_id: str, document_id: str) -> Path:
     payload = load_provenance_event(case_id, document_id)
     text_path = payload.get("text_path")
     if isinstance(text_path, str) and text_path.strip():
@@ -98,4 +119,16 @@ def load_extracted_text(case_id: str, document_id: str) -> str:
             f"Extracted text not found for case_id={case_id}, document_id={document_id}"
         )
 
-    return candidate.read_text(encoding="utf-8")
+    return candidate
+
+
+def load_extracted_text(case_id: str, document_id: str) -> str:
+    return extracted_text_path(case_id, document_id).read_text(encoding="utf-8")
+
+
+def iter_extracted_text(
+    text_path: Path, block_chars: int = _TEXT_BLOCK_CHARS
+) -> Iterator[str]:
+    with text_path.open("r", encoding="utf-8") as handle:
+        while block := handle.read(block_chars):
+            yield block
@@ -7,7 +7,7 @@ from caseflow.domain.mortgage.policy import (
     MortgageDecision,
     evaluate_mortgage_policy_v1,
 )
-from caseflow.ml.registry import get_active_model, load_model
+from caseflow.ml.registry import get_active_model, get_model
 from caseflow.ml.vector_store import FileVectorStore, SearchResult
 
 
@@ -63,7 +63,7 @@ def _named_model_vector_from_payload(
 def tool_risk_score(
     case_payload: dict[str, object], model_version: str | None
 ) -> RiskScoreResult:
-    model = load_model(model_version) if model_version else get_active_model()
+    model = get_model(model_version) if model_version else get_active_model()
 
     if model.feature_names is not None:
         vector = _named_model_vector_from_payload(case_payload, model.feature_names)
@@ -92,3 +92,15 @@ def tool_evidence_search(
         case_id=case_id,
         min_score=min_score,
     )
+
+
+def tool_evidence_search_many(
+    queries: list[tuple[str, str]],
+    top_k: int = 5,
+) -> list[list[SearchResult]]:
+    min_score = get_settings().evidence_min_score
+    return FileVectorStore().search_many(
+        queries,
+        top_k=top_k,
+        min_score=min_score,
+    )
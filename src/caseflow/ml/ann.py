@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+ANN_MODES = {"exact", "ivf"}
+
+_ASSIGN_BATCH_ROWS = 65_536
+_TRAIN_SAMPLES_PER_LIST = 256
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    # A positive per-row scale never changes the argmax, so int8 codes are
+    # assigned without their scales, one upcast block at a time.
+    assignments = np.empty(matrix.shape[0], dtype=np.int64)
+    for start in range(0, matrix.shape[0], _ASSIGN_BATCH_ROWS):
+        block = np.asarray(matrix[start : start + _ASSIGN_BATCH_ROWS], dtype=np.float32)
+        assignments[start : start + block.shape[0]] = np.argmax(
+            block @ centroids.T, axis=1
+        )
+    return assignments
+
+
+def train_centroids(
+    matrix: np.ndarray,
+    nlist: int,
+    iterations: int = 10,
+    seed: int = 0,
+) -> np.ndarray:
+    if matrix.ndim != 2 or matrix.shape[0] == 0:
+        raise ValueError("matrix must be a non-empty 2-D array")
+    if nlist <= 0:
+        raise ValueError("nlist must be > 0")
+
+    rng = np.random.default_rng(seed)
+    rows = matrix.shape[0]
+    nlist = min(nlist, rows)
+
+    sample_size = min(rows, nlist * _TRAIN_SAMPLES_PER_LIST)
+    sample = _normalize_rows(
+        np.asarray(
+            matrix[np.sort(rng.choice(rows, sample_size, replace=False))],
+            dtype=np.float32,
+        )
+    ).astype(np.float32)
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+    # Spherical k-means: embeddings are unit length, so assign by dot product.
+    for _ in range(iterations):
+        assignments = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        counts = np.bincount(assignments, minlength=nlist)
+
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        centroids = _normalize_rows(sums).astype(np.float32)
+
+    return centroids
+
+
+@dataclass(frozen=True)
+class IvfFlatIndex:
+    centroids: np.ndarray
+    order: np.ndarray
+    list_offsets: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        matrix: np.ndarray,
+        nlist: int = 0,
+        iterations: int = 10,
+        seed: int = 0,
+    ) -> IvfFlatIndex:
+        if nlist <= 0:
+            nlist = max(1, int(math.sqrt(matrix.shape[0])))
+        centroids = train_centroids(matrix, nlist, iterations=iterations, seed=seed)
+        return cls.from_assignments(centroids, _assign(matrix, centroids))
+
+    @classmethod
+    def from_assignments(
+        cls, centroids: np.ndarray, assignments: np.ndarray
+    ) -> IvfFlatIndex:
+        order = np.argsort(assignments, kind="stable")
+        list_offsets = np.searchsorted(
+            assignments[order], np.arange(centroids.shape[0] + 1)
+        )
+        return cls(centroids=centroids, order=order, list_offsets=list_offsets)
+
+    @property
+    def nlist(self) -> int:
+        return int(self.centroids.shape[0])
+
+    def assign(self, matrix: np.ndarray) -> np.ndarray:
+        """Return the list of each row under the already trained centroids."""
+        return _assign(matrix, self.centroids)
+
+    def assignments(self) -> np.ndarray:
+        assignments = np.empty_like(self.order)
+        assignments[self.order] = np.repeat(
+            np.arange(self.nlist), np.diff(self.list_offsets)
+        )
+        return assignments
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        if nprobe <= 0:
+            raise ValueError("nprobe must be > 0")
+
+        centroid_scores = self.centroids @ query
+        nprobe = min(nprobe, self.nlist)
+        probed = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        return np.sort(
+            np.concatenate(
+                [
+                    self.order[self.list_offsets[item] : self.list_offsets[item + 1]]
+                    for item in probed
+                ]
+            )
+        )
+
+
+def recall_at_k(exact: list[list[str]], approximate: list[list[str]]) -> float:
+    if len(exact) != len(approximate):
+        raise ValueError("exact and approximate must have the same number of queries")
+
+    expected = sum(len(ids) for ids in exact)
+    if expected == 0:
+        return 1.0
+
+    found = sum(
+        len(set(truth) & set(candidate)) for truth, candidate in zip(exact, approximate)
+    )
+    return found / expected
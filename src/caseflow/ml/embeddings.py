@@ -3,11 +3,24 @@ from __future__ import annotations
 import hashlib
 import math
 import re
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+
+from caseflow.core.metrics import increment_metric, set_gauge_metric
+from caseflow.core.settings import get_settings
+
+# Bump whenever tokenization or hashing changes so stored vectors are rejected.
+EMBEDDER_VERSION = "hashing-sha256-v1"
 
 _TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
 
+_token_cache: OrderedDict[tuple[str, int], tuple[int, float]] = OrderedDict()
+_token_cache_lock = Lock()
 
-def _tokenize(text: str) -> list[str]:
+
+def tokenize(text: str) -> list[str]:
     return _TOKEN_PATTERN.findall(text.lower())
 
 
@@ -18,20 +31,100 @@ def _normalize(vector: list[float]) -> list[float]:
     return [value / magnitude for value in vector]
 
 
+def _hash_token(token: str, dims: int) -> tuple[int, float]:
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    index = int.from_bytes(digest[:4], byteorder="big") % dims
+    sign = 1.0 if digest[4] % 2 == 0 else -1.0
+    return index, sign
+
+
+def _hash_tokens(tokens: list[str], dims: int) -> list[tuple[int, float]]:
+    max_entries = get_settings().embedding_token_cache_size
+    if max_entries == 0:
+        return [_hash_token(token, dims) for token in tokens]
+
+    hashed: list[tuple[int, float] | None] = []
+    with _token_cache_lock:
+        for token in tokens:
+            key = (token, dims)
+            entry = _token_cache.get(key)
+            if entry is not None:
+                _token_cache.move_to_end(key)
+            hashed.append(entry)
+
+    misses = {
+        token: _hash_token(token, dims)
+        for token, entry in zip(tokens, hashed)
+        if entry is None
+    }
+    if misses:
+        with _token_cache_lock:
+            for token, entry in misses.items():
+                _token_cache[(token, dims)] = entry
+            while len(_token_cache) > max_entries:
+                _token_cache.popitem(last=False)
+            cache_size = len(_token_cache)
+        set_gauge_metric("embedding_token_cache_entries", float(cache_size))
+
+    miss_count = sum(1 for entry in hashed if entry is None)
+    if miss_count:
+        increment_metric("embedding_token_cache_misses_total", float(miss_count))
+    if miss_count < len(tokens):
+        increment_metric(
+            "embedding_token_cache_hits_total", float(len(tokens) - miss_count)
+        )
+
+    return [
+        entry if entry is not None else misses[token]
+        for token, entry in zip(tokens, hashed)
+    ]
+
+
+def clear_token_cache() -> None:
+    with _token_cache_lock:
+        _token_cache.clear()
+
+
 def embed_text(text: str, dims: int = 128) -> list[float]:
     if dims <= 0:
         raise ValueError("dims must be > 0")
 
     vector = [0.0] * dims
-    for token in _tokenize(text):
-        digest = hashlib.sha256(token.encode("utf-8")).digest()
-        index = int.from_bytes(digest[:4], byteorder="big") % dims
-        sign = 1.0 if digest[4] % 2 == 0 else -1.0
+    for index, sign in _hash_tokens(tokenize(text), dims):
         vector[index] += sign
 
     return _normalize(vector)
 
 
+def embed_texts(texts: list[str], dims: int = 128) -> np.ndarray:
+    if dims <= 0:
+        raise ValueError("dims must be > 0")
+
+    tokenized = [tokenize(text) for text in texts]
+    vocabulary = list(dict.fromkeys(token for tokens in tokenized for token in tokens))
+    memo = dict(zip(vocabulary, _hash_tokens(vocabulary, dims)))
+
+    flat_positions: list[int] = []
+    signs: list[float] = []
+    for row, tokens in enumerate(tokenized):
+        offset = row * dims
+        for token in tokens:
+            index, sign = memo[token]
+            flat_positions.append(offset + index)
+            signs.append(sign)
+
+    # Token counts are small integers, so float64 accumulation and the
+    # normalization below match embed_text bit for bit before the cast.
+    matrix = np.bincount(
+        np.asarray(flat_positions, dtype=np.int64),
+        weights=np.asarray(signs, dtype=np.float64),
+        minlength=len(texts) * dims,
+    ).reshape(len(texts), dims)
+    magnitudes = np.sqrt(np.sum(matrix * matrix, axis=1, keepdims=True))
+    magnitudes[magnitudes == 0] = 1.0
+    return (matrix / magnitudes).astype(np.float32)
+
+
 def cosine_similarity(left: list[float], right: list[float]) -> float:
     if len(left) != len(right):
         raise ValueError("Embedding vectors must have equal length")
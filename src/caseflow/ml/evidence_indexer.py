@@ -0,0 +1,574 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import TypeVar
+from uuid import uuid4
+
+from caseflow.core.metrics import increment_metric
+from caseflow.core.settings import get_settings
+from caseflow.domain.mortgage.evidence import EvidenceChunk, iter_text_chunks
+from caseflow.domain.mortgage.provenance import iter_extracted_text
+from caseflow.ml.embeddings import embed_texts
+from caseflow.ml.vector_store import EmbeddedChunks, FileVectorStore
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+JOB_ACTIVE_STATUSES = frozenset({"queued", "running"})
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = Lock()
+
+_job_executor: ThreadPoolExecutor | None = None
+_jobs: OrderedDict[str, IndexJob] = OrderedDict()
+_jobs_lock = Lock()
+
+
+@dataclass
+class IndexJob:
+    job_id: str
+    case_id: str
+    document_ids: tuple[str, ...]
+    overwrite: bool
+    skip_unchanged: bool = False
+    status: str = "queued"
+    documents_done: int = 0
+    documents_skipped: int = 0
+    chunks_written: int = 0
+    error: str | None = None
+    started: float | None = None
+    finished: float | None = None
+    _seen_documents: set[str] = field(default_factory=set, repr=False)
+
+    @property
+    def key(self) -> tuple[str, tuple[str, ...], bool, bool]:
+        return self.case_id, self.document_ids, self.overwrite, self.skip_unchanged
+
+    def elapsed_ms(self) -> float:
+        if self.started is None:
+            return 0.0
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return (end - self.started) * 1000
+
+    def restart_progress(self) -> None:
+        # A retried plan stages its batches again from the first one.
+        with _jobs_lock:
+            self.chunks_written = 0
+            self.documents_done = 0
+            self._seen_documents.clear()
+
+    def record_batch(self, chunks: list[EvidenceChunk]) -> None:
+        with _jobs_lock:
+            self.chunks_written += len(chunks)
+            self._seen_documents.update(chunk.document_id for chunk in chunks)
+            # Documents arrive in request order, so every document before the
+            # latest one seen is finished.
+            self.documents_done = max(
+                self.documents_done, len(self._seen_documents) - 1
+            )
+
+    def as_dict(self) -> dict[str, object]:
+        with _jobs_lock:
+            return {
+                "job_id": self.job_id,
+                "case_id": self.case_id,
+                "status": self.status,
+                "overwrite": self.overwrite,
+                "documents_total": len(self.document_ids),
+                "documents_done": self.documents_done,
+                "documents_skipped": self.documents_skipped,
+                "chunks_written": self.chunks_written,
+                "elapsed_ms": round(self.elapsed_ms(), 3),
+                "error": self.error,
+            }
+
+
+def _batched_chunks(
+    *,
+    case_id: str,
+    documents: list[tuple[str, Path]],
+    batch_size: int,
+) -> Iterator[list[EvidenceChunk]]:
+    batch: list[EvidenceChunk] = []
+    for document_id, text_path in documents:
+        for chunk in iter_text_chunks(
+            case_id=case_id,
+            document_id=document_id,
+            pieces=iter_extracted_text(text_path),
+            source="provenance",
+        ):
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def embed_document(
+    case_id: str,
+    document_id: str,
+    text_path: Path,
+    dims: int,
+    batch_size: int,
+) -> list[EmbeddedChunks]:
+    return [
+        EmbeddedChunks(
+            chunks=chunks,
+            embeddings=embed_texts([chunk.text for chunk in chunks], dims=dims),
+        )
+        for chunks in _batched_chunks(
+            case_id=case_id,
+            documents=[(document_id, text_path)],
+            batch_size=batch_size,
+        )
+    ]
+
+
+def get_index_pool() -> ProcessPoolExecutor | None:
+    global _pool, _pool_workers
+
+    workers = get_settings().evidence_index_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers != workers:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None and workers > 0:
+            # Spawned workers do not inherit the server's threads or locks.
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_index_pool() -> None:
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def _ordered_results(
+    pool: ProcessPoolExecutor,
+    calls: Iterator[tuple[Callable[..., T], tuple[object, ...]]],
+    window: int,
+) -> Iterator[T]:
+    # Keep a bounded window of tasks in flight and yield results in
+    # submission order so merges are deterministic.
+    pending: deque[Future[T]] = deque()
+    for fn, args in calls:
+        pending.append(pool.submit(fn, *args))
+        if len(pending) >= window:
+            break
+
+    try:
+        while pending:
+            result = pending.popleft().result()
+            next_call = next(calls, None)
+            if next_call is not None:
+                pending.append(pool.submit(next_call[0], *next_call[1]))
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def iter_case_batches(
+    *,
+    case_id: str,
+    documents: list[tuple[str, Path]],
+    dims: int,
+) -> Iterator[list[EvidenceChunk] | EmbeddedChunks]:
+    settings = get_settings()
+    batch_size = settings.evidence_index_batch_chunks
+    pool = get_index_pool()
+    if pool is None or len(documents) < 2:
+        yield from _batched_chunks(
+            case_id=case_id, documents=documents, batch_size=batch_size
+        )
+        return
+
+    calls = (
+        (embed_document, (case_id, document_id, text_path, dims, batch_size))
+        for document_id, text_path in documents
+    )
+    for batches in _ordered_results(
+        pool, calls, window=settings.evidence_index_workers * 2
+    ):
+        yield from batches
+
+
+@dataclass(frozen=True)
+class IndexResult:
+    indexed_chunks: int
+    skipped_documents: int = 0
+
+
+# Optimistic passes before a reindex gives up on embedding outside the
+# writer lock because other writers keep changing the case underneath it.
+_UNLOCKED_PLAN_ATTEMPTS = 3
+
+
+def _embedded_batches(
+    batches: Iterable[list[EvidenceChunk] | EmbeddedChunks], dims: int
+) -> Iterator[EmbeddedChunks]:
+    for batch in batches:
+        if isinstance(batch, EmbeddedChunks):
+            yield batch
+        else:
+            yield EmbeddedChunks(
+                chunks=batch,
+                embeddings=embed_texts([chunk.text for chunk in batch], dims=dims),
+            )
+
+
+def _case_state(
+    store: FileVectorStore, case_id: str
+) -> tuple[dict[str, str], list[str]]:
+    return store.document_fingerprints(case_id), [
+        str(item["document_id"]) for item in store.case_stats(case_id)["documents"]
+    ]
+
+
+def _plan_documents(
+    documents: list[tuple[str, Path]],
+    overwrite: bool,
+    fingerprints: dict[str, str] | None,
+    state: tuple[dict[str, str], list[str]] | None,
+) -> tuple[list[tuple[str, Path]], bool, set[str]]:
+    """Return the documents to embed, whether to overwrite the case, and the
+    documents whose old chunks must be dropped, given the case ``state``."""
+    if state is None or not fingerprints:
+        return documents, overwrite, set()
+
+    known, indexed = state
+    changed = [
+        (document_id, text_path)
+        for document_id, text_path in documents
+        if document_id not in fingerprints
+        or known.get(document_id) != fingerprints[document_id]
+    ]
+    replace_documents = {document_id for document_id, _ in changed}
+    if overwrite:
+        # Documents not listed in an overwrite are dropped, as a full rebuild
+        # would.
+        listed = {document_id for document_id, _ in documents}
+        replace_documents.update(
+            document_id for document_id in indexed if document_id not in listed
+        )
+    return changed, False, replace_documents
+
+
+def write_case_documents(
+    *,
+    case_id: str,
+    documents: list[tuple[str, Path]],
+    overwrite: bool,
+    store: FileVectorStore | None = None,
+    on_batch: Callable[[list[EvidenceChunk]], None] | None = None,
+    on_retry: Callable[[], None] | None = None,
+    fingerprints: dict[str, str] | None = None,
+    skip_unchanged: bool = False,
+) -> IndexResult:
+    """Chunk, embed and write ``documents`` as one commit to ``case_id``.
+
+    Chunking and embedding run without the writer lock, so other cases keep
+    indexing meanwhile; each batch is staged to disk as it is embedded and
+    ``on_batch`` reports it then. The lock is taken only to append the staged
+    batches. When unchanged documents are skipped, the fingerprints the plan
+    was based on are re-checked under the lock, and the plan is redone, after
+    ``on_retry``, if another writer changed the case.
+    """
+    store = store or FileVectorStore()
+    depends_on_state = skip_unchanged and bool(fingerprints)
+    attempts = 0
+    while True:
+        attempts += 1
+        if attempts > 1 and on_retry is not None:
+            on_retry()
+        # The last attempt holds the lock throughout so it cannot be raced.
+        with (
+            store.writer_lock() if attempts > _UNLOCKED_PLAN_ATTEMPTS else nullcontext()
+        ):
+            state = _case_state(store, case_id) if depends_on_state else None
+            planned, write_overwrite, replace_documents = _plan_documents(
+                documents, overwrite, fingerprints, state
+            )
+
+            staged = store.stage_case_batches(
+                case_id,
+                _embedded_batches(
+                    iter_case_batches(
+                        case_id=case_id, documents=planned, dims=store.dims
+                    ),
+                    store.dims,
+                ),
+                on_batch=on_batch,
+            )
+            try:
+                with store.writer_lock():
+                    if state is not None and _case_state(store, case_id) != state:
+                        continue
+                    written = store.commit_staged(
+                        staged,
+                        overwrite=write_overwrite,
+                        replace_documents=replace_documents,
+                        fingerprints=fingerprints,
+                    )
+            finally:
+                staged.discard()
+        return IndexResult(
+            indexed_chunks=written, skipped_documents=len(documents) - len(planned)
+        )
+
+
+def compact_case_index(case_id: str) -> None:
+    settings = get_settings()
+    threshold = settings.evidence_wal_compact_bytes
+    if threshold <= 0:
+        return
+
+    try:
+        compacted = FileVectorStore().compact(
+            case_id,
+            min_wal_bytes=threshold,
+            min_wal_ratio=settings.evidence_wal_compact_ratio or None,
+        )
+    except Exception as exc:  # pragma: no cover - background safety net
+        logger.error(
+            "evidence_compaction_failed",
+            extra={
+                "event": "evidence_compaction_failed",
+                "case_id": case_id,
+                "error_type": exc.__class__.__name__,
+                "error_message": str(exc),
+            },
+        )
+        return
+
+    if compacted:
+        increment_metric("evidence_index_compactions_total")
+
+
+def reembed_rows(
+    index_file: Path,
+    source_dims: int,
+    case_id: str,
+    start: int,
+    stop: int,
+    dims: int,
+) -> EmbeddedChunks:
+    source = FileVectorStore(index_file=index_file, dims=source_dims)
+    chunks = source.case_chunks(case_id, start, stop)
+    return EmbeddedChunks(
+        chunks=chunks,
+        embeddings=embed_texts([chunk.text for chunk in chunks], dims=dims),
+    )
+
+
+def reembed_index(
+    *,
+    source: FileVectorStore,
+    target: FileVectorStore,
+    workers: int = 0,
+    batch_size: int | None = None,
+) -> int:
+    """Copy every case of ``source`` into ``target`` at ``target.dims``.
+
+    Rows are streamed in ``batch_size`` slices. With ``workers`` > 0 the
+    slices are embedded on a process pool while this process stays the only
+    writer of ``target``. ``source`` keeps serving reads throughout; a case
+    written to while it is copied is copied again, so slices never mix rows
+    from two versions of it.
+    """
+    if source.root.resolve() == target.root.resolve():
+        raise ValueError("Re-embedding must write to a different index directory")
+    batch_size = batch_size or get_settings().evidence_index_batch_chunks
+    index_file = source.root / "index.json"
+
+    pool = (
+        ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        if workers > 0
+        else None
+    )
+    written = 0
+    try:
+        for case_id in source.list_case_ids():
+            version = source.case_version(case_id)
+            copied = 0
+            while version is not None:
+                size = int(source.case_stats(case_id)["num_chunks"])
+                calls = (
+                    (
+                        reembed_rows,
+                        (
+                            index_file,
+                            source.dims,
+                            case_id,
+                            start,
+                            min(start + batch_size, size),
+                            target.dims,
+                        ),
+                    )
+                    for start in range(0, size, batch_size)
+                )
+                batches = (
+                    _ordered_results(pool, calls, window=workers * 2)
+                    if pool is not None
+                    else (fn(*args) for fn, args in calls)
+                )
+                copied = target.write_case_batches(
+                    case_id,
+                    batches,
+                    overwrite=True,
+                    fingerprints=source.document_fingerprints(case_id),
+                )
+                current = source.case_version(case_id)
+                if current == version:
+                    break
+                version = current
+            if version is None:
+                # Deleted before or while it was copied.
+                target.delete_case(case_id)
+                copied = 0
+            written += copied
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+    return written
+
+
+def _get_job_executor() -> ThreadPoolExecutor:
+    global _job_executor
+
+    with _jobs_lock:
+        if _job_executor is None:
+            _job_executor = ThreadPoolExecutor(
+                max_workers=get_settings().evidence_index_job_workers,
+                thread_name_prefix="evidence-index-job",
+            )
+        return _job_executor
+
+
+def _run_job(
+    job: IndexJob,
+    documents: list[tuple[str, Path]],
+    fingerprints: dict[str, str] | None,
+) -> None:
+    with _jobs_lock:
+        job.status = "running"
+        job.started = time.perf_counter()
+
+    try:
+        result = write_case_documents(
+            case_id=job.case_id,
+            documents=documents,
+            overwrite=job.overwrite,
+            on_batch=job.record_batch,
+            on_retry=job.restart_progress,
+            fingerprints=fingerprints,
+            skip_unchanged=job.skip_unchanged,
+        )
+    except Exception as exc:
+        with _jobs_lock:
+            job.status = "failed"
+            job.error = f"{exc.__class__.__name__}: {exc}"
+            job.finished = time.perf_counter()
+        increment_metric("evidence_index_jobs_failed_total")
+        logger.error(
+            "evidence_index_job_failed",
+            extra={
+                "event": "evidence_index_job_failed",
+                "case_id": job.case_id,
+                "job_id": job.job_id,
+                "error_type": exc.__class__.__name__,
+                "error_message": str(exc),
+            },
+        )
+        return
+
+    with _jobs_lock:
+        job.status = "succeeded"
+        job.documents_done = len(job.document_ids)
+        job.documents_skipped = result.skipped_documents
+        job.chunks_written = result.indexed_chunks
+        job.finished = time.perf_counter()
+    increment_metric("evidence_index_chunks_total", float(result.indexed_chunks))
+    increment_metric(
+        "evidence_index_documents_skipped_total", float(result.skipped_documents)
+    )
+    compact_case_index(job.case_id)
+
+
+def submit_index_job(
+    *,
+    case_id: str,
+    documents: list[tuple[str, Path]],
+    overwrite: bool,
+    fingerprints: dict[str, str] | None = None,
+    skip_unchanged: bool = False,
+) -> tuple[IndexJob, bool]:
+    """Queue an indexing job, returning ``(job, created)``.
+
+    An identical request for the same case that is still queued or running is
+    returned instead of queueing a second rebuild.
+    """
+    executor = _get_job_executor()
+    candidate = IndexJob(
+        job_id=uuid4().hex,
+        case_id=case_id,
+        document_ids=tuple(document_id for document_id, _ in documents),
+        overwrite=overwrite,
+        skip_unchanged=skip_unchanged,
+    )
+    with _jobs_lock:
+        for job in _jobs.values():
+            if job.key == candidate.key and job.status in JOB_ACTIVE_STATUSES:
+                increment_metric("evidence_index_jobs_coalesced_total")
+                return job, False
+
+        _jobs[candidate.job_id] = candidate
+        history = get_settings().evidence_index_job_history
+        for job_id in [
+            job_id
+            for job_id, job in _jobs.items()
+            if job.status not in JOB_ACTIVE_STATUSES
+        ][: max(0, len(_jobs) - history)]:
+            del _jobs[job_id]
+
+    increment_metric("evidence_index_jobs_total")
+    executor.submit(_run_job, candidate, documents, fingerprints)
+    return candidate, True
+
+
+def get_index_job(job_id: str) -> IndexJob | None:
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def shutdown_index_jobs() -> None:
+    global _job_executor
+
+    with _jobs_lock:
+        executor, _job_executor = _job_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+    with _jobs_lock:
+        _jobs.clear()
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from caseflow.ml.embeddings import tokenize
+
+SEARCH_MODES = {"vector", "hybrid"}
+
+_RRF_K = 60
+
+
+def query_terms(query: str) -> np.ndarray:
+    """Distinct query tokens, sorted; the order ``Bm25Stats`` counts them in."""
+    return np.unique(np.asarray(tokenize(query), dtype=np.str_))
+
+
+@dataclass(frozen=True)
+class Bm25Stats:
+    """Corpus statistics BM25 weighs query terms with.
+
+    ``document_frequencies`` lines up with the ``query_terms`` they were
+    counted for. Adding the statistics of several indexes scores each of them
+    as part of one corpus.
+    """
+
+    doc_count: int
+    total_length: int
+    document_frequencies: np.ndarray
+
+    def __add__(self, other: Bm25Stats) -> Bm25Stats:
+        return Bm25Stats(
+            doc_count=self.doc_count + other.doc_count,
+            total_length=self.total_length + other.total_length,
+            document_frequencies=self.document_frequencies + other.document_frequencies,
+        )
+
+    @property
+    def avg_doc_length(self) -> float:
+        return self.total_length / self.doc_count if self.doc_count else 0.0
+
+
+@dataclass(frozen=True)
+class Bm25Index:
+    """Okapi BM25 over CSR posting lists.
+
+    ``terms`` is sorted so a query term resolves with one binary search; its
+    postings are ``rows[term_offsets[i]:term_offsets[i + 1]]`` with matching
+    term frequencies in ``term_freqs``.
+    """
+
+    terms: np.ndarray
+    term_offsets: np.ndarray
+    rows: np.ndarray
+    term_freqs: np.ndarray
+    doc_lengths: np.ndarray
+
+    @classmethod
+    def build(cls, texts: Iterable[str]) -> Bm25Index:
+        vocabulary: dict[str, int] = {}
+        token_ids: list[int] = []
+        doc_lengths: list[int] = []
+        for text in texts:
+            tokens = tokenize(text)
+            doc_lengths.append(len(tokens))
+            token_ids.extend(
+                vocabulary.setdefault(token, len(vocabulary)) for token in tokens
+            )
+
+        # Renumber terms in sorted order, then count each (row, term) pair once.
+        terms = np.asarray(list(vocabulary), dtype=np.str_)
+        order = np.argsort(terms, kind="stable")
+        ranks = np.empty(len(terms), dtype=np.int64)
+        ranks[order] = np.arange(len(terms))
+        lengths = np.asarray(doc_lengths, dtype=np.int32)
+        token_rows = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths)
+        width = max(len(terms), 1)
+        pairs, freqs = np.unique(
+            token_rows * width + ranks[np.asarray(token_ids, dtype=np.int64)],
+            return_counts=True,
+        )
+        return cls._from_postings(
+            terms[order], pairs % width, pairs // width, freqs, lengths
+        )
+
+    @classmethod
+    def _from_postings(
+        cls,
+        terms: np.ndarray,
+        term_ids: np.ndarray,
+        rows: np.ndarray,
+        term_freqs: np.ndarray,
+        doc_lengths: np.ndarray,
+    ) -> Bm25Index:
+        # ``terms`` is sorted; terms left without postings are dropped.
+        counts = np.bincount(term_ids, minlength=len(terms))
+        used = counts > 0
+        remap = np.cumsum(used) - 1
+        order = np.argsort(remap[term_ids], kind="stable")
+        term_offsets = np.zeros(int(used.sum()) + 1, dtype=np.int64)
+        np.cumsum(counts[used], out=term_offsets[1:])
+        return cls(
+            terms=terms[used],
+            term_offsets=term_offsets,
+            rows=rows[order].astype(np.int32),
+            term_freqs=term_freqs[order].astype(np.int32),
+            doc_lengths=doc_lengths.astype(np.int32),
+        )
+
+    def __len__(self) -> int:
+        return int(self.doc_lengths.shape[0])
+
+    @property
+    def avg_doc_length(self) -> float:
+        return float(self.doc_lengths.mean()) if len(self) else 0.0
+
+    def _term_ids(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self.terms)), np.diff(self.term_offsets))
+
+    def concat(self, other: Bm25Index) -> Bm25Index:
+        """Postings of ``self`` followed by ``other``'s rows, renumbered."""
+        terms = np.union1d(self.terms, other.terms)
+        return self._from_postings(
+            terms,
+            np.concatenate(
+                [
+                    np.searchsorted(terms, self.terms)[self._term_ids()],
+                    np.searchsorted(terms, other.terms)[other._term_ids()],
+                ]
+            ),
+            np.concatenate([self.rows, other.rows + len(self)]),
+            np.concatenate([self.term_freqs, other.term_freqs]),
+            np.concatenate([self.doc_lengths, other.doc_lengths]),
+        )
+
+    def take(self, rows: np.ndarray) -> Bm25Index:
+        """Postings of ``rows``, renumbered in the order given."""
+        new_rows = np.full(len(self), -1, dtype=np.int64)
+        new_rows[rows] = np.arange(len(rows))
+        mapped = new_rows[self.rows]
+        kept = mapped >= 0
+        return self._from_postings(
+            self.terms,
+            self._term_ids()[kept],
+            mapped[kept],
+            self.term_freqs[kept],
+            self.doc_lengths[rows],
+        )
+
+    def _positions(self, terms: np.ndarray) -> np.ndarray:
+        # Position of each term in ``self.terms``, or -1 when absent.
+        positions = np.searchsorted(self.terms, terms)
+        found = positions < len(self.terms)
+        found[found] = self.terms[positions[found]] == terms[found]
+        return np.where(found, positions, -1)
+
+    def stats(self, terms: np.ndarray) -> Bm25Stats:
+        positions = self._positions(terms)
+        frequencies = np.diff(self.term_offsets)[np.maximum(positions, 0)]
+        return Bm25Stats(
+            doc_count=len(self),
+            total_length=int(self.doc_lengths.sum()),
+            document_frequencies=np.where(positions >= 0, frequencies, 0),
+        )
+
+    def scores(
+        self,
+        query: str,
+        k1: float = 1.2,
+        b: float = 0.75,
+        stats: Bm25Stats | None = None,
+    ) -> np.ndarray:
+        """Score every row; ``stats`` defaults to this index's own corpus."""
+        scores = np.zeros(len(self), dtype=np.float32)
+        terms = query_terms(query)
+        if not len(terms) or not len(self.terms):
+            return scores
+        if stats is None:
+            stats = self.stats(terms)
+        self._add_scores(scores, terms, stats, k1, b)
+        return scores
+
+    def _add_scores(
+        self,
+        scores: np.ndarray,
+        terms: np.ndarray,
+        stats: Bm25Stats,
+        k1: float,
+        b: float,
+    ) -> None:
+        norm = k1 * (1 - b + b * self.doc_lengths / max(stats.avg_doc_length, 1e-9))
+        for position, df in zip(self._positions(terms), stats.document_frequencies):
+            if position < 0:
+                continue
+            start, end = self.term_offsets[position], self.term_offsets[position + 1]
+            rows = self.rows[start:end]
+            freqs = self.term_freqs[start:end].astype(np.float32)
+            idf = math.log(1 + (stats.doc_count - df + 0.5) / (df + 0.5))
+            scores[rows] += idf * freqs * (k1 + 1) / (freqs + norm[rows])
+
+
+@dataclass(frozen=True)
+class Bm25Runs:
+    """BM25 postings that grow by appending rows.
+
+    Appended rows get a run of their own, so an append tokenizes only the new
+    texts. The newest run merges into the one before it once it is at least
+    half that size, which keeps runs few and merges each posting O(log n)
+    times.
+    """
+
+    runs: tuple[Bm25Index, ...] = ()
+
+    @classmethod
+    def build(cls, texts: Iterable[str]) -> Bm25Runs:
+        return cls().append(cls((Bm25Index.build(texts),)))
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self.runs)
+
+    def append(self, other: Bm25Runs) -> Bm25Runs:
+        runs = list(self.runs)
+        for run in other.runs:
+            if not len(run):
+                continue
+            runs.append(run)
+            while len(runs) > 1 and 2 * len(runs[-1]) >= len(runs[-2]):
+                newest = runs.pop()
+                runs[-1] = runs[-1].concat(newest)
+        return Bm25Runs(tuple(runs))
+
+    def merged(self) -> Bm25Index:
+        if len(self.runs) == 1:
+            return self.runs[0]
+        merged = Bm25Index.build([])
+        for run in self.runs:
+            merged = merged.concat(run)
+        return merged
+
+    def take(self, rows: np.ndarray) -> Bm25Runs:
+        return Bm25Runs().append(Bm25Runs((self.merged().take(rows),)))
+
+    def stats(self, terms: np.ndarray) -> Bm25Stats:
+        stats = Bm25Stats(0, 0, np.zeros(len(terms), dtype=np.int64))
+        for run in self.runs:
+            stats = stats + run.stats(terms)
+        return stats
+
+    def scores(
+        self,
+        query: str,
+        k1: float = 1.2,
+        b: float = 0.75,
+        stats: Bm25Stats | None = None,
+    ) -> np.ndarray:
+        scores = np.zeros(len(self), dtype=np.float32)
+        terms = query_terms(query)
+        if not len(terms):
+            return scores
+        if stats is None:
+            stats = self.stats(terms)
+        start = 0
+        for run in self.runs:
+            run._add_scores(scores[start : start + len(run)], terms, stats, k1, b)
+            start += len(run)
+        return scores
+
+
+def reciprocal_rank_fusion(rankings: Iterable[np.ndarray], size: int) -> np.ndarray:
+    """Fuse row rankings (best first) into one score per row."""
+    fused = np.zeros(size, dtype=np.float64)
+    for ranking in rankings:
+        fused[ranking] += 1.0 / (_RRF_K + np.arange(1, len(ranking) + 1))
+    return fused
@@ -1,29 +1,357 @@
+"""Registry model types, scored with vectorized NumPy.
+
+Every type is built from plain arrays (see :mod:`caseflow.ml.registry` for
+the ``model.json`` layout), so serving never imports scikit-learn or unpickles
+estimator objects.
+"""
+
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
 import numpy as np
-from sklearn.datasets import make_classification
-from sklearn.linear_model import LogisticRegression
 
-RANDOM_STATE = 42
-N_FEATURES = 4
 
-_X, _y = make_classification(
-    n_samples=200,
-    n_features=N_FEATURES,
-    n_informative=3,
-    n_redundant=1,
-    n_clusters_per_class=1,
-    random_state=RANDOM_STATE,
-)
+class _FeatureAssembler:
+    """Builds feature rows for one schema, compiled when the model loads.
+
+    A request that provides exactly the schema's keys is filled without
+    building any set or list; only other key sets go through the detailed
+    checks that name what is unknown or missing.
+    """
+
+    __slots__ = (
+        "_columns",
+        "_required",
+        "_undefaulted",
+        "_template",
+        "_exact",
+    )
+
+    def __init__(
+        self,
+        names: list[str],
+        required: set[str],
+        defaults: dict[str, float],
+        width: int,
+    ) -> None:
+        self._columns = {name: column for column, name in enumerate(names)}
+        self._required = frozenset(required)
+        self._undefaulted = frozenset(
+            name for name in names if name not in required and name not in defaults
+        )
+        self._template = np.asarray(
+            [defaults.get(name, 0.0) for name in names], dtype=np.float64
+        )
+        # Duplicate names or a width mismatch always fail, so they never take
+        # the fast path.
+        self._exact = (
+            frozenset(names) if len(self._columns) == len(names) == width else None
+        )
+
+    def fill(self, row: np.ndarray, features: dict[str, object]) -> None:
+        # Comparing a dict's keys view with a frozenset allocates nothing, and
+        # an exact match writes every column, so the template copy is skipped.
+        if self._exact is None or features.keys() != self._exact:
+            self._check_keys(features, row.shape[0])
+            row[:] = self._template
+        try:
+            for name, value in features.items():
+                row[self._columns[name]] = float(value)  # type: ignore[arg-type]
+        except (TypeError, ValueError) as exc:
+            raise ValueError("'features' object values must be numeric") from exc
+
+    def _check_keys(self, features: dict[str, object], width: int) -> None:
+        provided_names = features.keys()
+        extra_names = sorted(provided_names - self._columns.keys())
+        if extra_names:
+            raise ValueError("Unknown feature keys: " + ", ".join(extra_names))
+
+        missing_required = sorted(self._required - provided_names)
+        if missing_required:
+            raise ValueError(
+                "Missing required feature keys: " + ", ".join(missing_required)
+            )
+
+        missing_optional_without_default = sorted(self._undefaulted - provided_names)
+        if missing_optional_without_default:
+            raise ValueError(
+                "Missing optional feature keys with no default: "
+                + ", ".join(missing_optional_without_default)
+            )
+
+        if len(self._columns) != width:
+            raise ValueError("'features' object does not match model weight dimensions")
+
+
+def _sigmoid(values: np.ndarray) -> np.ndarray:
+    # exp(-log(1 + exp(-z))) never overflows, unlike 1 / (1 + exp(-z)).
+    return np.exp(-np.logaddexp(0.0, -values))
+
+
+class RegistryModel(ABC):
+    """Scoring surface shared by every registry model type.
+
+    Subclasses are frozen dataclasses that define the attributes annotated
+    here (``n_features`` may be a property), implement :meth:`_score` over a
+    validated float64 matrix and call :meth:`_compile_schema` from
+    ``__post_init__``.
+    """
+
+    model_id: str
+    type: str
+    feature_names: list[str] | None
+    required_names: set[str] | None
+    defaults: dict[str, float] | None
+    n_features: int
+    _assembler: _FeatureAssembler | None
+
+    @abstractmethod
+    def _score(self, rows: np.ndarray) -> np.ndarray: ...
+
+    def _score_row(self, row: np.ndarray) -> float:
+        return float(self._score(row[np.newaxis, :])[0])
+
+    def _compile_schema(self) -> None:
+        assembler = None
+        if self.feature_names is not None:
+            names = self.feature_names
+            assembler = _FeatureAssembler(
+                names,
+                self.required_names or set(names),
+                self.defaults or {},
+                self.n_features,
+            )
+        object.__setattr__(self, "_assembler", assembler)
+
+    def check_width(self, width: int) -> None:
+        if width != self.n_features:
+            raise ValueError(
+                "'features' must contain exactly "
+                f"{self.n_features} values for model '{self.model_id}'"
+            )
+
+    def predict(self, features: list[float]) -> float:
+        self.check_width(len(features))
+
+        return self._score_row(np.asarray(features, dtype=np.float64))
+
+    def predict_batch(self, matrix: np.ndarray | list[list[float]]) -> np.ndarray:
+        """Score every row of ``matrix`` in one vectorized pass."""
+        try:
+            rows = np.asarray(matrix, dtype=np.float64)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("'features' must contain only numeric values") from exc
+
+        if rows.size == 0:
+            return np.zeros(0, dtype=np.float64)
+        if rows.ndim != 2:
+            raise ValueError("'features' batch must be a 2-D matrix")
+        self.check_width(rows.shape[1])
+
+        return self._score(rows)
+
+    def predict_named_batch(self, rows: list[dict[str, object]]) -> np.ndarray:
+        """Score feature dicts, validating each exactly like
+        :meth:`vector_from_named_features`.
+
+        Errors name the offending row as ``rows[i]``.
+        """
+        matrix = np.empty((len(rows), self.n_features), dtype=np.float64)
+        for position, features in enumerate(rows):
+            try:
+                self._fill_named_row(matrix[position], features)
+            except ValueError as exc:
+                raise ValueError(f"rows[{position}]: {exc}") from exc
+        return self._score(matrix)
+
+    def _fill_named_row(self, row: np.ndarray, features: dict[str, object]) -> None:
+        if self._assembler is None:
+            raise ValueError(
+                "'features' object is not supported for model without schema"
+            )
+        self._assembler.fill(row, features)
+
+    def vector_from_named_features(self, features: dict[str, object]) -> list[float]:
+        row = np.empty(self.n_features, dtype=np.float64)
+        self._fill_named_row(row, features)
+        return row.tolist()
+
+
+@dataclass(frozen=True)
+class LinearModel(RegistryModel):
+    """``bias + weights . x``."""
+
+    model_id: str
+    type: str
+    bias: float
+    weights: list[float]
+    feature_names: list[str] | None = None
+    required_names: set[str] | None = None
+    defaults: dict[str, float] | None = None
+
+    # Compiled once at construction so scoring does no per-request set or
+    # list building.
+    _weight_vector: np.ndarray = field(init=False, repr=False, compare=False)
+    _intercept: float = field(init=False, repr=False, compare=False)
+    _assembler: _FeatureAssembler | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        compiled = object.__setattr__
+        compiled(self, "_weight_vector", np.asarray(self.weights, dtype=np.float64))
+        compiled(self, "_intercept", float(self.bias))
+        self._compile_schema()
+
+    @property
+    def n_features(self) -> int:
+        return len(self.weights)
+
+    def _score(self, rows: np.ndarray) -> np.ndarray:
+        return rows @ self._weight_vector + self._intercept
+
+    def _score_row(self, row: np.ndarray) -> float:
+        return self._intercept + float(self._weight_vector @ row)
+
+
+@dataclass(frozen=True)
+class LogisticModel(LinearModel):
+    """``sigmoid(bias + weights . x)``, e.g. an exported ``LogisticRegression``."""
+
+    def _score(self, rows: np.ndarray) -> np.ndarray:
+        return _sigmoid(super()._score(rows))
+
+    def _score_row(self, row: np.ndarray) -> float:
+        return float(_sigmoid(np.float64(super()._score_row(row))))
+
+
+@dataclass(frozen=True)
+class ScaledLinearModel(LinearModel):
+    """``bias + weights . ((x - mean) / scale)``, a ``StandardScaler`` + linear
+    pipeline.
+
+    ``bias`` and ``weights`` are the estimator's own, in scaled space. The
+    scaler is folded into one weight vector at load time, so scoring costs
+    the same as :class:`LinearModel`.
+    """
+
+    mean: list[float] = field(default_factory=list)
+    scale: list[float] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        mean = np.asarray(self.mean, dtype=np.float64)
+        scale = np.asarray(self.scale, dtype=np.float64)
+        if mean.shape != self._weight_vector.shape:
+            raise ValueError("'mean' must match the length of 'weights'")
+        if scale.shape != self._weight_vector.shape:
+            raise ValueError("'scale' must match the length of 'weights'")
+        if not np.all(np.isfinite(scale)) or np.any(scale == 0.0):
+            raise ValueError("'scale' values must be finite and non-zero")
+
+        folded = self._weight_vector / scale
+        object.__setattr__(self, "_weight_vector", folded)
+        object.__setattr__(self, "_intercept", float(self.bias - mean @ folded))
+
+
+TREE_LINKS = {"identity", "logistic"}
+
+
+@dataclass(frozen=True)
+class TreeEnsembleModel(RegistryModel):
+    """Sum of regression trees, ``link(base_score + sum(tree(x)))``.
+
+    Nodes of all trees share flat arrays indexed by node id; ``roots`` holds
+    each tree's root node. Internal nodes send ``x[feature] <= threshold``
+    (NaN never is) to ``left`` and everything else to ``right``; leaves have
+    ``left == right == -1`` and contribute ``value``.
+    """
+
+    model_id: str
+    type: str
+    n_features: int
+    roots: np.ndarray = field(repr=False, compare=False)
+    feature: np.ndarray = field(repr=False, compare=False)
+    threshold: np.ndarray = field(repr=False, compare=False)
+    left: np.ndarray = field(repr=False, compare=False)
+    right: np.ndarray = field(repr=False, compare=False)
+    value: np.ndarray = field(repr=False, compare=False)
+    base_score: float = 0.0
+    link: str = "identity"
+    feature_names: list[str] | None = None
+    required_names: set[str] | None = None
+    defaults: dict[str, float] | None = None
+
+    _feature: np.ndarray = field(init=False, repr=False, compare=False)
+    _left: np.ndarray = field(init=False, repr=False, compare=False)
+    _right: np.ndarray = field(init=False, repr=False, compare=False)
+    _depth: int = field(init=False, repr=False, compare=False)
+    _assembler: _FeatureAssembler | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.link not in TREE_LINKS:
+            raise ValueError("'link' must be one of: " + ", ".join(sorted(TREE_LINKS)))
+        if self.n_features < 1:
+            raise ValueError("'n_features' must be a positive integer")
+
+        nodes = self.value.shape[0]
+        for name in ("feature", "threshold", "left", "right", "value"):
+            array = getattr(self, name)
+            if array.ndim != 1 or array.shape[0] != nodes:
+                raise ValueError("tree node arrays must all have the same length")
+        if self.roots.ndim != 1 or self.roots.size == 0:
+            raise ValueError("'roots' must list at least one tree")
+
+        is_leaf = self.left < 0
+        if np.any(is_leaf != (self.right < 0)):
+            raise ValueError("tree leaves must have both 'left' and 'right' set to -1")
+        internal = ~is_leaf
+        if np.any(self.left[internal] >= nodes) or np.any(
+            self.right[internal] >= nodes
+        ):
+            raise ValueError("tree child indexes must point at existing nodes")
+        if np.any(self.feature[internal] < 0) or np.any(
+            self.feature[internal] >= self.n_features
+        ):
+            raise ValueError("tree split features must be below 'n_features'")
+        if np.any((self.roots < 0) | (self.roots >= nodes)):
+            raise ValueError("'roots' must point at existing nodes")
+
+        compiled = object.__setattr__
+        compiled(self, "_depth", _forest_depth(self.roots, self.left, self.right))
+        # Leaves point at themselves and split on column 0, so every row can
+        # take the same number of steps without masking finished trees.
+        node_ids = np.arange(nodes, dtype=np.intp)
+        compiled(self, "_feature", np.where(is_leaf, 0, self.feature).astype(np.intp))
+        compiled(self, "_left", np.where(is_leaf, node_ids, self.left).astype(np.intp))
+        compiled(
+            self, "_right", np.where(is_leaf, node_ids, self.right).astype(np.intp)
+        )
+        self._compile_schema()
 
-_model = LogisticRegression(random_state=RANDOM_STATE, max_iter=500)
-_model.fit(_X, _y)
+    def _score(self, rows: np.ndarray) -> np.ndarray:
+        nodes = np.repeat(self.roots[np.newaxis, :], rows.shape[0], axis=0)
+        row_ids = np.arange(rows.shape[0])[:, np.newaxis]
+        for _ in range(self._depth):
+            go_left = rows[row_ids, self._feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self._left[nodes], self._right[nodes])
 
+        raw = self.base_score + self.value[nodes].sum(axis=1)
+        return _sigmoid(raw) if self.link == "logistic" else raw
 
-def predict(features: list[float]) -> float:
-    if len(features) != N_FEATURES:
-        raise ValueError(f"Expected {N_FEATURES} features, got {len(features)}")
 
-    vector = np.asarray(features, dtype=float).reshape(1, -1)
-    prediction = _model.predict_proba(vector)[0, 1]
-    return float(prediction)
+def _forest_depth(roots: np.ndarray, left: np.ndarray, right: np.ndarray) -> int:
+    """Return the deepest root-to-leaf edge count, rejecting shared or cyclic
+    nodes so evaluation always terminates."""
+    seen = np.zeros(left.shape[0], dtype=bool)
+    depth = 0
+    level = np.asarray(roots, dtype=np.intp)
+    while True:
+        if np.any(seen[level]) or np.unique(level).size != level.size:
+            raise ValueError("tree nodes must form disjoint trees")
+        seen[level] = True
+        internal = level[left[level] >= 0]
+        if internal.size == 0:
+            return depth
+        level = np.concatenate((left[internal], right[internal])).astype(np.intp)
+        depth += 1
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import numpy as np
+
+EMBEDDING_STORAGES = {"float32", "float16", "int8"}
+
+_STORAGE_DTYPES = {
+    "float32": np.dtype("<f4"),
+    "float16": np.dtype("<f2"),
+    "int8": np.dtype("i1"),
+}
+_INT8_MAX = 127
+_SCORE_BLOCK_ROWS = 4096
+
+
+def storage_dtype(storage: str) -> np.dtype:
+    try:
+        return _STORAGE_DTYPES[storage]
+    except KeyError:
+        raise ValueError(
+            "storage must be one of: " + ", ".join(sorted(EMBEDDING_STORAGES))
+        ) from None
+
+
+def storage_of(codes: np.ndarray) -> str:
+    for storage, dtype in _STORAGE_DTYPES.items():
+        if codes.dtype == dtype:
+            return storage
+    raise ValueError(f"Unsupported embedding dtype: {codes.dtype}")
+
+
+def quantize(
+    embeddings: np.ndarray, storage: str
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """Encode float rows as ``(codes, scales)`` for ``storage``.
+
+    int8 uses symmetric per-row scaling, ``row ~= codes * scale``, so each
+    vector keeps its own dynamic range. Float storages carry no scales.
+    """
+    dtype = storage_dtype(storage)
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if storage != "int8":
+        return np.ascontiguousarray(embeddings, dtype=dtype), None
+
+    peaks = np.abs(embeddings).max(axis=1) if embeddings.size else np.zeros(0)
+    scales = (peaks / _INT8_MAX).astype(np.float32)
+    divisors = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.rint(embeddings / divisors[:, None])
+    codes = np.clip(codes, -_INT8_MAX, _INT8_MAX).astype(dtype)
+    return codes, scales
+
+
+def dequantize(codes: np.ndarray, scales: np.ndarray | None) -> np.ndarray:
+    embeddings = np.asarray(codes, dtype=np.float32)
+    if scales is not None:
+        embeddings = embeddings * scales[:, None]
+    return embeddings
+
+
+def quantized_scores(
+    codes: np.ndarray, scales: np.ndarray | None, queries: np.ndarray
+) -> np.ndarray:
+    """Dot products of stored rows with float ``queries`` (a vector or a
+    ``(dims, n)`` matrix), applying the row scales after the product.
+
+    float16 and int8 rows are upcast one block at a time, so scoring never
+    materializes a float32 copy of the whole matrix.
+    """
+    queries = np.asarray(queries, dtype=np.float32)
+    if codes.dtype == np.float32:
+        scores = codes @ queries
+    else:
+        scores = np.empty((codes.shape[0], *queries.shape[1:]), dtype=np.float32)
+        for start in range(0, codes.shape[0], _SCORE_BLOCK_ROWS):
+            block = np.asarray(
+                codes[start : start + _SCORE_BLOCK_ROWS], dtype=np.float32
+            )
+            np.matmul(block, queries, out=scores[start : start + block.shape[0]])
+    if scales is not None:
+        scores *= scales if scores.ndim == 1 else scales[:, None]
+    return scores
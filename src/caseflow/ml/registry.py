@@ -1,86 +1,114 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import logging
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
 
-from caseflow.core.settings import get_settings
-
-
-@dataclass(frozen=True)
-class LinearModel:
-    model_id: str
-    type: str
-    bias: float
-    weights: list[float]
-    feature_names: list[str] | None = None
-    required_names: set[str] | None = None
-    defaults: dict[str, float] | None = None
+import numpy as np
 
-    def predict(self, features: list[float]) -> float:
-        if len(features) != len(self.weights):
-            raise ValueError(
-                "'features' must contain exactly "
-                f"{len(self.weights)} values for model '{self.model_id}'"
-            )
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
 
-        return self.bias + sum(
-            weight * feature for weight, feature in zip(self.weights, features)
-        )
-
-    def vector_from_named_features(self, features: dict[str, object]) -> list[float]:
-        if self.feature_names is None:
-            raise ValueError(
-                "'features' object is not supported for model without schema"
-            )
+from caseflow.core.metrics import increment_metric, set_gauge_metric
+from caseflow.core.settings import get_settings
+from caseflow.ml.model import (
+    LinearModel,
+    LogisticModel,
+    RegistryModel,
+    ScaledLinearModel,
+    TreeEnsembleModel,
+)
 
-        expected_names = set(self.feature_names)
-        provided_names = set(features.keys())
+logger = logging.getLogger(__name__)
 
-        extra_names = sorted(provided_names - expected_names)
 
-        if extra_names:
-            raise ValueError("Unknown feature keys: " + ", ".join(extra_names))
+ModelVersion = tuple[int, int, int]
 
-        required_names = self.required_names or set(self.feature_names)
-        defaults = self.defaults or {}
 
-        missing_required = sorted(
-            name for name in required_names if name not in provided_names
-        )
-        if missing_required:
-            raise ValueError(
-                "Missing required feature keys: " + ", ".join(missing_required)
-            )
+class _ModelCache:
+    """LRU of parsed models keyed by ``model.json`` path and file version."""
 
-        missing_optional_without_default = sorted(
-            name
-            for name in self.feature_names
-            if name not in provided_names
-            and name not in required_names
-            and name not in defaults
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[ModelVersion, RegistryModel]] = (
+            OrderedDict()
         )
-        if missing_optional_without_default:
-            raise ValueError(
-                "Missing optional feature keys with no default: "
-                + ", ".join(missing_optional_without_default)
-            )
-
-        try:
-            vector = [
-                float(features[name]) if name in features else float(defaults[name])
-                for name in self.feature_names
-            ]
-        except (TypeError, ValueError) as exc:
-            raise ValueError("'features' object values must be numeric") from exc
-
-        if len(vector) != len(self.weights):
-            raise ValueError("'features' object does not match model weight dimensions")
-
-        return vector
-
-
-_active_model: LinearModel | None = None
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, version: ModelVersion | None) -> RegistryModel | None:
+        """Return the cached model, or ``None`` on a miss. With ``version``
+        set, an entry for another version of the file is a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and version is not None and entry[0] != version:
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+            ratio = self._hits / (self._hits + self._misses)
+
+        outcome = "hits" if entry is not None else "misses"
+        increment_metric(f"model_cache_{outcome}_total")
+        set_gauge_metric("model_cache_hit_ratio", ratio)
+        return entry[1] if entry is not None else None
+
+    def version(self, key: str) -> ModelVersion | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def put(
+        self, key: str, version: ModelVersion, model: RegistryModel, max_entries: int
+    ) -> None:
+        with self._lock:
+            self._entries[key] = (version, model)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+            size = len(self._entries)
+        set_gauge_metric("model_cache_entries", size)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            size = len(self._entries)
+        set_gauge_metric("model_cache_entries", size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+_model_cache = _ModelCache()
+_watcher_thread: threading.Thread | None = None
+_watcher_stop = threading.Event()
+_active_model: RegistryModel | None = None
+# Generation of the shared activation record this worker last applied, and
+# the file version it was read from.
+_active_generation = 0
+_activation_version: ModelVersion | None = None
+_activation_lock = threading.Lock()
 
 
 def _registry_dir() -> Path:
@@ -96,30 +124,69 @@ def list_model_ids() -> list[str]:
     model_ids = [
         item.name
         for item in root.iterdir()
-        if item.is_dir() and (item / "model.json").is_file()
+        if item.is_dir()
+        and not item.name.startswith(".")
+        and (item / "model.json").is_file()
     ]
     return sorted(model_ids)
 
 
-def load_model(model_id: str) -> LinearModel:
-    model_path = _registry_dir() / model_id / "model.json"
+def _model_path(model_id: str) -> Path:
+    # Ids name a directory directly under the registry: no separators and no
+    # dot names such as "..", which would resolve outside it.
+    if model_id.startswith(".") or Path(model_id).name != model_id:
+        raise _not_found(model_id)
+    return _registry_dir() / model_id / "model.json"
+
+
+def _file_version(stat: os.stat_result) -> ModelVersion:
+    # Registry writes usually replace the file, so the inode changes even
+    # when the rewrite lands within one mtime tick.
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _not_found(model_id: str) -> FileNotFoundError:
+    return FileNotFoundError(f"Model '{model_id}' was not found in the registry")
+
+
+def _read_model(model_id: str) -> tuple[ModelVersion, RegistryModel]:
+    model_path = _model_path(model_id)
 
     if not model_path.is_file():
-        raise FileNotFoundError(f"Model '{model_id}' was not found in the registry")
+        raise _not_found(model_id)
+
+    with model_path.open("rb") as handle:
+        version = _file_version(os.fstat(handle.fileno()))
+        raw = handle.read()
 
     try:
-        payload = json.loads(model_path.read_text(encoding="utf-8"))
+        payload = json.loads(raw.decode("utf-8"))
     except json.JSONDecodeError as exc:
         raise ValueError(f"Model '{model_id}' has invalid JSON in model.json") from exc
 
+    return version, _parse_model(model_id, payload, model_path.parent)
+
+
+def load_model(model_id: str) -> RegistryModel:
+    """Read and validate ``model.json`` from disk, bypassing the cache."""
+    return _read_model(model_id)[1]
+
+
+def _parse_model(
+    model_id: str, payload: object, model_dir: Path | None = None
+) -> RegistryModel:
+    """Build a model from its ``model.json`` payload.
+
+    Array fields (``weights``, ``mean``, tree node arrays, ...) are JSON lists
+    or, when ``arrays`` names an ``.npz`` file next to ``model.json``, entries
+    of that file. The cache tracks ``model.json`` only, so publish a new
+    sidecar under a new name and rewrite ``model.json`` to point at it.
+    """
     if not isinstance(payload, dict):
         raise ValueError(f"Model '{model_id}' payload must be a JSON object")
 
     payload_model_id = payload.get("model_id")
     payload_type = payload.get("type")
-    payload_bias = payload.get("bias")
-    payload_weights = payload.get("weights")
-    payload_schema = payload.get("schema")
 
     if payload_model_id != model_id:
         raise ValueError(
@@ -127,126 +194,549 @@ def load_model(model_id: str) -> LinearModel:
             f"'{payload_model_id}' in model.json"
         )
 
-    if payload_type != "linear":
-        raise ValueError(f"Model '{model_id}' must have type 'linear'")
+    parser = _MODEL_PARSERS.get(payload_type)  # type: ignore[arg-type]
+    if parser is None:
+        raise ValueError(
+            f"Model '{model_id}' must have type one of: " + ", ".join(MODEL_TYPES)
+        )
+
+    arrays = _load_sidecar(model_id, payload, model_dir)
+    try:
+        return parser(model_id, payload, arrays)
+    except _InvalidModel as exc:
+        raise ValueError(f"Model '{model_id}' is invalid: {exc}") from exc
+
+
+class _InvalidModel(ValueError):
+    """Raised by model constructors; reported with the model id prefixed."""
+
+
+def _load_sidecar(
+    model_id: str, payload: dict[str, object], model_dir: Path | None
+) -> dict[str, np.ndarray]:
+    name = payload.get("arrays")
+    if name is None:
+        return {}
+    if (
+        not isinstance(name, str)
+        or Path(name).name != name
+        or not name.endswith(".npz")
+        or model_dir is None
+    ):
+        raise ValueError(
+            f"Model '{model_id}' 'arrays' must name an .npz file next to model.json"
+        )
+
+    try:
+        with np.load(model_dir / name, allow_pickle=False) as archive:
+            return {key: archive[key] for key in archive.files}
+    except (OSError, ValueError, zipfile.BadZipFile) as exc:
+        raise ValueError(
+            f"Model '{model_id}' has an unreadable 'arrays' file '{name}'"
+        ) from exc
+
+
+def _float_array(
+    model_id: str,
+    payload: dict[str, object],
+    arrays: dict[str, np.ndarray],
+    name: str,
+) -> np.ndarray:
+    value = payload[name] if name in payload else arrays.get(name)
+    if value is None or (isinstance(value, list) and not value):
+        raise ValueError(f"Model '{model_id}' must define a non-empty '{name}' list")
 
     try:
-        bias = float(payload_bias)
+        array = np.asarray(value, dtype=np.float64)
     except (TypeError, ValueError) as exc:
         raise ValueError(
-            f"Model '{model_id}' has invalid numeric 'bias' value"
+            f"Model '{model_id}' has non-numeric values in '{name}'"
         ) from exc
 
-    if not isinstance(payload_weights, list) or not payload_weights:
-        raise ValueError(f"Model '{model_id}' must define a non-empty 'weights' list")
+    if array.ndim != 1 or array.size == 0:
+        raise ValueError(f"Model '{model_id}' must define a non-empty '{name}' list")
+    return array
 
+
+def _index_array(
+    model_id: str,
+    payload: dict[str, object],
+    arrays: dict[str, np.ndarray],
+    name: str,
+) -> np.ndarray:
+    array = _float_array(model_id, payload, arrays, name)
+    if not np.all(np.isfinite(array)) or np.any(array != np.trunc(array)):
+        raise ValueError(f"Model '{model_id}' has non-integer values in '{name}'")
+    return array.astype(np.intp)
+
+
+def _float_value(
+    model_id: str, payload: dict[str, object], name: str, default: float | None
+) -> float:
+    value = payload.get(name, default)
     try:
-        weights = [float(value) for value in payload_weights]
+        return float(value)  # type: ignore[arg-type]
     except (TypeError, ValueError) as exc:
         raise ValueError(
-            f"Model '{model_id}' has non-numeric values in 'weights'"
+            f"Model '{model_id}' has invalid numeric '{name}' value"
         ) from exc
 
-    feature_names: list[str] | None = None
-    required_names: set[str] | None = None
-    defaults: dict[str, float] | None = None
-    if payload_schema is not None:
-        if not isinstance(payload_schema, dict):
-            raise ValueError(f"Model '{model_id}' has invalid 'schema' section")
 
-        schema_version = payload_schema.get("schema_version")
-        if schema_version not in {"1", "2"}:
+def _parse_schema(
+    model_id: str, payload_schema: object, width: int, width_name: str
+) -> tuple[list[str] | None, set[str] | None, dict[str, float] | None]:
+    if payload_schema is None:
+        return None, None, None
+    if not isinstance(payload_schema, dict):
+        raise ValueError(f"Model '{model_id}' has invalid 'schema' section")
+
+    schema_version = payload_schema.get("schema_version")
+    if schema_version not in {"1", "2"}:
+        raise ValueError(
+            f"Model '{model_id}' schema_version must be '1' or '2' when schema is set"
+        )
+
+    schema_features = payload_schema.get("features")
+    if not isinstance(schema_features, list) or not schema_features:
+        raise ValueError(
+            f"Model '{model_id}' schema must define a non-empty 'features' list"
+        )
+
+    parsed_names: list[str] = []
+    parsed_required: set[str] = set()
+    parsed_defaults: dict[str, float] = {}
+    for item in schema_features:
+        if not isinstance(item, dict):
+            raise ValueError(f"Model '{model_id}' schema features must be objects")
+
+        name = item.get("name")
+        dtype = item.get("dtype")
+        if not isinstance(name, str) or not name.strip():
             raise ValueError(
-                f"Model '{model_id}' schema_version must be '1' or '2' "
-                f"when schema is set"
+                f"Model '{model_id}' schema feature names must be non-empty strings"
             )
-
-        schema_features = payload_schema.get("features")
-        if not isinstance(schema_features, list) or not schema_features:
+        if dtype != "float":
             raise ValueError(
-                f"Model '{model_id}' schema must define a non-empty 'features' list"
+                f"Model '{model_id}' schema feature '{name}' must have dtype 'float'"
             )
 
-        parsed_names: list[str] = []
-        parsed_required: set[str] = set()
-        parsed_defaults: dict[str, float] = {}
-        for item in schema_features:
-            if not isinstance(item, dict):
-                raise ValueError(f"Model '{model_id}' schema features must be objects")
+        parsed_names.append(name)
 
-            name = item.get("name")
-            dtype = item.get("dtype")
-            if not isinstance(name, str) or not name.strip():
+        if schema_version == "2":
+            required = item.get("required")
+            if not isinstance(required, bool):
                 raise ValueError(
-                    f"Model '{model_id}' schema feature names must be non-empty strings"
-                )
-            if dtype != "float":
-                raise ValueError(
-                    f"Model '{model_id}' schema feature '{name}' must have dtype "
-                    f"'float'"
+                    f"Model '{model_id}' schema feature '{name}' must define "
+                    f"boolean 'required'"
                 )
 
-            parsed_names.append(name)
-
-            if schema_version == "2":
-                required = item.get("required")
-                if not isinstance(required, bool):
+            if required:
+                parsed_required.add(name)
+            elif "default" in item:
+                try:
+                    parsed_defaults[name] = float(item["default"])
+                except (TypeError, ValueError) as exc:
                     raise ValueError(
-                        f"Model '{model_id}' schema feature '{name}' must define "
-                        f"boolean 'required'"
-                    )
-
-                if required:
-                    parsed_required.add(name)
-                elif "default" in item:
-                    try:
-                        parsed_defaults[name] = float(item["default"])
-                    except (TypeError, ValueError) as exc:
-                        raise ValueError(
-                            f"Model '{model_id}' schema feature '{name}' has "
-                            f"non-numeric 'default'"
-                        ) from exc
-
-        if len(parsed_names) != len(set(parsed_names)):
-            raise ValueError(f"Model '{model_id}' schema feature names must be unique")
-
-        if len(parsed_names) != len(weights):
-            raise ValueError(
-                f"Model '{model_id}' schema feature count must match weights length"
+                        f"Model '{model_id}' schema feature '{name}' has "
+                        f"non-numeric 'default'"
+                    ) from exc
+
+    if len(parsed_names) != len(set(parsed_names)):
+        raise ValueError(f"Model '{model_id}' schema feature names must be unique")
+
+    if len(parsed_names) != width:
+        raise ValueError(
+            f"Model '{model_id}' schema feature count must match {width_name}"
+        )
+
+    if schema_version == "1":
+        return parsed_names, set(parsed_names), {}
+    return parsed_names, parsed_required, parsed_defaults
+
+
+def _parse_linear(
+    model_id: str, payload: dict[str, object], arrays: dict[str, np.ndarray]
+) -> RegistryModel:
+    bias = _float_value(model_id, payload, "bias", None)
+    weights = _float_array(model_id, payload, arrays, "weights")
+    feature_names, required_names, defaults = _parse_schema(
+        model_id, payload.get("schema"), weights.size, "weights length"
+    )
+    common = {
+        "model_id": model_id,
+        "type": payload["type"],
+        "bias": bias,
+        "weights": weights.tolist(),
+        "feature_names": feature_names,
+        "required_names": required_names,
+        "defaults": defaults,
+    }
+
+    if payload["type"] == "logistic":
+        return LogisticModel(**common)  # type: ignore[arg-type]
+    if payload["type"] == "scaled_linear":
+        mean = _float_array(model_id, payload, arrays, "mean")
+        scale = _float_array(model_id, payload, arrays, "scale")
+        try:
+            return ScaledLinearModel(
+                **common,  # type: ignore[arg-type]
+                mean=mean.tolist(),
+                scale=scale.tolist(),
             )
+        except ValueError as exc:
+            raise _InvalidModel(str(exc)) from exc
+    return LinearModel(**common)  # type: ignore[arg-type]
+
+
+def _parse_tree_ensemble(
+    model_id: str, payload: dict[str, object], arrays: dict[str, np.ndarray]
+) -> TreeEnsembleModel:
+    n_features = payload.get("n_features")
+    if not isinstance(n_features, int) or isinstance(n_features, bool):
+        raise ValueError(f"Model '{model_id}' must define integer 'n_features'")
+    link = payload.get("link", "identity")
+    if not isinstance(link, str):
+        raise ValueError(f"Model '{model_id}' 'link' must be a string")
+
+    nodes = {
+        name: _index_array(model_id, payload, arrays, name)
+        for name in ("roots", "feature", "left", "right")
+    }
+    for name in ("threshold", "value"):
+        nodes[name] = _float_array(model_id, payload, arrays, name)
+    feature_names, required_names, defaults = _parse_schema(
+        model_id, payload.get("schema"), n_features, "n_features"
+    )
+
+    try:
+        return TreeEnsembleModel(
+            model_id=model_id,
+            type="tree_ensemble",
+            n_features=n_features,
+            base_score=_float_value(model_id, payload, "base_score", 0.0),
+            link=link,
+            feature_names=feature_names,
+            required_names=required_names,
+            defaults=defaults,
+            **nodes,
+        )
+    except ValueError as exc:
+        raise _InvalidModel(str(exc)) from exc
+
+
+_MODEL_PARSERS = {
+    "linear": _parse_linear,
+    "logistic": _parse_linear,
+    "scaled_linear": _parse_linear,
+    "tree_ensemble": _parse_tree_ensemble,
+}
+MODEL_TYPES = tuple(_MODEL_PARSERS)
+
+
+def _cached_model(model_id: str, *, trust_cache: bool) -> RegistryModel:
+    max_entries = get_settings().model_cache_size
+    if not max_entries:
+        return load_model(model_id)
+
+    key = str(_model_path(model_id))
+    if trust_cache:
+        model = _model_cache.get(key, None)
+    else:
+        try:
+            version = _file_version(os.stat(key))
+        except (FileNotFoundError, NotADirectoryError) as exc:
+            _model_cache.pop(key)
+            raise _not_found(model_id) from exc
+        model = _model_cache.get(key, version)
+    if model is not None:
+        return model
+
+    version, model = _read_model(model_id)
+    _model_cache.put(key, version, model, max_entries)
+    return model
+
 
-        feature_names = parsed_names
-        if schema_version == "1":
-            required_names = set(parsed_names)
-            defaults = {}
-        else:
-            required_names = parsed_required
-            defaults = parsed_defaults
-
-    return LinearModel(
-        model_id=model_id,
-        type=payload_type,
-        bias=bias,
-        weights=weights,
-        feature_names=feature_names,
-        required_names=required_names,
-        defaults=defaults,
+def get_model(model_id: str) -> RegistryModel:
+    """Return a registry model, parsing ``model.json`` only when it changed.
+
+    Without the watcher each lookup costs one ``stat``. While the watcher
+    runs, cached models are served without touching disk and pick up
+    changes within one poll interval.
+    """
+    return _cached_model(model_id, trust_cache=model_watcher_running())
+
+
+def refresh_model_cache() -> int:
+    """Pre-load new or changed registry models; return how many were loaded.
+
+    Changed models are always reloaded. New ones are loaded only while the
+    cache has room, so a registry larger than the cache does not churn it.
+    """
+    global _active_model
+
+    max_entries = get_settings().model_cache_size
+    if not max_entries:
+        return 0
+
+    root = _registry_dir()
+    seen: set[str] = set()
+    loaded = 0
+    for model_id in list_model_ids():
+        key = str(_model_path(model_id))
+        seen.add(key)
+        try:
+            version = _file_version(os.stat(key))
+        except FileNotFoundError:
+            continue
+
+        cached_version = _model_cache.version(key)
+        if cached_version == version:
+            continue
+        if cached_version is None and len(_model_cache) >= max_entries:
+            continue
+
+        # An activation that lands while the file is parsed must win over
+        # the reload, so the swap below re-checks what was active here.
+        active, generation = _active_model, _active_generation
+        try:
+            version, model = _read_model(model_id)
+        except (FileNotFoundError, ValueError) as exc:
+            # Drop the stale entry so the next lookup reports the error.
+            _model_cache.pop(key)
+            logger.warning(
+                "model_reload_failed",
+                extra={
+                    "event": "model_reload_failed",
+                    "model_id": model_id,
+                    "error_type": exc.__class__.__name__,
+                    "error_message": str(exc),
+                },
+            )
+            continue
+
+        _model_cache.put(key, version, model, max_entries)
+        increment_metric("model_cache_reloads_total")
+        loaded += 1
+        if cached_version is None or active is None or active.model_id != model_id:
+            continue
+        with _activation_lock:
+            if _active_model is not active or _active_generation != generation:
+                continue
+            _active_model = model
+        logger.info(
+            "active_model_reloaded",
+            extra={"event": "active_model_reloaded", "model_id": model_id},
+        )
+
+    for key in _model_cache.keys():
+        if Path(key).parent.parent == root and key not in seen:
+            _model_cache.pop(key)
+    return loaded
+
+
+def _watch_registry(stop: threading.Event, interval: float) -> None:
+    while True:
+        try:
+            refresh_model_cache()
+        except Exception:  # pragma: no cover - keep the watcher alive
+            logger.exception(
+                "model_watch_failed", extra={"event": "model_watch_failed"}
+            )
+        if stop.wait(interval):
+            return
+
+
+def start_model_watcher() -> bool:
+    """Poll the registry every ``MODEL_WATCH_INTERVAL_SECONDS`` (0 disables)."""
+    global _watcher_thread, _watcher_stop
+
+    settings = get_settings()
+    interval = settings.model_watch_interval_seconds
+    if interval <= 0 or not settings.model_cache_size:
+        return False
+    if model_watcher_running():
+        return True
+
+    _watcher_stop = threading.Event()
+    _watcher_thread = threading.Thread(
+        target=_watch_registry,
+        args=(_watcher_stop, interval),
+        name="model-registry-watcher",
+        daemon=True,
     )
+    _watcher_thread.start()
+    return True
+
+
+def model_watcher_running() -> bool:
+    return _watcher_thread is not None and _watcher_thread.is_alive()
+
+
+def stop_model_watcher() -> None:
+    global _watcher_thread
+
+    if _watcher_thread is None:
+        return
+    _watcher_stop.set()
+    _watcher_thread.join()
+    _watcher_thread = None
+
+
+def clear_model_cache() -> None:
+    _model_cache.clear()
+
+
+def _activation_path() -> Path | None:
+    path = get_settings().model_activation_file
+    return Path(path) if path else None
+
+
+def _read_activation(path: Path) -> tuple[ModelVersion, str, int] | None:
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        return None
+
+    with handle:
+        version = _file_version(os.fstat(handle.fileno()))
+        raw = handle.read()
+
+    try:
+        payload = json.loads(raw.decode("utf-8"))
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Invalid model activation record at {path}") from exc
+
+    model_id = payload.get("model_id") if isinstance(payload, dict) else None
+    generation = payload.get("generation") if isinstance(payload, dict) else None
+    if not isinstance(model_id, str) or not isinstance(generation, int):
+        raise ValueError(
+            f"Model activation record at {path} must define 'model_id' and "
+            "integer 'generation'"
+        )
+    return version, model_id, generation
+
+
+@contextmanager
+def _activation_write_lock(path: Path) -> Iterator[None]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _activation_lock:
+        if fcntl is None:  # pragma: no cover - non-POSIX platforms
+            yield
+            return
+        with path.with_name(f".{path.name}.lock").open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _write_activation(path: Path, model_id: str, generation: int) -> ModelVersion:
+    record = {
+        "model_id": model_id,
+        "generation": generation,
+        "activated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "activated_by_pid": os.getpid(),
+    }
+    # Workers only ever see a complete record: it is renamed into place.
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(json.dumps(record, separators=(",", ":")).encode("utf-8"))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+    return _file_version(path.stat())
+
+
+def _apply_activation(path: Path) -> None:
+    """Swap to the recorded model if the record advanced past this worker."""
+    global _active_model, _active_generation, _activation_version
 
+    try:
+        version = _file_version(path.stat())
+    except FileNotFoundError:
+        return
+    if version == _activation_version:
+        return
+
+    with _activation_lock:
+        if version == _activation_version:
+            return
+        try:
+            record = _read_activation(path)
+            if record is None:
+                return
+            version, model_id, generation = record
+            if generation > _active_generation or _active_model is None:
+                _active_model = _cached_model(model_id, trust_cache=False)
+                _active_generation = generation
+        except (FileNotFoundError, ValueError) as exc:
+            logger.error(
+                "model_activation_failed",
+                extra={
+                    "event": "model_activation_failed",
+                    "activation_file": str(path),
+                    "error_type": exc.__class__.__name__,
+                    "error_message": str(exc),
+                },
+            )
+        # Remember the version even on failure so a bad record is not
+        # re-read on every request; the next activation replaces it.
+        _activation_version = version
+
+
+def set_active_model(model_id: str) -> RegistryModel:
+    """Activate ``model_id``.
+
+    With ``MODEL_ACTIVATION_FILE`` set, the activation is published as a new
+    generation of the shared record, and every worker swaps to it on its next
+    :func:`get_active_model` call. Otherwise only this process switches.
+    """
+    global _active_model, _active_generation, _activation_version
+
+    model = _cached_model(model_id, trust_cache=False)
+    path = _activation_path()
+    if path is None:
+        with _activation_lock:
+            _active_model = model
+        return model
+
+    with _activation_write_lock(path):
+        current = _read_activation(path)
+        generation = (current[2] if current is not None else 0) + 1
+        version = _write_activation(path, model_id, generation)
+        _active_model = model
+        _active_generation = generation
+        _activation_version = version
+    return model
 
-def set_active_model(model_id: str) -> LinearModel:
+
+def load_active_model() -> RegistryModel:
+    """Load the model this worker should serve without publishing anything:
+    the shared activation record when there is one, else ``ACTIVE_MODEL_ID``."""
     global _active_model
 
-    model = load_model(model_id)
-    _active_model = model
+    path = _activation_path()
+    if path is not None:
+        _apply_activation(path)
+        if _active_model is not None:
+            return _active_model
+
+    model = _cached_model(get_settings().active_model_id, trust_cache=False)
+    with _activation_lock:
+        _active_model = model
     return model
 
 
-def get_active_model() -> LinearModel:
+def get_active_model() -> RegistryModel:
+    path = _activation_path()
+    if path is not None:
+        # One stat per call; the record is only read when it changed.
+        _apply_activation(path)
+
     if _active_model is None:
-        settings = get_settings()
         try:
-            return set_active_model(settings.active_model_id)
+            return load_active_model()
         except Exception as exc:
             raise RuntimeError("Active model is not loaded") from exc
 
@@ -254,5 +744,7 @@ def get_active_model() -> LinearModel:
 
 
 def clear_active_model() -> None:
-    global _active_model
+    global _active_model, _active_generation, _activation_version
     _active_model = None
+    _active_generation = 0
+    _activation_version = None
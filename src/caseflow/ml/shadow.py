@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from caseflow.core.metrics import increment_metric, set_gauge_metric
+from caseflow.core.settings import get_settings
+from caseflow.ml.registry import RegistryModel, get_model
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_pending = 0
+
+
+def _labels(model_id: str, shadow_model_id: str) -> str:
+    return f'{{model_id="{model_id}",shadow_model_id="{shadow_model_id}"}}'
+
+
+def _vector(model: RegistryModel, features: object) -> list[float]:
+    if isinstance(features, dict):
+        return model.vector_from_named_features(features)
+    if isinstance(features, list):
+        return [float(value) for value in features]  # type: ignore[arg-type]
+    raise ValueError("'features' must be a list of numbers or an object")
+
+
+def _score_shadow(
+    shadow_model_id: str,
+    model_id: str,
+    rows: list[object],
+    scores: list[float],
+) -> None:
+    global _pending
+
+    labels = _labels(model_id, shadow_model_id)
+    try:
+        shadow = get_model(shadow_model_id)
+        matrix = np.zeros((len(rows), shadow.n_features), dtype=np.float64)
+        valid = np.zeros(len(rows), dtype=bool)
+        for position, features in enumerate(rows):
+            try:
+                vector = _vector(shadow, features)
+                shadow.check_width(len(vector))
+            except (TypeError, ValueError):
+                continue
+            matrix[position] = vector
+            valid[position] = True
+
+        errors = int((~valid).sum())
+        if errors:
+            increment_metric(f"shadow_score_errors_total{labels}", float(errors))
+        if valid.any():
+            deltas = shadow.predict_batch(matrix[valid]) - np.asarray(scores)[valid]
+            increment_metric(f"shadow_scores_total{labels}", float(deltas.size))
+            increment_metric(
+                f"shadow_score_abs_delta_sum{labels}", float(np.abs(deltas).sum())
+            )
+            set_gauge_metric(f"shadow_score_last_delta{labels}", float(deltas[-1]))
+    except Exception as exc:
+        increment_metric(f"shadow_score_errors_total{labels}", float(len(rows)))
+        logger.warning(
+            "shadow_score_failed",
+            extra={
+                "event": "shadow_score_failed",
+                "model_id": model_id,
+                "shadow_model_id": shadow_model_id,
+                "error_type": exc.__class__.__name__,
+                "error_message": str(exc),
+            },
+        )
+    finally:
+        with _lock:
+            _pending -= 1
+
+
+def submit_shadow_scores(
+    model: RegistryModel, rows: Sequence[object], scores: Sequence[float]
+) -> bool:
+    """Sample ``rows`` for shadow scoring against ``SHADOW_MODEL_ID``.
+
+    ``rows`` are the raw ``features`` payloads ``model`` produced ``scores``
+    for. Sampled rows are scored on a background thread and only their
+    score deltas are recorded, so the caller never waits on the shadow model.
+    Work beyond ``SHADOW_MAX_PENDING`` queued batches is dropped.
+    """
+    global _executor, _pending
+
+    settings = get_settings()
+    shadow_model_id = settings.shadow_model_id
+    fraction = settings.shadow_traffic_fraction
+    if not shadow_model_id or fraction <= 0 or shadow_model_id == model.model_id:
+        return False
+
+    sampled = [position for position in range(len(rows)) if random.random() < fraction]
+    if not sampled:
+        return False
+
+    with _lock:
+        if _pending >= settings.shadow_max_pending:
+            dropped = True
+        else:
+            dropped = False
+            _pending += 1
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="shadow-score"
+                )
+            executor = _executor
+    if dropped:
+        increment_metric(
+            f"shadow_scores_dropped_total{_labels(model.model_id, shadow_model_id)}",
+            float(len(sampled)),
+        )
+        return False
+
+    executor.submit(
+        _score_shadow,
+        shadow_model_id,
+        model.model_id,
+        [rows[position] for position in sampled],
+        [float(scores[position]) for position in sampled],
+    )
+    return True
+
+
+def shutdown_shadow_executor() -> None:
+    """Drain queued shadow work and stop the executor."""
+    global _executor
+
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
@@ -1,14 +1,70 @@
 from __future__ import annotations
 
+import base64
+import hashlib
+import io
 import json
-from dataclasses import dataclass
+import mmap
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from pathlib import Path
+from threading import Lock
 from typing import Any
+from uuid import uuid4
 
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+from caseflow.core.metrics import increment_metric, set_gauge_metric
 from caseflow.core.settings import get_settings
 from caseflow.domain.mortgage.evidence import EvidenceChunk
-from caseflow.ml.embeddings import cosine_similarity, embed_text
+from caseflow.ml.ann import ANN_MODES, IvfFlatIndex
+from caseflow.ml.embeddings import EMBEDDER_VERSION, embed_text, embed_texts
+from caseflow.ml.lexical import (
+    SEARCH_MODES,
+    Bm25Index,
+    Bm25Runs,
+    query_terms,
+    reciprocal_rank_fusion,
+)
+from caseflow.ml.quantization import (
+    EMBEDDING_STORAGES,
+    dequantize,
+    quantize,
+    quantized_scores,
+    storage_dtype,
+    storage_of,
+)
+
+SEGMENT_FORMAT = "segment_v2"
+# segment_v1 predates quantized storage and always holds float32 rows.
+_READABLE_SEGMENT_FORMATS = {"segment_v1", SEGMENT_FORMAT}
+_EMBEDDING_SUFFIXES = {"float32": ".f32", "float16": ".f16", "int8": ".i8"}
+_SCALES_SUFFIX = ".scale"
+_POSTINGS_SUFFIX = ".bm25"
+_POSTINGS_ARRAYS = ("terms", "term_offsets", "rows", "term_freqs", "doc_lengths")
+WRITER_LOCK_NAME = ".writer.lock"
+# The manifest is rewritten in full only once its journal has grown past
+# both this size and the manifest's own; other commits append to the journal.
+_JOURNAL_CHECKPOINT_BYTES = 1 << 20
+
+_HYBRID_CANDIDATE_FACTOR = 4
+_HYBRID_MIN_CANDIDATES = 50
+
+_held_writer_locks = threading.local()
+_process_writer_locks: dict[str, threading.Lock] = {}
+_process_writer_locks_guard = threading.Lock()
 
 
 @dataclass(frozen=True)
@@ -17,126 +73,1667 @@ class SearchResult:
     score: float
 
 
+@dataclass(frozen=True)
+class EmbeddedChunks:
+    chunks: list[EvidenceChunk]
+    embeddings: np.ndarray
+
+
+@dataclass(frozen=True)
+class StagedBatches:
+    """Upsert entries written ahead of their commit, one WAL line per batch.
+
+    Staging needs no writer lock; ``FileVectorStore.commit_staged`` appends
+    the entries to the case WAL under it.
+    """
+
+    case_id: str
+    path: Path
+    chunks: int
+
+    def discard(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+@dataclass(frozen=True)
+class _ColumnarIndex:
+    case_id: str
+    document_ids: np.ndarray
+    chunk_ids: np.ndarray
+    start_chars: np.ndarray
+    end_chars: np.ndarray
+    sources: np.ndarray
+    pages: np.ndarray
+    text_refs: np.ndarray
+    text_blobs: tuple[bytes | mmap.mmap, ...]
+    embeddings: np.ndarray
+    scales: np.ndarray | None = None
+    # BM25 postings of the rows; None for segments written without them.
+    lexical: Bm25Runs | None = field(default=None, compare=False, repr=False)
+    # Set on snapshots of a _RowArena so appends can extend it in place.
+    arena: _RowArena | None = field(default=None, compare=False, repr=False)
+
+    def __len__(self) -> int:
+        return int(self.document_ids.shape[0])
+
+    @property
+    def storage(self) -> str:
+        return storage_of(self.embeddings)
+
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        return quantized_scores(self.embeddings, self.scales, queries)
+
+    def dense_embeddings(self) -> np.ndarray:
+        return dequantize(self.embeddings, self.scales)
+
+    def with_storage(self, storage: str) -> _ColumnarIndex:
+        if storage == self.storage:
+            return self
+        embeddings, scales = quantize(self.dense_embeddings(), storage)
+        return replace(self, embeddings=embeddings, scales=scales, arena=None)
+
+    def keys(self) -> np.ndarray:
+        return np.char.add(np.char.add(self.document_ids, "\x1f"), self.chunk_ids)
+
+    def row_keys(self) -> list[tuple[str, str]]:
+        return list(zip(self.document_ids.tolist(), self.chunk_ids.tolist()))
+
+    def text_bytes(self, row: int) -> bytes:
+        blob_id, start, end = (int(value) for value in self.text_refs[row])
+        return bytes(self.text_blobs[blob_id][start:end])
+
+    def chunk_at(self, row: int) -> EvidenceChunk:
+        page = self.pages[row]
+        return EvidenceChunk(
+            case_id=self.case_id,
+            document_id=str(self.document_ids[row]),
+            chunk_id=str(self.chunk_ids[row]),
+            text=self.text_bytes(row).decode("utf-8"),
+            start_char=int(self.start_chars[row]),
+            end_char=int(self.end_chars[row]),
+            source=str(self.sources[row]),
+            page=int(page) if page is not None else None,
+        )
+
+    def take(self, rows: np.ndarray) -> _ColumnarIndex:
+        return _ColumnarIndex(
+            case_id=self.case_id,
+            document_ids=self.document_ids[rows],
+            chunk_ids=self.chunk_ids[rows],
+            start_chars=self.start_chars[rows],
+            end_chars=self.end_chars[rows],
+            sources=self.sources[rows],
+            pages=self.pages[rows],
+            text_refs=self.text_refs[rows],
+            text_blobs=self.text_blobs,
+            embeddings=self.embeddings[rows],
+            scales=self.scales[rows] if self.scales is not None else None,
+            lexical=self.lexical.take(rows) if self.lexical is not None else None,
+        )
+
+    def concat(self, other: _ColumnarIndex) -> _ColumnarIndex:
+        other = other.with_storage(self.storage)
+        other_refs = other.text_refs.copy()
+        other_refs[:, 0] += len(self.text_blobs)
+        return _ColumnarIndex(
+            case_id=self.case_id,
+            document_ids=np.concatenate([self.document_ids, other.document_ids]),
+            chunk_ids=np.concatenate([self.chunk_ids, other.chunk_ids]),
+            start_chars=np.concatenate([self.start_chars, other.start_chars]),
+            end_chars=np.concatenate([self.end_chars, other.end_chars]),
+            sources=np.concatenate([self.sources, other.sources]),
+            pages=np.concatenate([self.pages, other.pages]),
+            text_refs=np.concatenate([self.text_refs, other_refs]),
+            text_blobs=self.text_blobs + other.text_blobs,
+            embeddings=np.concatenate([self.embeddings, other.embeddings]),
+            scales=(
+                np.concatenate([self.scales, other.scales])
+                if self.scales is not None and other.scales is not None
+                else None
+            ),
+            lexical=_append_lexical(self.lexical, other.lexical),
+        )
+
+    def sorted(self) -> _ColumnarIndex:
+        return self.take(np.lexsort((self.chunk_ids, self.document_ids)))
+
+
+def _append_lexical(
+    lexical: Bm25Runs | None, delta: Bm25Runs | None
+) -> Bm25Runs | None:
+    if lexical is None or delta is None:
+        return None
+    return lexical.append(delta)
+
+
+_ARENA_COLUMNS = (
+    "document_ids",
+    "chunk_ids",
+    "start_chars",
+    "end_chars",
+    "sources",
+    "pages",
+    "text_refs",
+    "embeddings",
+)
+
+
+class _RowArena:
+    """Growable column buffers behind successive snapshots of one case index.
+
+    Appending a batch to the newest snapshot writes it past the end of the
+    buffers, so the cost is proportional to the batch, not the case. Every
+    snapshot is a ``[:n]`` view, which rows appended later never show
+    through. Buffers double when full and keep a key-to-row map and
+    per-document counts for the rows so far.
+    """
+
+    def __init__(self, index: _ColumnarIndex) -> None:
+        self.lock = Lock()
+        self.case_id = index.case_id
+        self.length = len(index)
+        capacity = max(2 * self.length, 64)
+        self.columns: dict[str, np.ndarray] = {}
+        for name in _ARENA_COLUMNS + (("scales",) if index.scales is not None else ()):
+            values = getattr(index, name)
+            buffer = np.empty((capacity, *values.shape[1:]), dtype=values.dtype)
+            buffer[: self.length] = values
+            self.columns[name] = buffer
+        self.text_blobs = list(index.text_blobs)
+        self.lexical = index.lexical
+        self.rows = {key: row for row, key in enumerate(index.row_keys())}
+        self.counts = _document_counts(index)
+
+    def extend(self, delta: _ColumnarIndex, keys: list[tuple[str, str]]) -> None:
+        end = self.length + len(delta)
+        for name, buffer in self.columns.items():
+            values = getattr(delta, name)
+            if name == "text_refs":
+                values = values.copy()
+                values[:, 0] += len(self.text_blobs)
+            # Fixed-width id columns widen when a longer id arrives.
+            dtype = (
+                np.result_type(buffer.dtype, values.dtype)
+                if buffer.dtype.kind == "U"
+                else buffer.dtype
+            )
+            if end > buffer.shape[0] or dtype != buffer.dtype:
+                grown = np.empty(
+                    (max(end, 2 * buffer.shape[0]), *buffer.shape[1:]), dtype=dtype
+                )
+                grown[: self.length] = buffer[: self.length]
+                buffer = self.columns[name] = grown
+            buffer[self.length : end] = values
+        self.text_blobs.extend(delta.text_blobs)
+        self.lexical = _append_lexical(self.lexical, delta.lexical)
+        for row, key in enumerate(keys, start=self.length):
+            self.rows[key] = row
+            self.counts[key[0]] = self.counts.get(key[0], 0) + 1
+        self.length = end
+
+    def snapshot(self) -> _ColumnarIndex:
+        views = {name: buffer[: self.length] for name, buffer in self.columns.items()}
+        return _ColumnarIndex(
+            case_id=self.case_id,
+            text_blobs=tuple(self.text_blobs),
+            lexical=self.lexical,
+            arena=self,
+            **views,
+        )
+
+
+def _upsert_rows(index: _ColumnarIndex, delta: _ColumnarIndex) -> _ColumnarIndex:
+    delta = delta.with_storage(index.storage)
+    keys = delta.row_keys()
+    arena = index.arena
+    if arena is None or arena.length != len(index):
+        # Only the newest snapshot may grow in place; any other starts an
+        # arena of its own.
+        arena = _RowArena(index)
+
+    replaced: list[int] | None = None
+    with arena.lock:
+        if arena.length == len(index):
+            replaced = [arena.rows[key] for key in keys if key in arena.rows]
+            if not replaced:
+                arena.extend(delta, keys)
+                return arena.snapshot()
+    if replaced is None:
+        # Another append extended the arena after the check above.
+        return _upsert_rows(replace(index, arena=None), delta)
+
+    kept = np.ones(len(index), dtype=bool)
+    kept[replaced] = False
+    return index.take(np.flatnonzero(kept)).concat(delta)
+
+
+def _build_columnar_index(
+    case_id: str,
+    records: list[dict[str, Any]],
+    dims: int,
+    storage: str = "float32",
+    embeddings: np.ndarray | None = None,
+) -> _ColumnarIndex:
+    """Build an index from chunk records.
+
+    Each record carries its vector under ``embedding``, unless ``embeddings``
+    holds them as one row per record.
+    """
+    by_key: dict[tuple[str, str, str], tuple[int, dict[str, Any]]] = {}
+    for position, record in enumerate(records):
+        by_key[_record_sort_key(record)] = (position, record)
+
+    document_ids: list[str] = []
+    chunk_ids: list[str] = []
+    start_chars: list[int] = []
+    end_chars: list[int] = []
+    sources: list[str] = []
+    pages: list[int | None] = []
+    texts: list[str] = []
+    vectors: list[np.ndarray] = []
+
+    for key in sorted(by_key):
+        position, record = by_key[key]
+        if embeddings is not None:
+            vector = embeddings[position]
+        else:
+            try:
+                vector = np.asarray(record.get("embedding"), dtype=np.float32)
+            except (TypeError, ValueError):
+                continue
+
+        if vector.shape != (dims,):
+            continue
+
+        document_ids.append(str(record.get("document_id", "")))
+        chunk_ids.append(str(record.get("chunk_id", "")))
+        start_chars.append(int(record.get("start_char", 0)))
+        end_chars.append(int(record.get("end_char", 0)))
+        sources.append(str(record.get("source", "provenance")))
+        pages.append(record["page"] if isinstance(record.get("page"), int) else None)
+        texts.append(str(record.get("text", "")))
+        vectors.append(vector)
+
+    matrix = np.zeros((len(vectors), dims), dtype=np.float32)
+    if vectors:
+        matrix = np.ascontiguousarray(np.stack(vectors), dtype=np.float32)
+    codes, scales = quantize(matrix, storage)
+
+    encoded_texts = [text.encode("utf-8") for text in texts]
+    return _ColumnarIndex(
+        case_id=case_id,
+        document_ids=np.asarray(document_ids, dtype=np.str_),
+        chunk_ids=np.asarray(chunk_ids, dtype=np.str_),
+        start_chars=np.asarray(start_chars, dtype=np.int64),
+        end_chars=np.asarray(end_chars, dtype=np.int64),
+        sources=np.asarray(sources, dtype=object),
+        pages=np.asarray(pages, dtype=object),
+        text_refs=_text_refs([len(text) for text in encoded_texts], blob_id=0),
+        text_blobs=(b"".join(encoded_texts),),
+        embeddings=codes,
+        scales=scales,
+        lexical=Bm25Runs.build(texts),
+    )
+
+
+def _text_refs(lengths: list[int], blob_id: int) -> np.ndarray:
+    ends = np.cumsum(np.asarray(lengths, dtype=np.int64))
+    refs = np.zeros((len(lengths), 3), dtype=np.int64)
+    refs[:, 0] = blob_id
+    refs[:, 1] = ends - np.asarray(lengths, dtype=np.int64)
+    refs[:, 2] = ends
+    return refs
+
+
+def _segment_stem(shard_dir: Path, generation: int) -> Path:
+    return shard_dir / f"seg-{generation:08d}"
+
+
+def _wal_path(shard_dir: Path, generation: int) -> Path:
+    return shard_dir / f"wal-{generation:08d}.jsonl"
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    # Readers only ever open a fully written file: the new content lands under
+    # a temporary name and is renamed over the target in one step.
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def _write_segment(shard_dir: Path, generation: int, index: _ColumnarIndex) -> int:
+    """Write one immutable segment and return its size in bytes."""
+    stem = _segment_stem(shard_dir, generation)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    encoded_texts = [index.text_bytes(row) for row in range(len(index))]
+    text_offsets = np.zeros(len(encoded_texts) + 1, dtype=np.int64)
+    np.cumsum([len(text) for text in encoded_texts], out=text_offsets[1:])
+
+    storage = index.storage
+    payloads = {
+        _EMBEDDING_SUFFIXES[storage]: np.ascontiguousarray(index.embeddings).tobytes(),
+        ".txt": b"".join(encoded_texts),
+    }
+    if index.scales is not None:
+        payloads[_SCALES_SUFFIX] = np.ascontiguousarray(
+            index.scales, dtype="<f4"
+        ).tobytes()
+    lexical = index.lexical
+    if lexical is None:
+        lexical = Bm25Runs.build(text.decode("utf-8") for text in encoded_texts)
+    postings = lexical.merged()
+    buffer = io.BytesIO()
+    np.savez(buffer, **{name: getattr(postings, name) for name in _POSTINGS_ARRAYS})
+    payloads[_POSTINGS_SUFFIX] = buffer.getvalue()
+    for suffix, payload in payloads.items():
+        _atomic_write_bytes(stem.with_suffix(suffix), payload)
+    sidecar = {
+        "format": SEGMENT_FORMAT,
+        "case_id": index.case_id,
+        "count": len(index),
+        "dims": int(index.embeddings.shape[1]),
+        "storage": storage,
+        "document_ids": index.document_ids.tolist(),
+        "chunk_ids": index.chunk_ids.tolist(),
+        "start_chars": index.start_chars.tolist(),
+        "end_chars": index.end_chars.tolist(),
+        "sources": index.sources.tolist(),
+        "pages": index.pages.tolist(),
+        "text_offsets": text_offsets.tolist(),
+    }
+    encoded_sidecar = json.dumps(sidecar, separators=(",", ":")).encode("utf-8")
+    # The sidecar is written last: a segment without it is never referenced.
+    _atomic_write_bytes(stem.with_suffix(".json"), encoded_sidecar)
+    return len(encoded_sidecar) + sum(len(payload) for payload in payloads.values())
+
+
+def _map_readonly(path: Path) -> bytes | mmap.mmap:
+    """Map a segment file read-only; the pages stay mapped after it closes.
+
+    Before Python 3.13 the mapping keeps a duplicate descriptor open until it
+    is garbage collected, which is why case indexes live in a bounded cache.
+    """
+    with path.open("rb") as handle:
+        if handle.seek(0, 2) == 0:
+            return b""
+        if sys.version_info >= (3, 13):
+            return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ, trackfd=False)
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _open_segment(shard_dir: Path, generation: int) -> _ColumnarIndex:
+    stem = _segment_stem(shard_dir, generation)
+    sidecar_path = stem.with_suffix(".json")
+    try:
+        sidecar = json.loads(sidecar_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Invalid evidence segment sidecar at {sidecar_path}") from exc
+
+    if (
+        not isinstance(sidecar, dict)
+        or sidecar.get("format") not in _READABLE_SEGMENT_FORMATS
+    ):
+        raise ValueError(
+            f"Evidence segment at {sidecar_path} must have format '{SEGMENT_FORMAT}'"
+        )
+
+    count = int(sidecar["count"])
+    dims = int(sidecar["dims"])
+    storage = str(sidecar.get("storage", "float32"))
+    dtype = storage_dtype(storage)
+    scales: np.ndarray | None = None
+    if count > 0:
+        embeddings = np.frombuffer(
+            _map_readonly(stem.with_suffix(_EMBEDDING_SUFFIXES[storage])),
+            dtype=dtype,
+            count=count * dims,
+        ).reshape(count, dims)
+        if storage == "int8":
+            scales = np.fromfile(stem.with_suffix(_SCALES_SUFFIX), dtype="<f4")
+    else:
+        embeddings = np.zeros((0, dims), dtype=dtype)
+        if storage == "int8":
+            scales = np.zeros(0, dtype=np.float32)
+
+    text_blob = _map_readonly(stem.with_suffix(".txt"))
+    lexical = _read_postings(stem.with_suffix(_POSTINGS_SUFFIX), count)
+
+    text_offsets = np.asarray(sidecar["text_offsets"], dtype=np.int64)
+    text_refs = np.zeros((count, 3), dtype=np.int64)
+    text_refs[:, 1] = text_offsets[:-1]
+    text_refs[:, 2] = text_offsets[1:]
+
+    return _ColumnarIndex(
+        case_id=str(sidecar["case_id"]),
+        document_ids=np.asarray(sidecar["document_ids"], dtype=np.str_),
+        chunk_ids=np.asarray(sidecar["chunk_ids"], dtype=np.str_),
+        start_chars=np.asarray(sidecar["start_chars"], dtype=np.int64),
+        end_chars=np.asarray(sidecar["end_chars"], dtype=np.int64),
+        sources=np.asarray([str(value) for value in sidecar["sources"]], dtype=object),
+        pages=np.asarray(
+            [value if isinstance(value, int) else None for value in sidecar["pages"]],
+            dtype=object,
+        ),
+        text_refs=text_refs,
+        text_blobs=(text_blob,),
+        embeddings=embeddings,
+        scales=scales,
+        lexical=lexical,
+    )
+
+
+def _read_postings(path: Path, count: int) -> Bm25Runs | None:
+    # Segments written before postings were persisted have no file; their
+    # postings are rebuilt from the text when a hybrid search needs them.
+    try:
+        with np.load(path, allow_pickle=False) as arrays:
+            postings = Bm25Index(**{name: arrays[name] for name in _POSTINGS_ARRAYS})
+    except FileNotFoundError:
+        return None
+    except (KeyError, ValueError, OSError) as exc:
+        raise ValueError(f"Invalid evidence segment postings at {path}") from exc
+    if len(postings) != count:
+        raise ValueError(f"Invalid evidence segment postings at {path}")
+    return Bm25Runs().append(Bm25Runs((postings,)))
+
+
+def _remove_generation(shard_dir: Path, generation: int) -> None:
+    stem = _segment_stem(shard_dir, generation)
+    for suffix in (
+        ".json",
+        ".txt",
+        _SCALES_SUFFIX,
+        _POSTINGS_SUFFIX,
+        *_EMBEDDING_SUFFIXES.values(),
+    ):
+        stem.with_suffix(suffix).unlink(missing_ok=True)
+    _wal_path(shard_dir, generation).unlink(missing_ok=True)
+
+
+def _encode_wal_entry(entry: dict[str, Any]) -> bytes:
+    return json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _read_staged(path: Path) -> Iterator[tuple[dict[str, Any], bytes]]:
+    with path.open("rb") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid staged evidence entry in {path}") from exc
+            yield entry, line
+
+
+def _read_wal(path: Path, committed_bytes: int) -> list[dict[str, Any]]:
+    if committed_bytes <= 0:
+        return []
+
+    with path.open("rb") as handle:
+        data = handle.read(committed_bytes)
+    if len(data) != committed_bytes:
+        raise ValueError(f"Evidence WAL at {path} is shorter than its committed size")
+
+    entries: list[dict[str, Any]] = []
+    for line in data.splitlines():
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid evidence WAL entry in {path}") from exc
+        if isinstance(entry, dict):
+            entries.append(entry)
+    return entries
+
+
+def _pack_embeddings(embeddings: np.ndarray) -> dict[str, Any]:
+    # Base64 little-endian float32 is about a fifth of the size of a JSON
+    # float list and decodes without parsing a number per value.
+    matrix = np.ascontiguousarray(embeddings, dtype="<f4")
+    return {
+        "dtype": "<f4",
+        "shape": list(matrix.shape),
+        "data": base64.b64encode(matrix.tobytes()).decode("ascii"),
+    }
+
+
+def _unpack_embeddings(packed: Any, count: int) -> np.ndarray:
+    try:
+        matrix = np.frombuffer(
+            base64.b64decode(packed["data"], validate=True), dtype="<f4"
+        ).reshape([int(value) for value in packed["shape"]])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("Invalid embeddings in evidence WAL entry") from exc
+    if packed.get("dtype") != "<f4" or matrix.ndim != 2 or matrix.shape[0] != count:
+        raise ValueError("Invalid embeddings in evidence WAL entry")
+    return matrix
+
+
+def _apply_wal_entry(
+    index: _ColumnarIndex, entry: dict[str, Any], dims: int
+) -> _ColumnarIndex:
+    op = entry.get("op")
+    # Rows replayed from the WAL take the storage of the index they land in.
+    if op == "delete_case":
+        return _build_columnar_index(index.case_id, [], dims, index.storage)
+
+    if op == "delete_documents":
+        document_ids = entry.get("document_ids")
+        if not isinstance(document_ids, list) or not document_ids or not len(index):
+            return index
+        kept = np.flatnonzero(
+            ~np.isin(index.document_ids, [str(item) for item in document_ids])
+        )
+        return index.take(kept)
+
+    if op == "upsert":
+        records = entry.get("records")
+        if not isinstance(records, list):
+            records = []
+        if "embeddings" in entry:
+            if not all(isinstance(item, dict) for item in records):
+                raise ValueError("Invalid records in evidence WAL entry")
+            delta = _build_columnar_index(
+                index.case_id,
+                records,
+                dims,
+                index.storage,
+                embeddings=_unpack_embeddings(entry["embeddings"], len(records)),
+            )
+        else:
+            # Entries written before packed embeddings hold one list per record.
+            delta = _build_columnar_index(
+                index.case_id,
+                [item for item in records if isinstance(item, dict)],
+                dims,
+                index.storage,
+            )
+        if not len(delta):
+            return index
+        # New chunks append in place; replacing existing ones copies the case.
+        return _upsert_rows(index, delta)
+
+    raise ValueError(f"Unknown evidence WAL op: {op!r}")
+
+
+# Scores closer than this rank as ties and fall back to the id order. Stored
+# rows are float32, so scores that are equal in exact arithmetic can differ
+# by ~1e-7 depending on how each row was normalized.
+_SCORE_TIE_TOLERANCE = 1e-6
+
+
+def _candidate_rows(scores: np.ndarray, top_k: int) -> np.ndarray:
+    if scores.shape[0] <= top_k:
+        return np.arange(scores.shape[0])
+    partitioned = np.argpartition(-scores, top_k - 1)[:top_k]
+    threshold = scores[partitioned].min()
+    # Keep every row tied with the k-th score so the tie-break in _top_k_rows
+    # picks the same rows a full sort would. Any superset of these scores has
+    # a k-th score at least this high, so no other row can reach its top_k.
+    return np.flatnonzero(scores >= threshold - _SCORE_TIE_TOLERANCE)
+
+
+def _fusion_candidate_rows(
+    cosines: np.ndarray, lexicals: np.ndarray, depth: int
+) -> np.ndarray:
+    matched = np.flatnonzero(lexicals > 0)
+    return np.union1d(
+        _candidate_rows(cosines, depth),
+        matched[_candidate_rows(lexicals[matched], depth)],
+    )
+
+
+def _top_k_rows(
+    scores: np.ndarray,
+    document_ids: np.ndarray,
+    chunk_ids: np.ndarray,
+    top_k: int,
+) -> np.ndarray:
+    candidates = _candidate_rows(scores, top_k)
+    by_score = candidates[np.argsort(-scores[candidates], kind="stable")]
+    # Scores within the tolerance of a group's best score are tied: they are
+    # equal in exact arithmetic up to float32 rounding of the stored rows.
+    negated = -scores[by_score]
+    groups = np.full(by_score.shape[0], top_k, dtype=np.int64)
+    start = 0
+    for group in range(min(top_k, by_score.shape[0])):
+        if start >= by_score.shape[0]:
+            break
+        stop = int(
+            np.searchsorted(negated, negated[start] + _SCORE_TIE_TOLERANCE, "right")
+        )
+        groups[start:stop] = group
+        start = stop
+
+    order = np.lexsort((chunk_ids[by_score], document_ids[by_score], groups))
+    return by_score[order[:top_k]]
+
+
+def _document_counts(index: _ColumnarIndex) -> dict[str, int]:
+    arena = index.arena
+    if arena is not None:
+        with arena.lock:
+            if arena.length == len(index):
+                return dict(arena.counts)
+    document_ids, counts = np.unique(index.document_ids, return_counts=True)
+    return {
+        str(document_id): int(count) for document_id, count in zip(document_ids, counts)
+    }
+
+
+# Share of portfolio rows that may be placed on centroids trained without
+# them before the centroids are retrained from scratch.
+_IVF_RETRAIN_FRACTION = 0.25
+
+
+@dataclass(frozen=True)
+class _PortfolioView:
+    # Chunks are read back through the case index cache, so the view holds no
+    # mapped segments of its own.
+    case_ids: list[str]
+    states: list[object]
+    offsets: np.ndarray
+    document_ids: np.ndarray
+    chunk_ids: np.ndarray
+    # Rows in the store's storage, so int8 and float16 keep their savings.
+    embeddings: np.ndarray
+    scales: np.ndarray | None
+    ivf: IvfFlatIndex
+    assignments: np.ndarray
+    untrained_rows: int
+
+
+class _CandidatePool:
+    """Rows of a cross-case scan that can still reach the final ranking.
+
+    Only the case indexes that own a pooled row stay referenced, so a scan
+    over many cases keeps just a handful of mapped segments open.
+    """
+
+    def __init__(self, columns: int) -> None:
+        self._indexes: dict[int, _ColumnarIndex] = {}
+        self._next_shard = 0
+        self.shards = np.empty(0, dtype=np.int64)
+        self.rows = np.empty(0, dtype=np.int64)
+        self.document_ids = np.empty(0, dtype=np.str_)
+        self.chunk_ids = np.empty(0, dtype=np.str_)
+        self.scores = [np.empty(0, dtype=np.float32) for _ in range(columns)]
+
+    def __len__(self) -> int:
+        return int(self.rows.shape[0])
+
+    def add(
+        self, index: _ColumnarIndex, rows: np.ndarray, scores: Sequence[np.ndarray]
+    ) -> None:
+        if not rows.shape[0]:
+            return
+        shard = self._next_shard
+        self._next_shard += 1
+        self._indexes[shard] = index
+        self.shards = np.concatenate([self.shards, np.full(rows.shape[0], shard)])
+        self.rows = np.concatenate([self.rows, rows])
+        self.document_ids = np.concatenate(
+            [self.document_ids, index.document_ids[rows]]
+        )
+        self.chunk_ids = np.concatenate([self.chunk_ids, index.chunk_ids[rows]])
+        self.scores = [
+            np.concatenate([pooled, column])
+            for pooled, column in zip(self.scores, scores)
+        ]
+
+    def keep(self, keep: np.ndarray) -> None:
+        self.shards = self.shards[keep]
+        self.rows = self.rows[keep]
+        self.document_ids = self.document_ids[keep]
+        self.chunk_ids = self.chunk_ids[keep]
+        self.scores = [column[keep] for column in self.scores]
+        owners = set(np.unique(self.shards).tolist())
+        for shard in [shard for shard in self._indexes if shard not in owners]:
+            del self._indexes[shard]
+
+    def chunk_at(self, position: int) -> EvidenceChunk:
+        index = self._indexes[int(self.shards[position])]
+        return index.chunk_at(int(self.rows[position]))
+
+
+class _LruCache:
+    def __init__(self, metric_prefix: str) -> None:
+        self._metric_prefix = metric_prefix
+        self._lock = Lock()
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+            ratio = self._hits / (self._hits + self._misses)
+
+        outcome = "hits" if value is not None else "misses"
+        increment_metric(f"{self._metric_prefix}_{outcome}_total")
+        set_gauge_metric(f"{self._metric_prefix}_hit_ratio", ratio)
+        return value
+
+    def put(self, key: Hashable, value: Any, max_entries: int) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+def _shard_key(case_id: str) -> str:
+    return hashlib.sha256(case_id.encode("utf-8")).hexdigest()[:24]
+
+
+def _record_sort_key(record: dict[str, Any]) -> tuple[str, str, str]:
+    return (
+        str(record.get("case_id", "")),
+        str(record.get("document_id", "")),
+        str(record.get("chunk_id", "")),
+    )
+
+
+def _iso_utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _iso_utc_from_mtime(mtime: float) -> str:
+    return datetime.fromtimestamp(mtime, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
 class FileVectorStore:
-    _CACHE: dict[str, tuple[float | None, list[dict[str, Any]]]] = {}
+    _CACHE: dict[str, tuple[tuple[int, int, int] | None, Any]] = {}
+    # Keyed by (case revision, segment generation, committed WAL bytes). The
+    # revision only grows, even across a delete, so a recreated case never
+    # matches an index cached for its previous incarnation.
+    # Values are ((revision, generation, wal_bytes), _ColumnarIndex). Mapped
+    # segments hold descriptors until collected, so the cache is bounded.
+    _INDEX_CACHE = _LruCache("evidence_index_cache")
+    # BM25 postings rebuilt for segments that were written without them.
+    _LEXICAL_CACHE = _LruCache("evidence_lexical_cache")
+    _PORTFOLIO_CACHE: dict[tuple[str, int, int], tuple[object, _PortfolioView]] = {}
+    _QUERY_CACHE = _LruCache("evidence_query_cache")
+    _RESULT_CACHE = _LruCache("evidence_result_cache")
+
+    MANIFEST_NAME = "manifest.json"
+    SHARDS_DIRNAME = "cases"
+    STAGING_DIRNAME = ".staging"
+    LEGACY_SHARD_RECORDS_NAME = "records.json"
 
-    def __init__(self, index_file: Path | None = None, dims: int = 128):
+    def __init__(
+        self,
+        index_file: Path | None = None,
+        dims: int | None = None,
+        ann_mode: str | None = None,
+        search_mode: str | None = None,
+        storage: str | None = None,
+    ):
+        settings = get_settings()
+        if dims is None:
+            dims = settings.evidence_embedding_dims
         if dims <= 0:
             raise ValueError("dims must be > 0")
 
         self._dims = dims
+        self._ann_mode = ann_mode or settings.evidence_ann_mode
+        self._ann_nlist = settings.evidence_ann_nlist
+        self._ann_nprobe = settings.evidence_ann_nprobe
+        self._search_mode = search_mode or settings.evidence_search_mode
+        self._storage = storage or settings.evidence_embedding_storage
+        self._query_cache_size = settings.evidence_query_cache_size
+        self._result_cache_size = settings.evidence_result_cache_size
+        self._index_cache_size = settings.evidence_index_cache_size
+        if self._ann_mode not in ANN_MODES:
+            raise ValueError("ann_mode must be one of: " + ", ".join(sorted(ANN_MODES)))
+        if self._search_mode not in SEARCH_MODES:
+            raise ValueError(
+                "search_mode must be one of: " + ", ".join(sorted(SEARCH_MODES))
+            )
+        if self._storage not in EMBEDDING_STORAGES:
+            raise ValueError(
+                "storage must be one of: " + ", ".join(sorted(EMBEDDING_STORAGES))
+            )
+
         if index_file is None:
-            settings = get_settings()
             index_root = Path(settings.evidence_index_dir)
             self._index_file = index_root / "index.json"
         else:
             self._index_file = index_file
 
-        self._index_file.parent.mkdir(parents=True, exist_ok=True)
+        self._root = self._index_file.parent
+        self._manifest_file = self._root / self.MANIFEST_NAME
+        self._shards_dir = self._root / self.SHARDS_DIRNAME
+        self._root.mkdir(parents=True, exist_ok=True)
 
-    def _cache_key(self) -> str:
-        return str(self._index_file.resolve())
+    @classmethod
+    def for_existing_index(cls, index_file: Path, **kwargs: Any) -> FileVectorStore:
+        """Open an index with the dims recorded in its manifest."""
+        manifest_file = index_file.parent / cls.MANIFEST_NAME
+        try:
+            payload = json.loads(manifest_file.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cls(index_file=index_file, **kwargs)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid evidence index JSON at {manifest_file}") from exc
 
-    def _index_mtime(self) -> float | None:
-        if not self._index_file.is_file():
+        dims = payload.get("dims") if isinstance(payload, dict) else None
+        if dims is None and isinstance(payload, dict):
+            entries = payload.get("cases") or {}
+            dims = next((entry.get("dims") for entry in entries.values()), None)
+        return cls(
+            index_file=index_file,
+            dims=int(dims) if dims is not None else None,
+            **kwargs,
+        )
+
+    @property
+    def dims(self) -> int:
+        return self._dims
+
+    @property
+    def storage(self) -> str:
+        return self._storage
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @staticmethod
+    def _mtime(path: Path) -> float | None:
+        try:
+            return path.stat().st_mtime
+        except FileNotFoundError:
             return None
-        return self._index_file.stat().st_mtime
 
-    def _load_records(self) -> list[dict[str, Any]]:
-        cache_key = self._cache_key()
-        mtime = self._index_mtime()
+    @staticmethod
+    def _file_version(stat: os.stat_result) -> tuple[int, int, int]:
+        # Every publish renames a new inode into place, so the inode alone
+        # tells snapshots apart even within one mtime tick.
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _read_json(self, path: Path) -> Any:
+        cache_key = str(path.resolve())
         cached = self._CACHE.get(cache_key)
-        if cached is not None and cached[0] == mtime:
-            return [dict(item) for item in cached[1]]
+        try:
+            handle = path.open("rb")
+        except FileNotFoundError:
+            self._CACHE[cache_key] = (None, None)
+            return None
 
-        if mtime is None:
-            records: list[dict[str, Any]] = []
-            self._CACHE[cache_key] = (None, records)
-            return []
+        with handle:
+            version = self._file_version(os.fstat(handle.fileno()))
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            try:
+                payload = json.loads(handle.read().decode("utf-8"))
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid evidence index JSON at {path}") from exc
+
+        self._CACHE[cache_key] = (version, payload)
+        return payload
+
+    def _write_json(self, path: Path, payload: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write_bytes(
+            path,
+            json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8"),
+        )
+        self._CACHE[str(path.resolve())] = (
+            self._file_version(path.stat()),
+            payload,
+        )
+
+    @contextmanager
+    def writer_lock(self) -> Iterator[None]:
+        """Hold the store's single-writer lock across threads and processes.
+
+        Reentrant within a thread. Readers never take it.
+        """
+        key = str(self._root.resolve())
+        held: set[str] = getattr(_held_writer_locks, "roots", set())
+        _held_writer_locks.roots = held
+        if key in held:
+            yield
+            return
 
+        with _process_writer_locks_guard:
+            thread_lock = _process_writer_locks.setdefault(key, threading.Lock())
+        with thread_lock, (self._root / WRITER_LOCK_NAME).open("a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            held.add(key)
+            try:
+                yield
+            except BaseException:
+                # Appends cache the index they produce before the manifest
+                # commits it; drop those so a failed write is never served.
+                self._forget_indexes()
+                raise
+            finally:
+                held.discard(key)
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _forget_indexes(self) -> None:
+        shards = str(self._shards_dir.resolve()) + os.sep
+        self._INDEX_CACHE.discard_where(lambda key: str(key).startswith(shards))
+
+    def _load_manifest(self) -> dict[str, dict[str, Any]]:
+        if self._index_file.is_file() and not self._manifest_file.is_file():
+            self.migrate_monolithic_index()
+        return self._read_manifest()
+
+    def _read_manifest(self) -> dict[str, dict[str, Any]]:
+        return self._manifest_state()[0]
+
+    def _manifest_state(self) -> tuple[dict[str, dict[str, Any]], int]:
+        """Return the committed cases and revision.
+
+        They are the manifest's checkpoint plus every complete line of the
+        journal it names.
+        """
+        payload = self._read_json(self._manifest_file)
+        if payload is None:
+            return {}, 0
+
+        if not isinstance(payload, dict) or not isinstance(payload.get("cases"), dict):
+            raise ValueError(
+                f"Evidence index manifest at {self._manifest_file} must be an "
+                "object with a 'cases' mapping"
+            )
+        cases: dict[str, dict[str, Any]] = payload["cases"]
+        revision = int(payload.get("revision", 0))
+        journal = payload.get("journal")
+        if journal:
+            try:
+                cases, revision = self._replay_journal(
+                    self._root / str(journal), cases, revision
+                )
+            except FileNotFoundError:
+                # A checkpoint retired the journal after the manifest was
+                # read; the manifest that replaced it covers the journal.
+                if self._read_json(self._manifest_file) is payload:
+                    raise ValueError(
+                        f"Evidence index journal {journal} named by "
+                        f"{self._manifest_file} is missing"
+                    ) from None
+                return self._manifest_state()
+        self._check_header(payload, cases)
+        return cases, revision
+
+    def _replay_journal(
+        self, path: Path, cases: dict[str, dict[str, Any]], revision: int
+    ) -> tuple[dict[str, dict[str, Any]], int]:
+        # Replayed state is cached with the journal offset it covers, so a
+        # reader only parses the lines appended since its last look.
+        cache_key = str(path.resolve())
+        cached = self._CACHE.get(cache_key)
+        with path.open("rb") as handle:
+            stat = os.fstat(handle.fileno())
+            start = 0
+            if (
+                cached is not None
+                and cached[0] is not None
+                and cached[0][0] == stat.st_ino
+                and cached[0][1] <= stat.st_size
+            ):
+                start = cached[0][1]
+                cases, revision = cached[1]
+                if start == stat.st_size:
+                    return cases, revision
+            handle.seek(start)
+            data = handle.read(stat.st_size - start)
+
+        # A line without its newline belongs to an append still in progress,
+        # or to one that failed before it committed.
+        complete = data[: data.rfind(b"\n") + 1]
+        if complete:
+            cases = dict(cases)
+            for line in complete.splitlines():
+                try:
+                    record = json.loads(line)
+                    changes = record["cases"]
+                    revision = int(record["revision"])
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError) as exc:
+                    raise ValueError(
+                        f"Invalid evidence index journal entry in {path}"
+                    ) from exc
+                for case_id, entry in changes.items():
+                    if entry is None:
+                        cases.pop(case_id, None)
+                    else:
+                        cases[case_id] = entry
+        self._CACHE[cache_key] = (
+            (stat.st_ino, start + len(complete), 0),
+            (cases, revision),
+        )
+        return cases, revision
+
+    def _check_header(
+        self, payload: dict[str, Any], cases: dict[str, dict[str, Any]]
+    ) -> None:
+        if not cases:
+            return
+        if "dims" in payload:
+            dims = int(payload["dims"])
+            embedder = payload.get("embedder")
+        else:
+            # Manifests written before the header carry dims per case.
+            dims = next(
+                (
+                    int(entry["dims"])
+                    for entry in cases.values()
+                    if int(entry.get("dims", self._dims)) != self._dims
+                ),
+                self._dims,
+            )
+            embedder = EMBEDDER_VERSION
+
+        if dims != self._dims or embedder != EMBEDDER_VERSION:
+            raise ValueError(
+                f"Evidence index at {self._root} was built with dims={dims} "
+                f"embedder={embedder!r}; this store expects dims={self._dims} "
+                f"embedder={EMBEDDER_VERSION!r}. Re-embed it with "
+                "`python -m caseflow.cli.evidence_index reembed`."
+            )
+
+    def _revision(self) -> int:
+        return self._manifest_state()[1]
+
+    def _write_manifest(self, cases: dict[str, dict[str, Any]]) -> None:
+        """Commit ``cases`` as the next revision; callers hold the writer lock.
+
+        Only the entries that differ from the committed state are appended to
+        the journal, so a commit costs the cases it touched rather than the
+        whole store.
+        """
+        committed, revision = self._manifest_state()
+        revision += 1
+        changes: dict[str, dict[str, Any] | None] = {
+            case_id: entry
+            for case_id, entry in cases.items()
+            if committed.get(case_id) is not entry and committed.get(case_id) != entry
+        }
+        changes.update({case_id: None for case_id in committed if case_id not in cases})
+        line = (
+            json.dumps(
+                {"revision": revision, "cases": changes},
+                separators=(",", ":"),
+                sort_keys=True,
+            ).encode("utf-8")
+            + b"\n"
+        )
+
+        payload = self._read_json(self._manifest_file)
+        journal = payload.get("journal") if isinstance(payload, dict) else None
+        journal_path = self._root / str(journal) if journal else None
         try:
-            payload = json.loads(self._index_file.read_text(encoding="utf-8"))
-        except json.JSONDecodeError as exc:
+            journal_bytes = journal_path.stat().st_size if journal_path else None
+        except FileNotFoundError:
+            journal_bytes = None
+        if (
+            journal_path is None
+            or journal_bytes is None
+            or (
+                journal_bytes + len(line)
+                > max(_JOURNAL_CHECKPOINT_BYTES, self._manifest_file.stat().st_size)
+            )
+        ):
+            self._checkpoint_manifest(cases, revision, journal_path)
+        else:
+            self._append_journal(journal_path, line, cases, revision)
+        root = str(self._root.resolve())
+        self._RESULT_CACHE.discard_where(lambda key: key[0] == root)
+
+    def _append_journal(
+        self,
+        path: Path,
+        line: bytes,
+        cases: dict[str, dict[str, Any]],
+        revision: int,
+    ) -> None:
+        with path.open("r+b") as handle:
+            data_end = handle.seek(0, os.SEEK_END)
+            if data_end:
+                # Drop the tail of an append that never completed its line.
+                handle.seek(max(data_end - 1, 0))
+                if handle.read(1) != b"\n":
+                    handle.seek(0)
+                    data_end = handle.read().rfind(b"\n") + 1
+                    handle.truncate(data_end)
+            handle.seek(data_end)
+            handle.write(line)
+            handle.flush()
+            os.fsync(handle.fileno())
+            ino = os.fstat(handle.fileno()).st_ino
+        self._CACHE[str(path.resolve())] = (
+            (ino, data_end + len(line), 0),
+            (dict(cases), revision),
+        )
+
+    def _checkpoint_manifest(
+        self,
+        cases: dict[str, dict[str, Any]],
+        revision: int,
+        retired_journal: Path | None,
+    ) -> None:
+        journal_name = f"manifest-{revision:08d}.jsonl"
+        # The journal exists before any manifest names it.
+        _atomic_write_bytes(self._root / journal_name, b"")
+        self._write_json(
+            self._manifest_file,
+            {
+                "layout": "partitioned_v1",
+                "revision": revision,
+                "dims": self._dims,
+                "embedder": EMBEDDER_VERSION,
+                "journal": journal_name,
+                "cases": dict(sorted(cases.items())),
+            },
+        )
+        if retired_journal is not None:
+            retired_journal.unlink(missing_ok=True)
+
+    def _shard_dir(self, case_id: str) -> Path:
+        return self._shards_dir / _shard_key(case_id)
+
+    def _empty_index(self, case_id: str) -> _ColumnarIndex:
+        return _build_columnar_index(case_id, [], self._dims, self._storage)
+
+    def _load_base(self, case_id: str, generation: int) -> _ColumnarIndex:
+        shard_dir = self._shard_dir(case_id)
+        if generation > 0:
+            return _open_segment(shard_dir, generation)
+
+        # Shards written before the segment format hold a JSON record list.
+        payload = self._read_json(shard_dir / self.LEGACY_SHARD_RECORDS_NAME)
+        records = payload if isinstance(payload, list) else []
+        return _build_columnar_index(
+            case_id,
+            [item for item in records if isinstance(item, dict)],
+            self._dims,
+            self._storage,
+        )
+
+    def _load_case_index(
+        self, case_id: str, cases: dict[str, dict[str, Any]] | None = None
+    ) -> _ColumnarIndex:
+        entry = (self._load_manifest() if cases is None else cases).get(case_id)
+        if entry is None:
+            return self._empty_index(case_id)
+
+        shard_dir = self._shard_dir(case_id)
+        cache_key = str(shard_dir.resolve())
+        generation = int(entry.get("segment", 0))
+        wal_bytes = int(entry.get("wal_bytes", 0))
+        state = (int(entry.get("revision", 0)), generation, wal_bytes)
+
+        cached = self._INDEX_CACHE.get(cache_key)
+        if cached is not None and cached[0] == state:
+            index = cached[1]
+        else:
+            try:
+                index = self._load_base(case_id, generation)
+                self._check_index_dims(index)
+                for wal_entry in _read_wal(_wal_path(shard_dir, generation), wal_bytes):
+                    index = _apply_wal_entry(index, wal_entry, self._dims)
+            except FileNotFoundError:
+                # A writer retired this generation after our manifest snapshot
+                # was taken; the current manifest names its replacement.
+                current = self._read_manifest()
+                fresh = current.get(case_id)
+                if fresh is None:
+                    return self._empty_index(case_id)
+                if int(fresh.get("segment", 0)) == generation:
+                    raise
+                return self._load_case_index(case_id, current)
+            self._INDEX_CACHE.put(cache_key, (state, index), self._index_cache_size)
+
+        self._check_index_dims(index)
+        return index
+
+    def _check_index_dims(self, index: _ColumnarIndex) -> None:
+        if len(index) and index.embeddings.shape[1] != self._dims:
+            raise ValueError(
+                f"Evidence shard for case '{index.case_id}' has "
+                f"dims={index.embeddings.shape[1]}, store expects dims={self._dims}"
+            )
+
+    def _check_case_dims(self, cases: dict[str, dict[str, Any]], case_id: str) -> None:
+        entry = cases.get(case_id)
+        if entry is not None and int(entry.get("dims", self._dims)) != self._dims:
             raise ValueError(
-                f"Invalid evidence index JSON at {self._index_file}"
-            ) from exc
+                f"Evidence shard for case '{case_id}' has dims={entry['dims']}, "
+                f"store expects dims={self._dims}"
+            )
 
-        if not isinstance(payload, list):
-            raise ValueError("Evidence index payload must be a JSON list")
+    def _append_wal(
+        self,
+        cases: dict[str, dict[str, Any]],
+        case_id: str,
+        wal_entries: list[dict[str, Any]],
+        payload: bytes | None = None,
+    ) -> None:
+        self._check_case_dims(cases, case_id)
+        current = self._load_case_index(case_id, cases)
+        entry = dict(cases.get(case_id, {}))
+        generation = int(entry.get("segment", 0))
+        wal_bytes = int(entry.get("wal_bytes", 0))
+        revision = self._revision() + 1
 
-        validated: list[dict[str, Any]] = []
-        for item in payload:
-            if isinstance(item, dict):
-                validated.append(item)
-        self._CACHE[cache_key] = (mtime, [dict(item) for item in validated])
-        return validated
+        shard_dir = self._shard_dir(case_id)
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        if payload is None:
+            payload = b"".join(_encode_wal_entry(item) for item in wal_entries)
+        with _wal_path(shard_dir, generation).open("ab") as handle:
+            if handle.tell() != wal_bytes:
+                # Drop bytes from an append that was never committed.
+                handle.truncate(wal_bytes)
+                handle.seek(wal_bytes)
+            handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
 
-    def _write_records(self, records: list[dict[str, Any]]) -> None:
-        self._index_file.write_text(
-            json.dumps(records, separators=(",", ":"), sort_keys=True),
-            encoding="utf-8",
+        updated = current
+        fingerprints = dict(entry.get("fingerprints", {}))
+        for wal_entry in wal_entries:
+            updated = _apply_wal_entry(updated, wal_entry, self._dims)
+            # Any write to a document invalidates its fingerprint until the
+            # caller records a new one.
+            if wal_entry["op"] == "delete_case":
+                fingerprints.clear()
+            elif wal_entry["op"] == "delete_documents":
+                for document_id in wal_entry["document_ids"]:
+                    fingerprints.pop(document_id, None)
+            else:
+                for record in wal_entry["records"]:
+                    fingerprints.pop(record["document_id"], None)
+        wal_bytes += len(payload)
+        self._INDEX_CACHE.put(
+            str(shard_dir.resolve()),
+            ((revision, generation, wal_bytes), updated),
+            self._index_cache_size,
         )
-        self._CACHE[self._cache_key()] = (
-            self._index_mtime(),
-            [dict(item) for item in records],
+
+        entry.update(
+            {
+                "shard": _shard_key(case_id),
+                "segment": generation,
+                "wal_bytes": wal_bytes,
+                "num_chunks": len(updated),
+                "documents": _document_counts(updated),
+                "dims": self._dims,
+                "updated_at": _iso_utc_now(),
+                "revision": revision,
+                "fingerprints": fingerprints,
+            }
         )
+        cases[case_id] = entry
 
-    def _record_from_chunk(self, chunk: EvidenceChunk) -> dict[str, Any]:
+    def _publish_segment(
+        self,
+        cases: dict[str, dict[str, Any]],
+        case_id: str,
+        index: _ColumnarIndex,
+    ) -> list[int]:
+        shard_dir = self._shard_dir(case_id)
+        cache_key = str(shard_dir.resolve())
+        previous = cases.get(case_id, {})
+        previous_generation = int(previous.get("segment", 0))
+        revision = int(previous.get("revision", 0))
+
+        if len(index):
+            generation = previous_generation + 1
+            # Compaction is where rows move to the configured storage.
+            index = index.sorted().with_storage(self._storage)
+            segment_bytes = _write_segment(shard_dir, generation, index)
+            self._INDEX_CACHE.put(
+                cache_key, ((revision, generation, 0), index), self._index_cache_size
+            )
+            cases[case_id] = {
+                "shard": _shard_key(case_id),
+                "segment": generation,
+                "segment_bytes": segment_bytes,
+                "wal_bytes": 0,
+                "num_chunks": len(index),
+                "documents": _document_counts(index),
+                "dims": self._dims,
+                "updated_at": previous.get("updated_at") or _iso_utc_now(),
+                "revision": revision,
+                "fingerprints": previous.get("fingerprints", {}),
+            }
+        else:
+            self._INDEX_CACHE.discard(cache_key)
+            cases.pop(case_id, None)
+
+        return [previous_generation]
+
+    def _cleanup_generations(self, case_id: str, generations: list[int]) -> None:
+        shard_dir = self._shard_dir(case_id)
+        for generation in generations:
+            _remove_generation(shard_dir, generation)
+            if generation == 0:
+                (shard_dir / self.LEGACY_SHARD_RECORDS_NAME).unlink(missing_ok=True)
+        if shard_dir.is_dir() and not any(shard_dir.iterdir()):
+            shard_dir.rmdir()
+
+    def list_case_ids(self) -> list[str]:
+        return sorted(self._load_manifest())
+
+    def case_version(self, case_id: str) -> tuple[int, int] | None:
+        """Return ``(revision, segment)`` for a case, or None if it is absent.
+
+        Any write changes the revision and compaction changes the segment, so
+        row positions are stable for as long as the version is.
+        """
+        entry = self._load_manifest().get(case_id)
+        if entry is None:
+            return None
+        return int(entry.get("revision", 0)), int(entry.get("segment", 0))
+
+    def wal_bytes(self, case_id: str) -> int:
+        entry = self._load_manifest().get(case_id)
+        return int(entry.get("wal_bytes", 0)) if entry is not None else 0
+
+    def compact(
+        self,
+        case_id: str | None = None,
+        min_wal_bytes: int = 0,
+        min_wal_ratio: float | None = None,
+    ) -> int:
+        """Fold WAL entries into a new base segment.
+
+        A case is compacted once its WAL reaches ``min_wal_bytes``, or, when
+        ``min_wal_ratio`` is given, once it reaches that fraction of the base
+        segment's size, whichever comes first. Relative thresholds keep small
+        cases on memory-mapped segments while bounding rewrite cost to a
+        constant factor of the bytes appended.
+        """
+        with self.writer_lock():
+            cases = dict(self._load_manifest())
+            targets = [case_id] if case_id is not None else sorted(cases)
+            retired: list[tuple[str, list[int]]] = []
+            for target in targets:
+                entry = cases.get(target)
+                if entry is None:
+                    continue
+                wal_bytes = int(entry.get("wal_bytes", 0))
+                threshold = min_wal_bytes
+                if min_wal_ratio is not None and (
+                    "segment_bytes" in entry or not int(entry.get("segment", 0))
+                ):
+                    segment_bytes = int(entry.get("segment_bytes", 0))
+                    threshold = min(threshold, int(min_wal_ratio * segment_bytes))
+                if wal_bytes == 0 or wal_bytes < threshold:
+                    continue
+                index = self._load_case_index(target, cases)
+                retired.append((target, self._publish_segment(cases, target, index)))
+
+            if retired:
+                self._write_manifest(cases)
+                for target, generations in retired:
+                    self._cleanup_generations(target, generations)
+            return len(retired)
+
+    def migrate_monolithic_index(self) -> int:
+        with self.writer_lock():
+            if not self._index_file.is_file():
+                return 0
+
+            try:
+                payload = json.loads(self._index_file.read_text(encoding="utf-8"))
+            except json.JSONDecodeError as exc:
+                raise ValueError(
+                    f"Invalid evidence index JSON at {self._index_file}"
+                ) from exc
+
+            if not isinstance(payload, list):
+                raise ValueError("Evidence index payload must be a JSON list")
+
+            by_case: dict[str, list[dict[str, Any]]] = {}
+            for item in payload:
+                if isinstance(item, dict):
+                    by_case.setdefault(str(item.get("case_id", "")), []).append(item)
+
+            cases = dict(self._read_manifest())
+            retired: list[tuple[str, list[int]]] = []
+            for case_id, records in by_case.items():
+                self._check_case_dims(cases, case_id)
+                current = self._load_case_index(case_id, cases)
+                incoming = _build_columnar_index(case_id, records, self._dims)
+                kept = np.flatnonzero(~np.isin(current.keys(), incoming.keys()))
+                merged = current.take(kept).concat(incoming)
+                retired.append((case_id, self._publish_segment(cases, case_id, merged)))
+            self._write_manifest(cases)
+            for case_id, generations in retired:
+                self._cleanup_generations(case_id, generations)
+
+            self._index_file.rename(
+                self._index_file.with_name(self._index_file.name + ".migrated")
+            )
+            return sum(len(records) for records in by_case.values())
+
+    def _upsert_entry(
+        self,
+        chunks: list[EvidenceChunk],
+        embeddings: np.ndarray | None = None,
+    ) -> dict[str, Any]:
+        if embeddings is None:
+            embeddings = embed_texts([chunk.text for chunk in chunks], dims=self._dims)
+        elif embeddings.shape != (len(chunks), self._dims):
+            raise ValueError(
+                f"Precomputed embeddings have shape {embeddings.shape}, "
+                f"expected ({len(chunks)}, {self._dims})"
+            )
+        records = [
+            {
+                "case_id": chunk.case_id,
+                "document_id": chunk.document_id,
+                "chunk_id": chunk.chunk_id,
+                "text": chunk.text,
+                "start_char": chunk.start_char,
+                "end_char": chunk.end_char,
+                "source": chunk.source,
+                "page": chunk.page,
+            }
+            for chunk in chunks
+        ]
         return {
-            "case_id": chunk.case_id,
-            "document_id": chunk.document_id,
-            "chunk_id": chunk.chunk_id,
-            "text": chunk.text,
-            "start_char": chunk.start_char,
-            "end_char": chunk.end_char,
-            "source": chunk.source,
-            "page": chunk.page,
-            "embedding": embed_text(chunk.text, dims=self._dims),
+            "op": "upsert",
+            "records": records,
+            "embeddings": _pack_embeddings(embeddings),
         }
 
     def add_documents(self, chunks: list[EvidenceChunk]) -> int:
-        if not chunks:
-            return 0
+        with self.writer_lock():
+            if not chunks:
+                return 0
 
-        records = self._load_records()
-        by_key: dict[tuple[str, str, str], dict[str, Any]] = {}
-        for record in records:
-            key = (
-                str(record.get("case_id", "")),
-                str(record.get("document_id", "")),
-                str(record.get("chunk_id", "")),
-            )
-            by_key[key] = record
-
-        for chunk in chunks:
-            key = (chunk.case_id, chunk.document_id, chunk.chunk_id)
-            by_key[key] = self._record_from_chunk(chunk)
-
-        updated_records = sorted(
-            by_key.values(),
-            key=lambda r: (
-                str(r.get("case_id", "")),
-                str(r.get("document_id", "")),
-                str(r.get("chunk_id", "")),
-            ),
-        )
-        self._write_records(updated_records)
-        return len(chunks)
+            incoming_by_case: dict[str, list[EvidenceChunk]] = {}
+            for chunk in chunks:
+                incoming_by_case.setdefault(chunk.case_id, []).append(chunk)
+
+            cases = dict(self._load_manifest())
+            for case_id, case_chunks in incoming_by_case.items():
+                self._append_wal(cases, case_id, [self._upsert_entry(case_chunks)])
+
+            self._write_manifest(cases)
+            return len(chunks)
 
     def overwrite_case(self, case_id: str, chunks: list[EvidenceChunk]) -> int:
-        records = self._load_records()
-        preserved = [record for record in records if record.get("case_id") != case_id]
-        incoming = [self._record_from_chunk(chunk) for chunk in chunks]
-        merged = sorted(
-            [*preserved, *incoming],
-            key=lambda r: (
-                str(r.get("case_id", "")),
-                str(r.get("document_id", "")),
-                str(r.get("chunk_id", "")),
-            ),
-        )
-        self._write_records(merged)
-        return len(chunks)
+        return self.write_case_batches(case_id, [chunks], overwrite=True)
+
+    def write_case_batches(
+        self,
+        case_id: str,
+        batches: Iterable[list[EvidenceChunk] | EmbeddedChunks],
+        overwrite: bool = False,
+        replace_documents: Iterable[str] = (),
+        fingerprints: dict[str, str] | None = None,
+    ) -> int:
+        with self.writer_lock():
+            return self._commit_case_entries(
+                case_id,
+                (
+                    (self._upsert_entry(chunks, embeddings), None)
+                    for chunks, embeddings in self._checked_batches(case_id, batches)
+                ),
+                overwrite=overwrite,
+                replace_documents=replace_documents,
+                fingerprints=fingerprints,
+            )
+
+    def stage_case_batches(
+        self,
+        case_id: str,
+        batches: Iterable[list[EvidenceChunk] | EmbeddedChunks],
+        on_batch: Callable[[list[EvidenceChunk]], None] | None = None,
+    ) -> StagedBatches:
+        """Embed ``batches`` into a private file for ``commit_staged``.
+
+        Runs without the writer lock and holds one batch in memory at a time;
+        ``on_batch`` is called once each batch is on disk.
+        """
+        staging_dir = self._root / self.STAGING_DIRNAME
+        staging_dir.mkdir(parents=True, exist_ok=True)
+        path = staging_dir / f"{_shard_key(case_id)}-{uuid4().hex}.jsonl"
+        staged = 0
+        try:
+            with path.open("wb") as handle:
+                for chunks, embeddings in self._checked_batches(case_id, batches):
+                    handle.write(
+                        _encode_wal_entry(self._upsert_entry(chunks, embeddings))
+                    )
+                    handle.flush()
+                    staged += len(chunks)
+                    if on_batch is not None:
+                        on_batch(chunks)
+                os.fsync(handle.fileno())
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        return StagedBatches(case_id=case_id, path=path, chunks=staged)
+
+    def commit_staged(
+        self,
+        staged: StagedBatches,
+        overwrite: bool = False,
+        replace_documents: Iterable[str] = (),
+        fingerprints: dict[str, str] | None = None,
+    ) -> int:
+        """Append staged batches to their case and commit them as one write.
+
+        The entries are copied to the WAL one batch at a time, so a commit
+        holds no more than one batch in memory either.
+        """
+        with self.writer_lock():
+            return self._commit_case_entries(
+                staged.case_id,
+                _read_staged(staged.path),
+                overwrite=overwrite,
+                replace_documents=replace_documents,
+                fingerprints=fingerprints,
+            )
+
+    @staticmethod
+    def _checked_batches(
+        case_id: str, batches: Iterable[list[EvidenceChunk] | EmbeddedChunks]
+    ) -> Iterator[tuple[list[EvidenceChunk], np.ndarray | None]]:
+        for batch in batches:
+            if isinstance(batch, EmbeddedChunks):
+                chunks, embeddings = batch.chunks, batch.embeddings
+            else:
+                chunks, embeddings = batch, None
+            foreign = sorted({chunk.case_id for chunk in chunks} - {case_id})
+            if foreign:
+                raise ValueError(
+                    f"Chunks for case '{case_id}' belong to other cases: "
+                    + ", ".join(foreign)
+                )
+            if chunks:
+                yield chunks, embeddings
+
+    def _commit_case_entries(
+        self,
+        case_id: str,
+        upserts: Iterable[tuple[dict[str, Any], bytes | None]],
+        overwrite: bool,
+        replace_documents: Iterable[str],
+        fingerprints: dict[str, str] | None,
+    ) -> int:
+        # Callers hold the writer lock. ``upserts`` pairs each entry with its
+        # encoded WAL line when one was already written out.
+        cases = dict(self._load_manifest())
+        pending: list[dict[str, Any]] = [{"op": "delete_case"}] if overwrite else []
+        replaced = sorted(set(replace_documents))
+        if replaced and not overwrite:
+            pending.append({"op": "delete_documents", "document_ids": replaced})
+        written = 0
+        for upsert, line in upserts:
+            # Batches are appended as they arrive but only committed to the
+            # manifest once every batch is on disk.
+            payload = b"".join(_encode_wal_entry(item) for item in pending) + (
+                line if line is not None else _encode_wal_entry(upsert)
+            )
+            self._append_wal(cases, case_id, [*pending, upsert], payload)
+            pending = []
+            written += len(upsert["records"])
+
+        if not written and overwrite:
+            self.delete_case(case_id)
+            return 0
+
+        if case_id not in cases:
+            return 0
+        if pending:
+            # Only document deletes are left when no batch carried chunks.
+            self._append_wal(cases, case_id, pending)
+        elif not written and not fingerprints:
+            return 0
+
+        if fingerprints:
+            cases[case_id] = {
+                **cases[case_id],
+                "fingerprints": {
+                    **cases[case_id].get("fingerprints", {}),
+                    **fingerprints,
+                },
+            }
+        self._write_manifest(cases)
+        return written
+
+    def document_fingerprints(self, case_id: str) -> dict[str, str]:
+        entry = self._load_manifest().get(case_id)
+        if entry is None:
+            return {}
+        return dict(entry.get("fingerprints", {}))
 
     def search(
         self,
@@ -148,89 +1745,437 @@ class FileVectorStore:
         if top_k <= 0:
             raise ValueError("top_k must be > 0")
 
-        query_vector = embed_text(query, dims=self._dims)
-        records = self._load_records()
-        results: list[SearchResult] = []
+        if not self._result_cache_size:
+            return self._search_uncached(query, top_k, case_id, min_score)
 
-        for record in records:
-            record_case_id = str(record.get("case_id", ""))
-            if case_id is not None and record_case_id != case_id:
-                continue
+        cases = self._load_manifest()
+        version: object
+        if case_id is None:
+            version = self._revision()
+        else:
+            # Compaction keeps the case revision but can rewrite the segment
+            # at another storage or dims, which changes the scores.
+            entry = cases.get(case_id, {})
+            version = (entry.get("revision"), entry.get("segment"), entry.get("dims"))
+        cache_key = (
+            str(self._root.resolve()),
+            self._dims,
+            self._storage,
+            self._ann_mode,
+            self._ann_nprobe,
+            self._search_mode,
+            case_id,
+            query,
+            top_k,
+            min_score,
+            version,
+        )
+        cached = self._RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        results = self._search_uncached(query, top_k, case_id, min_score)
+        self._RESULT_CACHE.put(cache_key, tuple(results), self._result_cache_size)
+        return results
+
+    def search_many(
+        self,
+        queries: list[tuple[str, str]],
+        top_k: int = 5,
+        min_score: float | None = None,
+    ) -> list[list[SearchResult]]:
+        """Run case-scoped ``(case_id, query)`` searches in one pass.
+
+        Results line up with ``queries``. The manifest is read once, all
+        queries are embedded as one matrix, and each case's index is scored
+        against its queries with a single matrix multiply.
+        """
+        if top_k <= 0:
+            raise ValueError("top_k must be > 0")
+        if not queries:
+            return []
+        if self._search_mode == "hybrid":
+            return [
+                self.search(query, top_k=top_k, case_id=case_id, min_score=min_score)
+                for case_id, query in queries
+            ]
 
-            embedding = record.get("embedding")
-            if not isinstance(embedding, list):
+        cases = self._load_manifest()
+        query_matrix = embed_texts([query for _, query in queries], dims=self._dims)
+        positions_by_case: dict[str, list[int]] = {}
+        for position, (case_id, _) in enumerate(queries):
+            positions_by_case.setdefault(case_id, []).append(position)
+
+        results: list[list[SearchResult]] = [[] for _ in queries]
+        for case_id, positions in positions_by_case.items():
+            index = self._load_case_index(case_id, cases)
+            if not len(index):
                 continue
 
-            try:
-                vector = [float(value) for value in embedding]
-            except (TypeError, ValueError):
+            case_scores = index.scores(query_matrix[positions].T)
+            for column, position in enumerate(positions):
+                scores = case_scores[:, column]
+                rows = np.arange(len(index))
+                if min_score is not None:
+                    rows = rows[scores >= min_score]
+                selected = rows[
+                    _top_k_rows(
+                        scores[rows],
+                        index.document_ids[rows],
+                        index.chunk_ids[rows],
+                        top_k,
+                    )
+                ]
+                results[position] = [
+                    SearchResult(
+                        chunk=index.chunk_at(int(row)), score=float(scores[row])
+                    )
+                    for row in selected
+                ]
+        return results
+
+    def _query_vector(self, query: str) -> np.ndarray:
+        if not self._query_cache_size:
+            return np.asarray(embed_text(query, dims=self._dims), dtype=np.float32)
+
+        cache_key = (query, self._dims)
+        vector = self._QUERY_CACHE.get(cache_key)
+        if vector is None:
+            vector = np.asarray(embed_text(query, dims=self._dims), dtype=np.float32)
+            vector.flags.writeable = False
+            self._QUERY_CACHE.put(cache_key, vector, self._query_cache_size)
+        return vector
+
+    def _search_uncached(
+        self,
+        query: str,
+        top_k: int,
+        case_id: str | None,
+        min_score: float | None,
+    ) -> list[SearchResult]:
+        if self._search_mode == "hybrid":
+            return self._search_hybrid(query, top_k, case_id, min_score)
+
+        query_vector = self._query_vector(query)
+        if case_id is None and self._ann_mode == "ivf":
+            return self._search_ivf(query_vector, top_k, min_score)
+
+        cases = self._load_manifest()
+        case_ids = [case_id] if case_id is not None else sorted(cases)
+
+        pool = _CandidatePool(columns=1)
+        for candidate_case_id in case_ids:
+            index = self._load_case_index(candidate_case_id, cases)
+            if not len(index):
                 continue
 
-            if len(vector) != self._dims:
+            case_scores = index.scores(query_vector)
+            case_rows = np.arange(len(index))
+            if min_score is not None:
+                keep = case_scores >= min_score
+                case_rows = case_rows[keep]
+                case_scores = case_scores[keep]
+            keep = _candidate_rows(case_scores, top_k)
+            pool.add(index, case_rows[keep], [case_scores[keep]])
+            pool.keep(_candidate_rows(pool.scores[0], top_k))
+
+        if not len(pool):
+            return []
+
+        (all_scores,) = pool.scores
+        selected = _top_k_rows(all_scores, pool.document_ids, pool.chunk_ids, top_k)
+        return [
+            SearchResult(chunk=pool.chunk_at(i), score=float(all_scores[i]))
+            for i in selected
+        ]
+
+    def _lexical_index(self, case_id: str, index: _ColumnarIndex) -> Bm25Runs:
+        if index.lexical is not None:
+            return index.lexical
+
+        # Only segments written before postings were persisted get here.
+        cache_key = str(self._shard_dir(case_id).resolve())
+        cached = self._LEXICAL_CACHE.get(cache_key)
+        # Case indexes are immutable snapshots, so identity marks the version.
+        # The weak reference leaves evicting the index to the index cache.
+        if cached is not None and cached[0]() is index:
+            return cached[1]
+
+        lexical = Bm25Runs.build(
+            index.text_bytes(row).decode("utf-8") for row in range(len(index))
+        )
+        self._LEXICAL_CACHE.put(
+            cache_key, (weakref.ref(index), lexical), self._index_cache_size
+        )
+        return lexical
+
+    def _search_hybrid(
+        self,
+        query: str,
+        top_k: int,
+        case_id: str | None,
+        min_score: float | None,
+    ) -> list[SearchResult]:
+        query_vector = self._query_vector(query)
+        cases = self._load_manifest()
+        case_ids = [case_id] if case_id is not None else sorted(cases)
+
+        # BM25 weighs terms by corpus statistics. Across cases they are summed
+        # first, so every case is scored as part of one corpus and the lexical
+        # scores stay comparable between cases.
+        stats = None
+        if len(case_ids) > 1:
+            terms = query_terms(query)
+            for candidate_case_id in case_ids:
+                index = self._load_case_index(candidate_case_id, cases)
+                case_stats = self._lexical_index(candidate_case_id, index).stats(terms)
+                stats = case_stats if stats is None else stats + case_stats
+
+        depth = max(top_k * _HYBRID_CANDIDATE_FACTOR, _HYBRID_MIN_CANDIDATES)
+        pool = _CandidatePool(columns=2)
+        for candidate_case_id in case_ids:
+            index = self._load_case_index(candidate_case_id, cases)
+            if not len(index):
                 continue
 
-            chunk = EvidenceChunk(
-                case_id=record_case_id,
-                document_id=str(record.get("document_id", "")),
-                chunk_id=str(record.get("chunk_id", "")),
-                text=str(record.get("text", "")),
-                start_char=int(record.get("start_char", 0)),
-                end_char=int(record.get("end_char", 0)),
-                source=str(record.get("source", "provenance")),
-                page=(
-                    int(record["page"]) if isinstance(record.get("page"), int) else None
-                ),
+            case_cosines = index.scores(query_vector)
+            case_lexicals = self._lexical_index(candidate_case_id, index).scores(
+                query, stats=stats
+            )
+            case_rows = np.arange(len(index))
+            if min_score is not None:
+                # A lexical match rescues chunks the hashed vectors score low.
+                keep = (case_cosines >= min_score) | (case_lexicals > 0)
+                case_rows = case_rows[keep]
+                case_cosines = case_cosines[keep]
+                case_lexicals = case_lexicals[keep]
+            keep = _fusion_candidate_rows(case_cosines, case_lexicals, depth)
+            pool.add(index, case_rows[keep], [case_cosines[keep], case_lexicals[keep]])
+            pool.keep(_fusion_candidate_rows(*pool.scores, depth))
+
+        if not len(pool):
+            return []
+
+        all_cosines, all_lexicals = pool.scores
+        document_ids = pool.document_ids
+        chunk_ids = pool.chunk_ids
+        vector_ranking = _top_k_rows(all_cosines, document_ids, chunk_ids, depth)
+        matched = np.flatnonzero(all_lexicals > 0)
+        lexical_ranking = matched[
+            _top_k_rows(
+                all_lexicals[matched], document_ids[matched], chunk_ids[matched], depth
+            )
+        ]
+        fused = reciprocal_rank_fusion([vector_ranking, lexical_ranking], len(pool))
+        candidates = np.union1d(vector_ranking, lexical_ranking)
+        selected = candidates[
+            _top_k_rows(
+                fused[candidates],
+                document_ids[candidates],
+                chunk_ids[candidates],
+                top_k,
+            )
+        ]
+        return [
+            SearchResult(chunk=pool.chunk_at(i), score=float(fused[i]))
+            for i in selected
+        ]
+
+    def _portfolio_view(
+        self, cases: dict[str, dict[str, Any]] | None = None
+    ) -> _PortfolioView | None:
+        if cases is None:
+            cases = self._load_manifest()
+        states = {
+            case_id: (
+                entry.get("revision", 0),
+                entry.get("segment", 0),
+                entry.get("wal_bytes", 0),
             )
-            score = cosine_similarity(query_vector, vector)
-            if min_score is not None and score < min_score:
+            for case_id, entry in cases.items()
+        }
+        signature = tuple(sorted(states.items()))
+        cache_key = (str(self._root.resolve()), self._dims, self._ann_nlist)
+        cached = self._PORTFOLIO_CACHE.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        # Cases whose state is unchanged keep their rows and IVF lists; only
+        # the rest are reloaded and placed on the existing centroids.
+        previous = cached[1] if cached is not None else None
+        kept: dict[str, int] = {}
+        if previous is not None:
+            kept = {
+                case_id: position
+                for position, case_id in enumerate(previous.case_ids)
+                if previous.states[position] == states.get(case_id)
+            }
+
+        case_ids: list[str] = []
+        document_ids: list[np.ndarray] = []
+        chunk_ids: list[np.ndarray] = []
+        pieces: list[tuple[np.ndarray, np.ndarray | None, np.ndarray | None]] = []
+        for case_id in sorted(cases):
+            position = kept.get(case_id)
+            if previous is not None and position is not None:
+                start, stop = previous.offsets[position : position + 2]
+                case_ids.append(case_id)
+                document_ids.append(previous.document_ids[start:stop])
+                chunk_ids.append(previous.chunk_ids[start:stop])
+                pieces.append(
+                    (
+                        previous.embeddings[start:stop],
+                        (
+                            previous.scales[start:stop]
+                            if previous.scales is not None
+                            else None
+                        ),
+                        previous.assignments[start:stop],
+                    )
+                )
                 continue
-            results.append(SearchResult(chunk=chunk, score=score))
+            index = self._load_case_index(case_id, cases)
+            if len(index):
+                # WAL rows are float32 until compaction; store them like the
+                # segments so the view has a single storage.
+                stored = index.with_storage(self._storage)
+                case_ids.append(case_id)
+                document_ids.append(index.document_ids)
+                chunk_ids.append(index.chunk_ids)
+                pieces.append((stored.embeddings, stored.scales, None))
+        if not case_ids:
+            self._PORTFOLIO_CACHE.pop(cache_key, None)
+            return None
 
-        results.sort(
-            key=lambda item: (
-                -item.score,
-                item.chunk.document_id,
-                item.chunk.chunk_id,
+        embeddings = np.concatenate([codes for codes, _, _ in pieces])
+        scales = (
+            np.concatenate([piece_scales for _, piece_scales, _ in pieces])
+            if pieces[0][1] is not None
+            else None
+        )
+        fresh_rows = sum(len(codes) for codes, _, lists in pieces if lists is None)
+        untrained_rows = fresh_rows + (previous.untrained_rows if previous else 0)
+        if previous is None or untrained_rows > _IVF_RETRAIN_FRACTION * len(embeddings):
+            ivf = IvfFlatIndex.build(embeddings, nlist=self._ann_nlist)
+            assignments = ivf.assignments()
+            untrained_rows = 0
+        else:
+            assignments = np.concatenate(
+                [
+                    previous.ivf.assign(codes) if lists is None else lists
+                    for codes, _, lists in pieces
+                ]
             )
+            ivf = IvfFlatIndex.from_assignments(previous.ivf.centroids, assignments)
+
+        offsets = np.zeros(len(case_ids) + 1, dtype=np.int64)
+        np.cumsum([len(codes) for codes, _, _ in pieces], out=offsets[1:])
+        view = _PortfolioView(
+            case_ids=case_ids,
+            states=[states[case_id] for case_id in case_ids],
+            offsets=offsets,
+            document_ids=np.concatenate(document_ids),
+            chunk_ids=np.concatenate(chunk_ids),
+            embeddings=embeddings,
+            scales=scales,
+            ivf=ivf,
+            assignments=assignments,
+            untrained_rows=untrained_rows,
+        )
+        self._PORTFOLIO_CACHE[cache_key] = (signature, view)
+        return view
+
+    def _search_ivf(
+        self,
+        query_vector: np.ndarray,
+        top_k: int,
+        min_score: float | None,
+    ) -> list[SearchResult]:
+        cases = self._load_manifest()
+        view = self._portfolio_view(cases)
+        if view is None:
+            return []
+
+        candidates = view.ivf.candidates(query_vector, self._ann_nprobe)
+        scores = quantized_scores(
+            view.embeddings[candidates],
+            view.scales[candidates] if view.scales is not None else None,
+            query_vector,
+        )
+        if min_score is not None:
+            keep = scores >= min_score
+            candidates = candidates[keep]
+            scores = scores[keep]
+
+        selected = _top_k_rows(
+            scores,
+            view.document_ids[candidates],
+            view.chunk_ids[candidates],
+            top_k,
         )
-        return results[:top_k]
+        rows = candidates[selected]
+        shards = np.searchsorted(view.offsets, rows, side="right") - 1
+        # Same manifest snapshot as the view, so each case index is the one
+        # its rows were taken from.
+        return [
+            SearchResult(
+                chunk=self._load_case_index(view.case_ids[shard], cases).chunk_at(
+                    int(row - view.offsets[shard])
+                ),
+                score=float(score),
+            )
+            for shard, row, score in zip(shards, rows, scores[selected])
+        ]
+
+    def _case_summary(
+        self, case_id: str, cases: dict[str, dict[str, Any]]
+    ) -> dict[str, int]:
+        entry = cases.get(case_id)
+        if entry is None:
+            return {}
+        documents = entry.get("documents")
+        if isinstance(documents, dict):
+            return {str(key): int(value) for key, value in documents.items()}
+        # Manifests written before per-case summaries need one index scan.
+        return _document_counts(self._load_case_index(case_id, cases))
+
+    def case_chunks(
+        self, case_id: str, start: int = 0, stop: int | None = None
+    ) -> list[EvidenceChunk]:
+        index = self._load_case_index(case_id)
+        return [index.chunk_at(row) for row in range(len(index))[start:stop]]
 
     def case_stats(self, case_id: str) -> dict[str, object]:
-        records = self._load_records()
-        doc_counts: dict[str, int] = {}
-        num_chunks = 0
-        for record in records:
-            if str(record.get("case_id", "")) != case_id:
-                continue
-            num_chunks += 1
-            document_id = str(record.get("document_id", ""))
-            doc_counts[document_id] = doc_counts.get(document_id, 0) + 1
+        cases = self._load_manifest()
+        documents = self._case_summary(case_id, cases)
+        num_chunks = sum(documents.values())
 
         updated_at = None
-        mtime = self._index_mtime()
-        if mtime is not None:
-            updated_at = datetime.fromtimestamp(mtime, tz=timezone.utc).strftime(
-                "%Y-%m-%dT%H:%M:%SZ"
-            )
+        entry = cases.get(case_id)
+        if entry is not None and num_chunks:
+            updated_at = entry.get("updated_at")
+            if updated_at is None:
+                mtime = self._mtime(self._manifest_file)
+                updated_at = _iso_utc_from_mtime(mtime) if mtime else None
 
         return {
             "num_chunks": num_chunks,
             "documents": [
-                {"document_id": doc_id, "num_chunks": count}
-                for doc_id, count in sorted(doc_counts.items())
+                {"document_id": document_id, "num_chunks": count}
+                for document_id, count in sorted(documents.items())
             ],
             "updated_at": updated_at,
         }
 
     def delete_case(self, case_id: str) -> int:
-        records = self._load_records()
-        kept: list[dict[str, Any]] = []
-        deleted = 0
-        for record in records:
-            if str(record.get("case_id", "")) == case_id:
-                deleted += 1
-            else:
-                kept.append(record)
+        with self.writer_lock():
+            cases = dict(self._load_manifest())
+            if case_id not in cases:
+                return 0
 
-        self._write_records(kept)
-        return deleted
+            deleted = sum(self._case_summary(case_id, cases).values())
+            # Dropping the whole shard is cheaper than logging a delete entry.
+            retired = self._publish_segment(cases, case_id, self._empty_index(case_id))
+            self._write_manifest(cases)
+            self._cleanup_generations(case_id, retired)
+            return deleted
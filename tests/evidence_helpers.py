@@ -0,0 +1,52 @@
+import json
+import mmap
+from pathlib import Path
+
+import numpy as np
+
+from caseflow.domain.mortgage.evidence import EvidenceChunk
+
+
+def make_chunk(
+    case_id: str, document_id: str, chunk_id: str, text: str
+) -> EvidenceChunk:
+    """A provenance chunk spanning all of ``text``, for vector store tests."""
+    return EvidenceChunk(
+        case_id=case_id,
+        document_id=document_id,
+        chunk_id=chunk_id,
+        text=text,
+        start_char=0,
+        end_char=len(text),
+        source="provenance",
+        page=None,
+    )
+
+
+def is_memory_mapped(array: np.ndarray) -> bool:
+    """Whether ``array`` reads straight from a mapped segment file."""
+    base: object = array
+    while isinstance(base, np.ndarray):
+        base = base.base
+    return isinstance(base, memoryview) and isinstance(base.obj, mmap.mmap)
+
+
+def read_manifest(root: Path) -> dict:
+    """The manifest checkpoint with its journal replayed, as readers see it."""
+    manifest = json.loads((root / "manifest.json").read_text(encoding="utf-8"))
+    journal = manifest.pop("journal", None)
+    if journal:
+        for line in (root / journal).read_text(encoding="utf-8").splitlines():
+            record = json.loads(line)
+            manifest["revision"] = record["revision"]
+            for case_id, entry in record["cases"].items():
+                if entry is None:
+                    manifest["cases"].pop(case_id, None)
+                else:
+                    manifest["cases"][case_id] = entry
+    return manifest
+
+
+def write_manifest(root: Path, manifest: dict) -> None:
+    """Replace the manifest with a checkpoint that names no journal."""
+    (root / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
@@ -0,0 +1,151 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from caseflow.api.app import app
+from caseflow.core import ndjson
+from caseflow.core.audit import clear_audit_sink_cache
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml.registry import clear_active_model
+
+
+def _reset_runtime_state() -> None:
+    clear_settings_cache()
+    clear_audit_sink_cache()
+    clear_active_model()
+
+
+def _lines(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_predict_batch_scores_array_rows_like_single_predict(monkeypatch) -> None:
+    monkeypatch.setenv("APP_ENV", "dev")
+    monkeypatch.setenv("API_KEY", "server-key")
+    _reset_runtime_state()
+    rows = [
+        {"id": "loan-1", "features": [0.1, -1.2, 2.3]},
+        {"features": [1.0, 2.0]},
+        "not-an-object",
+        {"id": "loan-4", "features": [1.0, "x", 3.0]},
+        {"features": [3.0, 2.0, 1.0]},
+    ]
+
+    with TestClient(app) as client:
+        response = client.post("/predict/batch", json=rows)
+        singles = [
+            client.post("/predict", json={"features": rows[index]["features"]})
+            for index in (0, 4)
+        ]
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = _lines(response)
+    assert [line["index"] for line in lines] == [0, 1, 2, 3, 4]
+    assert lines[0]["id"] == "loan-1"
+    assert lines[0]["score"] == pytest.approx(singles[0].json()["score"])
+    assert lines[4]["score"] == pytest.approx(singles[1].json()["score"])
+    assert lines[1]["error"]["status"] == 400
+    assert "exactly 3 values" in lines[1]["error"]["detail"]
+    assert lines[2]["error"] == {"status": 400, "detail": "Row must be a JSON object"}
+    assert lines[3] == {
+        "index": 3,
+        "id": "loan-4",
+        "error": {
+            "status": 400,
+            "detail": "'features' must contain only numeric values",
+        },
+    }
+
+
+def test_predict_batch_rejects_non_array_json_body(monkeypatch) -> None:
+    monkeypatch.setenv("APP_ENV", "dev")
+    monkeypatch.setenv("API_KEY", "server-key")
+    _reset_runtime_state()
+
+    response = TestClient(app).post("/predict/batch", json={"features": [1, 2, 3]})
+
+    assert response.status_code == 400
+
+
+def test_decision_batch_streams_ndjson_and_bulk_audits(
+    monkeypatch, tmp_path: Path
+) -> None:
+    sink_path = tmp_path / "decision_events.jsonl"
+    monkeypatch.setenv("APP_ENV", "dev")
+    monkeypatch.setenv("API_KEY", "server-key")
+    monkeypatch.setenv("AUDIT_SINK", "jsonl")
+    monkeypatch.setenv("AUDIT_JSONL_PATH", str(sink_path))
+    monkeypatch.setattr("caseflow.api.routes_predict.BATCH_CHUNK_ROWS", 2)
+    _reset_runtime_state()
+    rows = [{"features": [0.1 * index, -1.2, 2.3]} for index in range(4)]
+    body = b"\n".join(json.dumps(row).encode("utf-8") for row in rows[:2])
+    body += b"\n{broken\n\n" + b"\n".join(json.dumps(row).encode() for row in rows[2:])
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/decision/batch",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        single = client.post("/decision", json=rows[3])
+
+    assert response.status_code == 200
+    lines = _lines(response)
+    assert [line["index"] for line in lines] == [0, 1, 2, 3, 4]
+    assert lines[2]["error"] == {"status": 400, "detail": "Invalid JSON line"}
+    expected = single.json()
+    assert lines[4]["score"] == pytest.approx(expected["score"])
+    for key in ("model_id", "decision", "reasons", "policy_version"):
+        assert lines[4][key] == expected[key]
+
+    events = [
+        json.loads(line) for line in sink_path.read_text(encoding="utf-8").splitlines()
+    ]
+    batch_events = [event for event in events if "index" in event]
+    assert [event["index"] for event in batch_events] == [0, 1, 3, 4]
+    assert {event["request_id"] for event in batch_events} == {
+        response.headers["X-Request-Id"]
+    }
+
+
+def test_batch_rejects_an_unknown_model_before_spooling_the_body(monkeypatch) -> None:
+    monkeypatch.setenv("APP_ENV", "dev")
+    monkeypatch.setenv("API_KEY", "server-key")
+    _reset_runtime_state()
+    spooled: list[object] = []
+    spool_request_body = ndjson.spool_request_body
+
+    async def recording_spool(request):
+        spooled.append(request)
+        return await spool_request_body(request)
+
+    monkeypatch.setattr(ndjson, "spool_request_body", recording_spool)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/predict/batch",
+            content=b'{"features": [1, 2, 3]}\n',
+            headers={"Content-Type": "application/x-ndjson", "X-Model-Id": "missing"},
+        )
+
+    assert response.status_code == 404
+    assert spooled == []
+
+
+def test_closing_ndjson_rows_releases_the_handle_even_before_iteration() -> None:
+    handle = io.BytesIO(b'{"a": 1}\n\n{"a": 2}\n')
+    rows = ndjson.iter_ndjson(handle)
+    rows.close()
+    assert handle.closed
+    assert list(rows) == []
+
+    handle = io.BytesIO(b'{"a": 1}\n{broken\n')
+    assert list(ndjson.iter_ndjson(handle)) == [
+        {"a": 1},
+        ndjson.InvalidLine("Invalid JSON line"),
+    ]
+    assert handle.closed
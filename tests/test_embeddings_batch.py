@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from caseflow.core.metrics import clear_metrics, render_metrics_text
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml import embeddings
+from caseflow.ml.embeddings import clear_token_cache, embed_text, embed_texts
+
+
+@pytest.fixture(autouse=True)
+def _reset_settings_cache():
+    yield
+    clear_settings_cache()
+
+
+def test_embed_texts_matches_embed_text_exactly() -> None:
+    texts = [
+        "Monthly income 5,200 verified by paystub",
+        "income income income dti 0.43",
+        "",
+        "—— ✓ ——",
+        "credit_score 712; monthly_income 8300; dti 0.31",
+    ]
+
+    for dims in (4, 16, 128):
+        batch = embed_texts(texts, dims=dims)
+        assert batch.dtype == np.float32
+        assert batch.shape == (len(texts), dims)
+        for row, text in zip(batch, texts):
+            expected = np.asarray(embed_text(text, dims=dims), dtype=np.float32)
+            assert np.array_equal(row, expected)
+
+
+def test_embed_texts_handles_empty_batches_and_bad_dims() -> None:
+    assert embed_texts([], dims=8).shape == (0, 8)
+
+    try:
+        embed_texts(["income"], dims=0)
+        assert False, "Expected ValueError for dims=0"
+    except ValueError as exc:
+        assert "dims" in str(exc)
+
+
+def _metric(name: str) -> float:
+    for line in render_metrics_text().splitlines():
+        if line.startswith(name + " "):
+            return float(line.split()[1])
+    return 0.0
+
+
+def test_token_cache_counts_hits_and_keys_on_dims(monkeypatch) -> None:
+    monkeypatch.setenv("EMBEDDING_TOKEN_CACHE_SIZE", "16")
+    clear_settings_cache()
+    clear_token_cache()
+    clear_metrics()
+
+    first = embed_text("credit_score dti monthly_income", dims=32)
+    assert _metric("embedding_token_cache_misses_total") == 5.0
+    assert _metric("embedding_token_cache_hits_total") == 0.0
+
+    assert embed_text("credit_score dti monthly_income", dims=32) == first
+    assert _metric("embedding_token_cache_hits_total") == 5.0
+
+    embed_text("credit_score", dims=64)
+    assert _metric("embedding_token_cache_misses_total") == 7.0
+    assert ("credit", 32) in embeddings._token_cache
+    assert ("credit", 64) in embeddings._token_cache
+
+
+def test_token_cache_is_bounded(monkeypatch) -> None:
+    monkeypatch.setenv("EMBEDDING_TOKEN_CACHE_SIZE", "3")
+    clear_settings_cache()
+    clear_token_cache()
+
+    expected = embed_texts(["alpha beta gamma delta epsilon"], dims=16)
+    assert len(embeddings._token_cache) == 3
+    assert list(embeddings._token_cache) == [
+        ("gamma", 16),
+        ("delta", 16),
+        ("epsilon", 16),
+    ]
+    assert np.array_equal(
+        embed_texts(["alpha beta gamma delta epsilon"], dims=16), expected
+    )
+
+    monkeypatch.setenv("EMBEDDING_TOKEN_CACHE_SIZE", "0")
+    clear_settings_cache()
+    clear_token_cache()
+    embed_text("alpha", dims=16)
+    assert len(embeddings._token_cache) == 0
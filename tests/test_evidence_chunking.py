@@ -1,4 +1,4 @@
-from caseflow.domain.mortgage.evidence import chunk_text
+from caseflow.domain.mortgage.evidence import chunk_text, iter_text_chunks
 
 
 def test_chunk_text_is_deterministic_with_expected_overlap() -> None:
@@ -33,3 +33,18 @@ def test_chunk_text_is_deterministic_with_expected_overlap() -> None:
 
 def test_chunk_text_empty_input_returns_empty_list() -> None:
     assert chunk_text(case_id="case_1", document_id="doc_1", text="") == []
+
+
+def test_iter_text_chunks_matches_chunk_text_for_any_piece_split() -> None:
+    text = "Appraisal package page 1.\n" * 180
+    expected = chunk_text(case_id="case_1", document_id="doc_1", text=text)
+
+    for piece_size in (1, 7, 599, 600, 700, 701, 4096):
+        pieces = (
+            text[start : start + piece_size]
+            for start in range(0, len(text), piece_size)
+        )
+        streamed = list(
+            iter_text_chunks(case_id="case_1", document_id="doc_1", pieces=pieces)
+        )
+        assert streamed == expected
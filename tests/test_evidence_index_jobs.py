@@ -0,0 +1,128 @@
+import base64
+import time
+from pathlib import Path
+from threading import Event
+
+from fastapi.testclient import TestClient
+
+from caseflow.api.app import app
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml import evidence_indexer
+
+
+def _upload(client: TestClient, case_id: str, text: str) -> str:
+    response = client.post(
+        "/ocr/extract",
+        json={
+            "case_id": case_id,
+            "document": {
+                "filename": "paystub.txt",
+                "content_type": "text/plain",
+                "content_b64": base64.b64encode(text.encode("utf-8")).decode("ascii"),
+            },
+        },
+    )
+    assert response.status_code == 200
+    return response.json()["document_id"]
+
+
+def _wait_for(client: TestClient, case_id: str, job_id: str) -> dict:
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        response = client.get(f"/mortgage/{case_id}/evidence/jobs/{job_id}")
+        assert response.status_code == 200
+        body = response.json()
+        if body["status"] not in {"queued", "running"}:
+            return body
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def _env(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("PROVENANCE_DIR", str(tmp_path / "provenance"))
+    monkeypatch.setenv("EVIDENCE_INDEX_DIR", str(tmp_path / "evidence_index"))
+    monkeypatch.setenv("OCR_ENGINE", "noop")
+    clear_settings_cache()
+
+
+def test_index_job_reports_progress_and_completes(monkeypatch, tmp_path) -> None:
+    _env(monkeypatch, tmp_path)
+    client = TestClient(app)
+    documents = [
+        {"document_id": _upload(client, "case_job_1", text)}
+        for text in ("Borrower income verified.", "Liabilities summary attached.")
+    ]
+
+    try:
+        submitted = client.post(
+            "/mortgage/case_job_1/evidence/index",
+            params={"mode": "job"},
+            json={"documents": documents, "overwrite": True},
+        )
+        assert submitted.status_code == 202
+        submitted_body = submitted.json()
+        assert submitted_body["documents_total"] == 2
+        assert submitted_body["coalesced"] is False
+
+        body = _wait_for(client, "case_job_1", submitted_body["job_id"])
+    finally:
+        evidence_indexer.shutdown_index_jobs()
+
+    assert body["status"] == "succeeded"
+    assert body["documents_done"] == 2
+    assert body["chunks_written"] >= 2
+    assert body["elapsed_ms"] > 0
+    stats = client.get("/mortgage/case_job_1/evidence/stats").json()
+    assert stats["num_chunks"] == body["chunks_written"]
+
+
+def test_unknown_or_foreign_job_is_404(monkeypatch, tmp_path) -> None:
+    _env(monkeypatch, tmp_path)
+    client = TestClient(app)
+    document_id = _upload(client, "case_job_2", "Income verified.")
+
+    try:
+        submitted = client.post(
+            "/mortgage/case_job_2/evidence/reindex",
+            params={"mode": "job"},
+            json={"documents": [{"document_id": document_id}]},
+        )
+        job_id = submitted.json()["job_id"]
+        _wait_for(client, "case_job_2", job_id)
+    finally:
+        evidence_indexer.shutdown_index_jobs()
+
+    assert client.get(f"/mortgage/other_case/evidence/jobs/{job_id}").status_code == 404
+    assert client.get("/mortgage/case_job_2/evidence/jobs/missing").status_code == 404
+
+
+def test_duplicate_submissions_are_coalesced(monkeypatch, tmp_path) -> None:
+    _env(monkeypatch, tmp_path)
+    release = Event()
+    calls = []
+
+    def blocked_write(**kwargs) -> int:
+        calls.append(kwargs["case_id"])
+        release.wait(5)
+        return 0
+
+    monkeypatch.setattr(evidence_indexer, "write_case_documents", blocked_write)
+    documents = [("doc_a", tmp_path / "doc_a.txt")]
+    try:
+        first, first_created = evidence_indexer.submit_index_job(
+            case_id="case_1", documents=documents, overwrite=True
+        )
+        second, second_created = evidence_indexer.submit_index_job(
+            case_id="case_1", documents=documents, overwrite=True
+        )
+        other, other_created = evidence_indexer.submit_index_job(
+            case_id="case_1", documents=documents, overwrite=False
+        )
+        release.set()
+    finally:
+        evidence_indexer.shutdown_index_jobs()
+
+    assert first_created and other_created and not second_created
+    assert second.job_id == first.job_id
+    assert other.job_id != first.job_id
+    assert calls == ["case_1", "case_1"]
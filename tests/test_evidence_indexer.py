@@ -0,0 +1,202 @@
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+from evidence_helpers import make_chunk
+
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml import evidence_indexer
+from caseflow.ml.evidence_indexer import (
+    IndexJob,
+    iter_case_batches,
+    shutdown_index_pool,
+    write_case_documents,
+)
+from caseflow.ml.vector_store import EmbeddedChunks, FileVectorStore
+
+
+def _documents(tmp_path: Path) -> list[tuple[str, Path]]:
+    texts = {
+        "doc_a": "Borrower income verified from payroll statements. " * 40,
+        "doc_b": "Monthly liabilities include auto loan and credit cards. " * 40,
+        "doc_c": "Appraisal supports the property value for the loan. " * 40,
+    }
+    documents = []
+    for document_id, text in texts.items():
+        path = tmp_path / f"{document_id}.txt"
+        path.write_text(text, encoding="utf-8")
+        documents.append((document_id, path))
+    return documents
+
+
+def _snapshot(store: FileVectorStore) -> list[tuple[str, str, float]]:
+    return [
+        (item.chunk.document_id, item.chunk.chunk_id, item.score)
+        for item in store.search("income liabilities", top_k=20, case_id="case_1")
+    ]
+
+
+def test_parallel_indexing_matches_serial(monkeypatch, tmp_path: Path) -> None:
+    documents = _documents(tmp_path)
+    monkeypatch.setenv("EVIDENCE_INDEX_BATCH_CHUNKS", "4")
+    clear_settings_cache()
+    serial = FileVectorStore(index_file=tmp_path / "serial" / "index.json")
+    serial_count = write_case_documents(
+        case_id="case_1", documents=documents, overwrite=True, store=serial
+    ).indexed_chunks
+
+    monkeypatch.setenv("EVIDENCE_INDEX_WORKERS", "2")
+    clear_settings_cache()
+    try:
+        batches = list(
+            iter_case_batches(case_id="case_1", documents=documents, dims=128)
+        )
+        parallel = FileVectorStore(index_file=tmp_path / "parallel" / "index.json")
+        parallel_count = write_case_documents(
+            case_id="case_1", documents=documents, overwrite=True, store=parallel
+        ).indexed_chunks
+    finally:
+        shutdown_index_pool()
+        clear_settings_cache()
+
+    assert batches and all(isinstance(item, EmbeddedChunks) for item in batches)
+    assert [item.chunks[0].document_id for item in batches][0] == "doc_a"
+    assert parallel_count == serial_count > 0
+    assert _snapshot(parallel) == _snapshot(serial)
+
+
+def test_precomputed_embeddings_must_match_store_dims(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    chunk = make_chunk("case_1", "doc_a", "c1", "income verified")
+    batch = EmbeddedChunks(chunks=[chunk], embeddings=np.zeros((1, 64), np.float32))
+
+    with pytest.raises(ValueError, match="expected"):
+        store.write_case_batches("case_1", [batch])
+
+
+def test_embedding_runs_outside_the_writer_lock(monkeypatch, tmp_path: Path) -> None:
+    clear_settings_cache()
+    store = FileVectorStore(index_file=tmp_path / "index" / "index.json")
+    embed_texts = evidence_indexer.embed_texts
+    other_writer_finished: list[bool] = []
+
+    def embed_while_another_thread_writes(texts, dims):
+        writer = threading.Thread(target=lambda: store.delete_case("case_2"))
+        writer.start()
+        writer.join(timeout=10)
+        other_writer_finished.append(not writer.is_alive())
+        return embed_texts(texts, dims=dims)
+
+    monkeypatch.setattr(
+        evidence_indexer, "embed_texts", embed_while_another_thread_writes
+    )
+
+    result = write_case_documents(
+        case_id="case_1", documents=_documents(tmp_path), overwrite=True, store=store
+    )
+
+    assert result.indexed_chunks > 0
+    assert other_writer_finished and all(other_writer_finished)
+
+
+def test_skip_plan_is_redone_when_the_case_changes_while_embedding(
+    monkeypatch, tmp_path: Path
+) -> None:
+    clear_settings_cache()
+    store = FileVectorStore(index_file=tmp_path / "index" / "index.json")
+    documents = _documents(tmp_path)
+    fingerprints = {document_id: f"fp-{document_id}" for document_id, _ in documents}
+    write_case_documents(
+        case_id="case_1",
+        documents=documents[:1],
+        overwrite=True,
+        store=store,
+        fingerprints={"doc_a": "fp-doc_a"},
+    )
+    embed_texts = evidence_indexer.embed_texts
+    raced: list[bool] = []
+
+    def embed_while_doc_b_is_indexed(texts, dims):
+        if not raced:
+            raced.append(True)
+            write_case_documents(
+                case_id="case_1",
+                documents=documents[1:2],
+                overwrite=False,
+                store=store,
+                fingerprints={"doc_b": "fp-doc_b"},
+                skip_unchanged=True,
+            )
+        return embed_texts(texts, dims=dims)
+
+    monkeypatch.setattr(evidence_indexer, "embed_texts", embed_while_doc_b_is_indexed)
+    job = IndexJob(
+        job_id="job_1",
+        case_id="case_1",
+        document_ids=tuple(document_id for document_id, _ in documents),
+        overwrite=True,
+    )
+
+    result = write_case_documents(
+        case_id="case_1",
+        documents=documents,
+        overwrite=True,
+        store=store,
+        on_batch=job.record_batch,
+        on_retry=job.restart_progress,
+        fingerprints=fingerprints,
+        skip_unchanged=True,
+    )
+
+    # doc_b landed while the first plan was embedding, so only doc_c is new.
+    assert result.skipped_documents == 2
+    # Progress restarts with the second plan instead of counting both.
+    assert job.chunks_written == result.indexed_chunks
+    assert store.document_fingerprints("case_1") == fingerprints
+    assert {
+        item["document_id"] for item in store.case_stats("case_1")["documents"]
+    } == {
+        "doc_a",
+        "doc_b",
+        "doc_c",
+    }
+
+
+def test_batches_are_staged_as_they_are_embedded_and_committed_once(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("EVIDENCE_INDEX_BATCH_CHUNKS", "4")
+    clear_settings_cache()
+    store = FileVectorStore(index_file=tmp_path / "index" / "index.json")
+    staging_dir = tmp_path / "index" / FileVectorStore.STAGING_DIRNAME
+    seen: list[tuple[int, int, list[str]]] = []
+
+    def record_batch(chunks) -> None:
+        (staged,) = staging_dir.iterdir()
+        seen.append(
+            (
+                len(chunks),
+                len(staged.read_bytes().splitlines()),
+                store.list_case_ids(),
+            )
+        )
+
+    try:
+        result = write_case_documents(
+            case_id="case_1",
+            documents=_documents(tmp_path),
+            overwrite=True,
+            store=store,
+            on_batch=record_batch,
+        )
+    finally:
+        clear_settings_cache()
+
+    # Each batch is on disk when it is reported, and none is committed early.
+    assert len(seen) > 2
+    assert [lines for _, lines, _ in seen] == list(range(1, len(seen) + 1))
+    assert all(case_ids == [] for _, _, case_ids in seen)
+    assert sum(count for count, _, _ in seen) == result.indexed_chunks
+    assert store.case_stats("case_1")["num_chunks"] == result.indexed_chunks
+    assert list(staging_dir.iterdir()) == []
@@ -50,3 +50,66 @@ def test_evidence_index_and_search_routes(monkeypatch, tmp_path) -> None:
     first = search_body["results"][0]
     assert first["document_id"] == document_id
     assert "income" in first["text"].lower()
+
+
+def test_evidence_batch_search_route(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("PROVENANCE_DIR", str(tmp_path / "provenance"))
+    monkeypatch.setenv("EVIDENCE_INDEX_DIR", str(tmp_path / "evidence_index"))
+    monkeypatch.setenv("OCR_ENGINE", "noop")
+    clear_settings_cache()
+
+    client = TestClient(app)
+    for case_id, text in (
+        ("case_batch_1", "Borrower income verification from payroll statement."),
+        ("case_batch_2", "Appraisal report supports the property value."),
+    ):
+        ocr_response = client.post(
+            "/ocr/extract",
+            json={
+                "case_id": case_id,
+                "document": {
+                    "filename": "doc.txt",
+                    "content_type": "text/plain",
+                    "content_b64": base64.b64encode(text.encode("utf-8")).decode(
+                        "ascii"
+                    ),
+                },
+            },
+        )
+        document_id = ocr_response.json()["document_id"]
+        index_response = client.post(
+            f"/mortgage/{case_id}/evidence/index",
+            json={"documents": [{"document_id": document_id}], "overwrite": True},
+        )
+        assert index_response.status_code == 200
+
+    response = client.post(
+        "/mortgage/evidence/search/batch",
+        json={
+            "queries": [
+                {"case_id": "case_batch_1", "q": "income verification"},
+                {"case_id": "case_batch_2", "q": "appraisal value"},
+                {"case_id": "case_batch_2", "q": "income verification"},
+            ],
+            "top_k": 3,
+        },
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["case_id"] for item in body["results"]] == [
+        "case_batch_1",
+        "case_batch_2",
+        "case_batch_2",
+    ]
+    assert "income" in body["results"][0]["results"][0]["text"].lower()
+    assert "appraisal" in body["results"][1]["results"][0]["text"].lower()
+    assert body["results"][2]["results"] == []
+
+    single = client.get(
+        "/mortgage/case_batch_1/evidence/search",
+        params={"q": "income verification", "top_k": 3},
+    ).json()
+    assert body["results"][0]["results"] == single["results"]
+
+    empty = client.post("/mortgage/evidence/search/batch", json={"queries": []})
+    assert empty.status_code == 422
@@ -1,4 +1,5 @@
 import base64
+import json
 
 from fastapi.testclient import TestClient
 
@@ -51,3 +52,66 @@ def test_evidence_stats_and_delete_lifecycle(monkeypatch, tmp_path) -> None:
     )
     assert search.status_code == 200
     assert search.json()["results"] == []
+
+
+def test_reindex_skips_documents_with_unchanged_fingerprints(
+    monkeypatch, tmp_path
+) -> None:
+    monkeypatch.setenv("PROVENANCE_DIR", str(tmp_path / "provenance"))
+    monkeypatch.setenv("EVIDENCE_INDEX_DIR", str(tmp_path / "evidence_index"))
+    monkeypatch.setenv("OCR_ENGINE", "noop")
+    clear_settings_cache()
+
+    client = TestClient(app)
+    document_ids = []
+    for name, text in (
+        ("income.txt", "Income verification from payroll statements."),
+        ("liabilities.txt", "Liabilities summary with auto loan balance."),
+    ):
+        ocr = client.post(
+            "/ocr/extract",
+            json={
+                "case_id": "case_life_2",
+                "document": {
+                    "filename": name,
+                    "content_type": "text/plain",
+                    "content_b64": base64.b64encode(text.encode("utf-8")).decode(
+                        "ascii"
+                    ),
+                },
+            },
+        )
+        assert ocr.status_code == 200
+        document_ids.append(ocr.json()["document_id"])
+    documents = [{"document_id": document_id} for document_id in document_ids]
+
+    def reindex(items: list[dict[str, str]]) -> dict:
+        response = client.post(
+            "/mortgage/case_life_2/evidence/reindex", json={"documents": items}
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    first = reindex(documents)
+    assert first["skipped_documents"] == 0
+    assert first["indexed_chunks"] >= 2
+
+    repeat = reindex(documents)
+    assert repeat["skipped_documents"] == 2
+    assert repeat["indexed_chunks"] == 0
+
+    provenance_path = (
+        tmp_path / "provenance" / "case_life_2" / (f"{document_ids[0]}.json")
+    )
+    provenance = json.loads(provenance_path.read_text(encoding="utf-8"))
+    provenance["sha256"] = "0" * 64
+    provenance_path.write_text(json.dumps(provenance), encoding="utf-8")
+
+    changed = reindex(documents)
+    assert changed["skipped_documents"] == 1
+    assert changed["indexed_chunks"] >= 1
+
+    narrowed = reindex(documents[1:])
+    assert narrowed["skipped_documents"] == 1
+    stats = client.get("/mortgage/case_life_2/evidence/stats").json()
+    assert [item["document_id"] for item in stats["documents"]] == [document_ids[1]]
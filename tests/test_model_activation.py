@@ -0,0 +1,162 @@
+import json
+import multiprocessing
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from caseflow.api.app import app
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml.registry import (
+    clear_active_model,
+    clear_model_cache,
+    get_active_model,
+    load_active_model,
+    set_active_model,
+)
+
+
+def _write_model(registry_dir: Path, model_id: str, bias: float) -> None:
+    model_dir = registry_dir / model_id
+    model_dir.mkdir(parents=True, exist_ok=True)
+    (model_dir / "model.json").write_text(
+        json.dumps(
+            {"model_id": model_id, "type": "linear", "bias": bias, "weights": [1.0]}
+        ),
+        encoding="utf-8",
+    )
+
+
+def _configure(monkeypatch, tmp_path: Path) -> tuple[Path, Path]:
+    registry_dir = tmp_path / "registry"
+    _write_model(registry_dir, "model_a", bias=0.0)
+    _write_model(registry_dir, "model_b", bias=1.0)
+    activation_file = tmp_path / "state" / "active_model.json"
+    env = {
+        "APP_ENV": "dev",
+        "API_KEY": "server-key",
+        "MODEL_REGISTRY_DIR": str(registry_dir),
+        "ACTIVE_MODEL_ID": "model_a",
+        "MODEL_ACTIVATION_FILE": str(activation_file),
+    }
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    clear_settings_cache()
+    clear_active_model()
+    clear_model_cache()
+    return registry_dir, activation_file
+
+
+def _worker(env: dict[str, str], commands, results) -> None:
+    os.environ.update(env)
+    clear_settings_cache()
+    results.put(("started", load_active_model().model_id))
+    while commands.get() == "check":
+        results.put(("active", get_active_model().model_id))
+
+
+def test_startup_uses_active_model_id_and_does_not_publish(
+    monkeypatch, tmp_path
+) -> None:
+    _, activation_file = _configure(monkeypatch, tmp_path)
+
+    assert load_active_model().model_id == "model_a"
+    assert not activation_file.exists()
+
+
+def test_activation_publishes_increasing_generations(monkeypatch, tmp_path) -> None:
+    _, activation_file = _configure(monkeypatch, tmp_path)
+
+    set_active_model("model_b")
+    first = json.loads(activation_file.read_text(encoding="utf-8"))
+    set_active_model("model_a")
+    second = json.loads(activation_file.read_text(encoding="utf-8"))
+
+    assert first["model_id"] == "model_b"
+    assert first["generation"] == 1
+    assert second["model_id"] == "model_a"
+    assert second["generation"] == 2
+    assert second["activated_by_pid"] == os.getpid()
+
+    # A restarted worker picks up the recorded model, not ACTIVE_MODEL_ID.
+    clear_active_model()
+    monkeypatch.setenv("ACTIVE_MODEL_ID", "model_b")
+    clear_settings_cache()
+    assert load_active_model().model_id == "model_a"
+
+
+def test_get_active_model_follows_record_written_by_another_worker(
+    monkeypatch, tmp_path
+) -> None:
+    _, activation_file = _configure(monkeypatch, tmp_path)
+    assert load_active_model().model_id == "model_a"
+
+    activation_file.parent.mkdir(parents=True)
+    activation_file.write_text(
+        json.dumps({"model_id": "model_b", "generation": 3}), encoding="utf-8"
+    )
+    assert get_active_model().model_id == "model_b"
+
+    # Stale generations are ignored.
+    activation_file.write_text(
+        json.dumps({"model_id": "model_a", "generation": 2, "pad": "x"}),
+        encoding="utf-8",
+    )
+    assert get_active_model().model_id == "model_b"
+
+
+def test_invalid_record_keeps_serving_current_model(monkeypatch, tmp_path) -> None:
+    _, activation_file = _configure(monkeypatch, tmp_path)
+    set_active_model("model_b")
+
+    activation_file.write_text("{not json", encoding="utf-8")
+    assert get_active_model().model_id == "model_b"
+
+    activation_file.write_text(
+        json.dumps({"model_id": "missing_model", "generation": 9}), encoding="utf-8"
+    )
+    assert get_active_model().model_id == "model_b"
+
+
+def test_activate_endpoint_switches_every_worker(monkeypatch, tmp_path) -> None:
+    _configure(monkeypatch, tmp_path)
+    env = {
+        name: os.environ[name]
+        for name in (
+            "APP_ENV",
+            "API_KEY",
+            "MODEL_REGISTRY_DIR",
+            "ACTIVE_MODEL_ID",
+            "MODEL_ACTIVATION_FILE",
+        )
+    }
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    workers = []
+    for _ in range(2):
+        commands = context.Queue()
+        process = context.Process(target=_worker, args=(env, commands, results))
+        process.start()
+        workers.append((process, commands))
+
+    try:
+        started = [results.get(timeout=60) for _ in workers]
+        assert started == [("started", "model_a")] * 2
+
+        with TestClient(app) as client:
+            response = client.post(
+                "/models/activate/model_b", headers={"X-API-Key": "server-key"}
+            )
+        assert response.status_code == 200
+
+        for _, commands in workers:
+            commands.put("check")
+        checked = [results.get(timeout=60) for _ in workers]
+        assert checked == [("active", "model_b")] * 2
+    finally:
+        for process, commands in workers:
+            commands.put("stop")
+        for process, _ in workers:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.kill()
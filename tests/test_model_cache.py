@@ -0,0 +1,153 @@
+import json
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from caseflow.api.app import app
+from caseflow.core.metrics import clear_metrics, render_metrics_text
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml import registry
+from caseflow.ml.registry import (
+    clear_active_model,
+    clear_model_cache,
+    get_active_model,
+    get_model,
+    refresh_model_cache,
+    set_active_model,
+    start_model_watcher,
+    stop_model_watcher,
+)
+
+
+def _write_model(registry_dir: Path, model_id: str, bias: float) -> Path:
+    model_dir = registry_dir / model_id
+    model_dir.mkdir(parents=True, exist_ok=True)
+    path = model_dir / "model.json"
+    tmp_path = model_dir / "model.json.tmp"
+    tmp_path.write_text(
+        json.dumps(
+            {"model_id": model_id, "type": "linear", "bias": bias, "weights": [1.0]}
+        ),
+        encoding="utf-8",
+    )
+    tmp_path.replace(path)
+    return path
+
+
+def _configure(monkeypatch, tmp_path: Path, **env: str) -> Path:
+    registry_dir = tmp_path / "registry"
+    registry_dir.mkdir()
+    monkeypatch.setenv("APP_ENV", "dev")
+    monkeypatch.setenv("API_KEY", "server-key")
+    monkeypatch.setenv("MODEL_REGISTRY_DIR", str(registry_dir))
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    clear_settings_cache()
+    clear_active_model()
+    clear_model_cache()
+    clear_metrics()
+    return registry_dir
+
+
+def test_get_model_parses_once_until_the_file_changes(monkeypatch, tmp_path) -> None:
+    registry_dir = _configure(monkeypatch, tmp_path)
+    _write_model(registry_dir, "pinned_v1", bias=0.5)
+    reads: list[str] = []
+    read_model = registry._read_model
+
+    def counting_read(model_id: str):
+        reads.append(model_id)
+        return read_model(model_id)
+
+    monkeypatch.setattr(registry, "_read_model", counting_read)
+
+    first = get_model("pinned_v1")
+    assert get_model("pinned_v1") is first
+    _write_model(registry_dir, "pinned_v1", bias=0.75)
+    changed = get_model("pinned_v1")
+
+    assert reads == ["pinned_v1", "pinned_v1"]
+    assert changed.bias == 0.75
+    metrics = render_metrics_text()
+    assert "model_cache_hits_total 1.0" in metrics
+    assert "model_cache_misses_total 2.0" in metrics
+    assert "model_cache_entries 1" in metrics
+
+
+def test_refresh_preloads_new_models_and_hot_reloads_the_active_one(
+    monkeypatch, tmp_path
+) -> None:
+    registry_dir = _configure(monkeypatch, tmp_path, MODEL_CACHE_SIZE="2")
+    _write_model(registry_dir, "a_v1", bias=1.0)
+    _write_model(registry_dir, "b_v1", bias=2.0)
+    _write_model(registry_dir, "c_v1", bias=3.0)
+    set_active_model("a_v1")
+
+    # a_v1 is already cached; only one new model fits beside it.
+    assert refresh_model_cache() == 1
+    assert refresh_model_cache() == 0
+
+    _write_model(registry_dir, "a_v1", bias=1.5)
+    assert refresh_model_cache() == 1
+    assert get_active_model().bias == 1.5
+
+    (registry_dir / "b_v1" / "model.json").unlink()
+    refresh_model_cache()
+    assert registry._model_cache.keys() == [str(registry_dir / "a_v1" / "model.json")]
+    assert "model_cache_reloads_total 2.0" in render_metrics_text()
+
+
+def test_refresh_does_not_undo_an_activation_made_during_the_reload(
+    monkeypatch, tmp_path
+) -> None:
+    registry_dir = _configure(monkeypatch, tmp_path, MODEL_CACHE_SIZE="2")
+    _write_model(registry_dir, "a_v1", bias=1.0)
+    _write_model(registry_dir, "b_v1", bias=2.0)
+    set_active_model("b_v1")
+    set_active_model("a_v1")
+    _write_model(registry_dir, "a_v1", bias=1.5)
+    read_model = registry._read_model
+
+    def read_while_activating(model_id: str):
+        # Another request activates b_v1 while the watcher parses a_v1.
+        set_active_model("b_v1")
+        return read_model(model_id)
+
+    monkeypatch.setattr(registry, "_read_model", read_while_activating)
+
+    assert refresh_model_cache() == 1
+    assert get_active_model().model_id == "b_v1"
+    assert get_model("a_v1").bias == 1.5
+
+
+def test_watcher_serves_pinned_models_from_memory(monkeypatch, tmp_path) -> None:
+    registry_dir = _configure(
+        monkeypatch, tmp_path, MODEL_WATCH_INTERVAL_SECONDS="0.01"
+    )
+    _write_model(registry_dir, "pinned_v1", bias=0.5)
+    try:
+        assert start_model_watcher()
+        deadline = time.monotonic() + 5
+        while not registry._model_cache.keys() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        def no_disk_read(model_id: str):
+            raise AssertionError(f"{model_id} was read from disk")
+
+        monkeypatch.setattr(registry, "_read_model", no_disk_read)
+        assert get_model("pinned_v1").bias == 0.5
+    finally:
+        stop_model_watcher()
+
+
+def test_metrics_endpoint_reports_model_cache(monkeypatch, tmp_path) -> None:
+    registry_dir = _configure(monkeypatch, tmp_path, ACTIVE_MODEL_ID="pinned_v1")
+    _write_model(registry_dir, "pinned_v1", bias=0.5)
+
+    with TestClient(app) as client:
+        get_model("pinned_v1")
+        body = client.get("/metrics").text
+
+    assert "model_cache_hits_total" in body
+    assert "model_cache_entries 1" in body
@@ -0,0 +1,146 @@
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from caseflow.api.app import app
+from caseflow.core.metrics import clear_metrics, render_metrics_text
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml.registry import clear_active_model, clear_model_cache, load_model
+from caseflow.ml.shadow import shutdown_shadow_executor
+
+SHADOW_LABELS = '{model_id="champion_v1",shadow_model_id="challenger_v1"}'
+
+
+def _write_model(registry_dir: Path, model_id: str, bias: float, weights) -> None:
+    model_dir = registry_dir / model_id
+    model_dir.mkdir(parents=True, exist_ok=True)
+    (model_dir / "model.json").write_text(
+        json.dumps(
+            {"model_id": model_id, "type": "linear", "bias": bias, "weights": weights}
+        ),
+        encoding="utf-8",
+    )
+
+
+def _configure(monkeypatch, tmp_path: Path, **env: str) -> None:
+    registry_dir = tmp_path / "registry"
+    _write_model(registry_dir, "champion_v1", bias=1.0, weights=[1.0, 1.0, 1.0])
+    _write_model(registry_dir, "challenger_v1", bias=1.5, weights=[1.0, 1.0, 1.0])
+    _write_model(registry_dir, "narrow_v1", bias=0.0, weights=[1.0])
+    monkeypatch.setenv("APP_ENV", "dev")
+    monkeypatch.setenv("API_KEY", "server-key")
+    monkeypatch.setenv("MODEL_REGISTRY_DIR", str(registry_dir))
+    monkeypatch.setenv("ACTIVE_MODEL_ID", "champion_v1")
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    clear_settings_cache()
+    clear_active_model()
+    clear_model_cache()
+    clear_metrics()
+
+
+def test_requests_route_to_header_or_body_model(monkeypatch, tmp_path) -> None:
+    _configure(monkeypatch, tmp_path)
+    features = {"features": [1.0, 2.0, 3.0]}
+
+    with TestClient(app) as client:
+        active = client.post("/predict", json=features)
+        by_header = client.post(
+            "/predict", json=features, headers={"X-Model-Id": "challenger_v1"}
+        )
+        by_body = client.post(
+            "/decision",
+            json={**features, "model_id": "challenger_v1"},
+            headers={"X-Model-Id": "narrow_v1"},
+        )
+        batch = client.post(
+            "/predict/batch", json=[features], headers={"X-Model-Id": "challenger_v1"}
+        )
+        unknown = client.post("/predict", json={**features, "model_id": "missing_v1"})
+        escaped = client.post("/predict", json={**features, "model_id": "../registry"})
+
+    assert (active.json()["model_id"], active.json()["score"]) == ("champion_v1", 7.0)
+    assert (by_header.json()["model_id"], by_header.json()["score"]) == (
+        "challenger_v1",
+        7.5,
+    )
+    assert by_body.json()["model_id"] == "challenger_v1"
+    assert json.loads(batch.text.splitlines()[0])["model_id"] == "challenger_v1"
+    assert unknown.status_code == 404
+    assert escaped.status_code == 404
+
+
+def test_dot_model_ids_never_leave_the_registry(monkeypatch, tmp_path) -> None:
+    _configure(monkeypatch, tmp_path)
+    # ".." would resolve to tmp_path/model.json, outside the registry.
+    _write_model(tmp_path, "", bias=9.0, weights=[1.0, 1.0, 1.0])
+    _write_model(tmp_path / "registry", ".hidden", bias=9.0, weights=[1.0, 1.0, 1.0])
+    features = {"features": [1.0, 2.0, 3.0]}
+
+    with TestClient(app) as client:
+        by_header = client.post("/predict", json=features, headers={"X-Model-Id": ".."})
+        by_body = client.post("/predict", json={**features, "model_id": ".."})
+        hidden = client.post("/predict", json={**features, "model_id": ".hidden"})
+
+    assert [by_header.status_code, by_body.status_code, hidden.status_code] == [
+        404,
+        404,
+        404,
+    ]
+    with pytest.raises(FileNotFoundError):
+        load_model("..")
+
+
+def test_shadow_model_scores_sampled_traffic_off_the_request_path(
+    monkeypatch, tmp_path
+) -> None:
+    _configure(
+        monkeypatch,
+        tmp_path,
+        SHADOW_MODEL_ID="challenger_v1",
+        SHADOW_TRAFFIC_FRACTION="1",
+    )
+
+    with TestClient(app) as client:
+        single = client.post("/predict", json={"features": [1.0, 2.0, 3.0]})
+        batch = client.post(
+            "/decision/batch",
+            json=[{"features": [0.0, 0.0, 0.0]}, {"features": [1.0]}],
+        )
+        routed = client.post(
+            "/predict",
+            json={"features": [1.0, 2.0, 3.0]},
+            headers={"X-Model-Id": "challenger_v1"},
+        )
+        shutdown_shadow_executor()
+        metrics = render_metrics_text()
+
+    assert single.json()["model_id"] == "champion_v1"
+    assert batch.status_code == 200
+    assert routed.status_code == 200
+    # The second batch row failed validation, and requests already served by
+    # the shadow model are not compared with themselves.
+    assert f"shadow_scores_total{SHADOW_LABELS} 2.0" in metrics
+    assert f"shadow_score_abs_delta_sum{SHADOW_LABELS} 1.0" in metrics
+
+
+def test_shadow_errors_are_counted_not_raised(monkeypatch, tmp_path) -> None:
+    _configure(
+        monkeypatch,
+        tmp_path,
+        SHADOW_MODEL_ID="narrow_v1",
+        SHADOW_TRAFFIC_FRACTION="1",
+    )
+
+    with TestClient(app) as client:
+        response = client.post("/predict", json={"features": [1.0, 2.0, 3.0]})
+        shutdown_shadow_executor()
+        metrics = render_metrics_text()
+
+    assert response.status_code == 200
+    assert (
+        'shadow_score_errors_total{model_id="champion_v1",shadow_model_id="narrow_v1"}'
+        " 1.0"
+    ) in metrics
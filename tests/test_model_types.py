@@ -0,0 +1,208 @@
+import json
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from caseflow.api.app import app
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml.model import RegistryModel
+from caseflow.ml.registry import clear_active_model, clear_model_cache, load_model
+
+# Tree 0 splits on x0 <= 0.5; tree 1 splits on x1 <= 0.0, then x0 <= -1.0.
+TREES = {
+    "roots": [0, 3],
+    "feature": [0, -1, -1, 1, 0, -1, -1, -1],
+    "threshold": [0.5, 0.0, 0.0, 0.0, -1.0, 0.0, 0.0, 0.0],
+    "left": [1, -1, -1, 4, 5, -1, -1, -1],
+    "right": [2, -1, -1, 7, 6, -1, -1, -1],
+    "value": [0.0, 1.0, 2.0, 0.0, 0.0, 10.0, 20.0, 30.0],
+}
+SCHEMA = {
+    "schema_version": "2",
+    "features": [
+        {"name": "income", "dtype": "float", "required": True},
+        {"name": "debt", "dtype": "float", "required": False, "default": 1.0},
+    ],
+}
+
+
+def _write_model(registry_dir: Path, model_id: str, **payload: object) -> Path:
+    model_dir = registry_dir / model_id
+    model_dir.mkdir(parents=True, exist_ok=True)
+    (model_dir / "model.json").write_text(
+        json.dumps({"model_id": model_id, **payload}), encoding="utf-8"
+    )
+    return model_dir
+
+
+def _configure(monkeypatch, tmp_path: Path) -> Path:
+    registry_dir = tmp_path / "registry"
+    registry_dir.mkdir()
+    monkeypatch.setenv("APP_ENV", "dev")
+    monkeypatch.setenv("API_KEY", "server-key")
+    monkeypatch.setenv("MODEL_REGISTRY_DIR", str(registry_dir))
+    clear_settings_cache()
+    clear_active_model()
+    clear_model_cache()
+    return registry_dir
+
+
+def test_tree_ensemble_from_npz_sidecar_walks_every_tree(monkeypatch, tmp_path) -> None:
+    registry_dir = _configure(monkeypatch, tmp_path)
+    model_dir = _write_model(
+        registry_dir,
+        "trees_v1",
+        type="tree_ensemble",
+        n_features=2,
+        base_score=0.5,
+        arrays="trees.npz",
+    )
+    np.savez(model_dir / "trees.npz", **{k: np.asarray(v) for k, v in TREES.items()})
+
+    model = load_model("trees_v1")
+    rows = [[0.0, 0.0], [1.0, 1.0], [-2.0, -1.0], [float("nan"), 1.0]]
+
+    assert model.predict_batch(rows).tolist() == [21.5, 32.5, 11.5, 32.5]
+    assert [model.predict(row) for row in rows] == [21.5, 32.5, 11.5, 32.5]
+    with pytest.raises(ValueError, match="exactly 2 values"):
+        model.predict([1.0])
+
+
+def test_logistic_and_scaled_linear_match_their_formulas(monkeypatch, tmp_path) -> None:
+    registry_dir = _configure(monkeypatch, tmp_path)
+    _write_model(
+        registry_dir, "logistic_v1", type="logistic", bias=-1.0, weights=[2.0, 0.5]
+    )
+    _write_model(
+        registry_dir,
+        "scaled_v1",
+        type="scaled_linear",
+        bias=3.0,
+        weights=[2.0, -1.0],
+        mean=[10.0, -4.0],
+        scale=[5.0, 0.5],
+    )
+    rows = np.asarray([[0.0, 0.0], [1.0, 2.0], [12.0, -3.0], [900.0, 0.0]])
+
+    logistic = load_model("logistic_v1")
+    scaled = load_model("scaled_v1")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        probabilities = logistic.predict_batch(rows)
+
+    expected = 1.0 / (1.0 + np.exp(-(rows @ [2.0, 0.5] - 1.0)))
+    np.testing.assert_allclose(probabilities, expected, rtol=1e-12)
+    assert logistic.predict([900.0, 0.0]) == pytest.approx(probabilities[3])
+    np.testing.assert_allclose(
+        scaled.predict_batch(rows),
+        ((rows - [10.0, -4.0]) / [5.0, 0.5]) @ [2.0, -1.0] + 3.0,
+        rtol=1e-12,
+    )
+
+
+@pytest.mark.parametrize(
+    "payload, message",
+    [
+        ({"type": "forest"}, "must have type one of: linear, logistic"),
+        (
+            {"type": "scaled_linear", "bias": 0.0, "weights": [1.0], "scale": [1.0]},
+            "must define a non-empty 'mean' list",
+        ),
+        (
+            {
+                "type": "scaled_linear",
+                "bias": 0.0,
+                "weights": [1.0],
+                "mean": [0.0],
+                "scale": [0.0],
+            },
+            "is invalid: 'scale' values must be finite and non-zero",
+        ),
+        (
+            {"type": "tree_ensemble", "n_features": 2, **TREES, "left": [1] * 8},
+            "is invalid: tree leaves must have both",
+        ),
+        (
+            {
+                "type": "tree_ensemble",
+                "n_features": 2,
+                **TREES,
+                "left": [1, -1, -1, 0, 5, -1, -1, -1],
+            },
+            "is invalid: tree nodes must form disjoint trees",
+        ),
+        (
+            {"type": "tree_ensemble", "n_features": 1, **TREES},
+            "is invalid: tree split features must be below 'n_features'",
+        ),
+        (
+            {"type": "tree_ensemble", "n_features": 2, "arrays": "../trees.npz"},
+            "'arrays' must name an .npz file next to model.json",
+        ),
+        (
+            {"type": "tree_ensemble", "n_features": 2, "arrays": "missing.npz"},
+            "has an unreadable 'arrays' file 'missing.npz'",
+        ),
+    ],
+)
+def test_invalid_model_payloads_are_rejected(
+    monkeypatch, tmp_path, payload: dict[str, object], message: str
+) -> None:
+    registry_dir = _configure(monkeypatch, tmp_path)
+    _write_model(registry_dir, "broken_v1", **payload)
+
+    with pytest.raises(ValueError, match=f"^Model 'broken_v1' {message}"):
+        load_model("broken_v1")
+
+
+def test_sidecar_object_arrays_are_never_unpickled(monkeypatch, tmp_path) -> None:
+    registry_dir = _configure(monkeypatch, tmp_path)
+    model_dir = _write_model(
+        registry_dir, "pickled_v1", type="linear", bias=0.0, arrays="weights.npz"
+    )
+    np.savez(model_dir / "weights.npz", weights=np.asarray([{"w": 1.0}], dtype=object))
+
+    with pytest.raises(ValueError, match="unreadable 'arrays' file"):
+        load_model("pickled_v1")
+
+
+def test_tree_ensemble_serves_named_features(monkeypatch, tmp_path) -> None:
+    registry_dir = _configure(monkeypatch, tmp_path)
+    _write_model(
+        registry_dir,
+        "trees_v1",
+        type="tree_ensemble",
+        n_features=2,
+        base_score=0.5,
+        schema=SCHEMA,
+        **TREES,
+    )
+    monkeypatch.setenv("ACTIVE_MODEL_ID", "trees_v1")
+    clear_settings_cache()
+
+    with TestClient(app) as client:
+        single = client.post("/predict", json={"features": {"income": 1.0}})
+        batch = client.post(
+            "/predict/batch",
+            json=[
+                {"features": {"income": 0.0, "debt": 0.0}},
+                {"features": {"debt": 0.0}},
+            ],
+        )
+
+    assert single.status_code == 200
+    assert single.json()["score"] == 32.5
+    lines = [json.loads(line) for line in batch.text.splitlines()]
+    assert lines[0]["score"] == 21.5
+    assert lines[1]["error"]["status"] == 422
+
+
+def test_registry_model_types_must_implement_scoring() -> None:
+    class Unscored(RegistryModel):
+        pass
+
+    with pytest.raises(TypeError, match="abstract method _score"):
+        Unscored()
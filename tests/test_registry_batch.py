@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from caseflow.ml.registry import LinearModel
+
+
+def _schema_model() -> LinearModel:
+    return LinearModel(
+        model_id="schema_v2",
+        type="linear",
+        bias=0.5,
+        weights=[0.25, -1.0, 2.0],
+        feature_names=["age", "bmi", "bp"],
+        required_names={"age"},
+        defaults={"bmi": 1.5},
+    )
+
+
+def test_predict_batch_matches_row_by_row_predict() -> None:
+    model = LinearModel(
+        model_id="plain_v1", type="linear", bias=0.2, weights=[0.5, -0.1, 0.05]
+    )
+    rng = np.random.default_rng(19)
+    matrix = rng.normal(size=(2_000, 3))
+
+    scores = model.predict_batch(matrix)
+
+    assert scores.shape == (2_000,)
+    np.testing.assert_allclose(
+        scores, [model.predict(row.tolist()) for row in matrix], rtol=1e-12
+    )
+    assert model.predict_batch([]).shape == (0,)
+
+
+def test_predict_batch_rejects_wrong_width_with_the_predict_error() -> None:
+    model = LinearModel(
+        model_id="plain_v1", type="linear", bias=0.0, weights=[1.0, 2.0]
+    )
+
+    with pytest.raises(ValueError) as single:
+        model.predict([1.0, 2.0, 3.0])
+    with pytest.raises(ValueError) as batch:
+        model.predict_batch([[1.0, 2.0, 3.0]])
+
+    assert str(batch.value) == str(single.value)
+
+
+def test_predict_named_batch_applies_defaults_and_matches_single_rows() -> None:
+    model = _schema_model()
+    rows = [
+        {"age": 1.0, "bp": 0.5},
+        {"age": "2", "bmi": 0.0, "bp": -1.0},
+    ]
+
+    scores = model.predict_named_batch(rows)
+
+    assert model.vector_from_named_features(rows[0]) == [1.0, 1.5, 0.5]
+    assert scores.tolist() == pytest.approx(
+        [model.predict(model.vector_from_named_features(row)) for row in rows]
+    )
+
+
+@pytest.mark.parametrize(
+    "features, message",
+    [
+        ({"age": 1.0, "bp": 0.0, "height": 2.0}, "Unknown feature keys: height"),
+        ({"bp": 0.0}, "Missing required feature keys: age"),
+        ({"age": 1.0}, "Missing optional feature keys with no default: bp"),
+        ({"age": "old", "bp": 0.0}, "'features' object values must be numeric"),
+    ],
+)
+def test_predict_named_batch_reports_the_single_row_error_and_position(
+    features: dict[str, object], message: str
+) -> None:
+    model = _schema_model()
+
+    with pytest.raises(ValueError, match=message):
+        model.vector_from_named_features(features)
+    with pytest.raises(ValueError) as exc:
+        model.predict_named_batch([{"age": 1.0, "bp": 0.0}, features])
+
+    assert str(exc.value) == f"rows[1]: {message}"
+
+
+def test_exact_keys_skip_the_detailed_checks_but_assemble_the_same_row(
+    monkeypatch,
+) -> None:
+    model = _schema_model()
+    assembler_type = type(model._assembler)
+    checks: list[dict[str, object]] = []
+    check_keys = assembler_type._check_keys
+
+    def counting_check(self, features, width):
+        checks.append(features)
+        return check_keys(self, features, width)
+
+    monkeypatch.setattr(assembler_type, "_check_keys", counting_check)
+
+    exact = {"bp": 0.5, "age": 1.0, "bmi": 2.0}
+    assert model.vector_from_named_features(exact) == [1.0, 2.0, 0.5]
+    assert checks == []
+
+    assert model.vector_from_named_features({"age": 1.0, "bp": 0.5}) == [
+        1.0,
+        1.5,
+        0.5,
+    ]
+    assert len(checks) == 1
+
+
+def test_schema_width_mismatch_is_reported_even_for_exact_keys() -> None:
+    model = LinearModel(
+        model_id="broken_v2",
+        type="linear",
+        bias=0.0,
+        weights=[1.0, 2.0],
+        feature_names=["age"],
+    )
+
+    with pytest.raises(ValueError, match="does not match model weight dimensions"):
+        model.vector_from_named_features({"age": 1.0})
+
+
+def test_empty_required_set_requires_every_feature() -> None:
+    model = LinearModel(
+        model_id="schema_v2",
+        type="linear",
+        bias=0.0,
+        weights=[1.0, 1.0],
+        feature_names=["a", "b"],
+        required_names=set(),
+        defaults={"b": 2.0},
+    )
+
+    assert model.vector_from_named_features({"a": 1.0, "b": 0.0}) == [1.0, 0.0]
+    with pytest.raises(ValueError, match="Missing required feature keys: b"):
+        model.vector_from_named_features({"a": 1.0})
+    with pytest.raises(ValueError, match=r"rows\[0\]: Missing required"):
+        model.predict_named_batch([{"a": 1.0}])
@@ -0,0 +1,133 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from evidence_helpers import make_chunk
+
+from caseflow.core.settings import clear_settings_cache
+from caseflow.domain.mortgage.evidence import EvidenceChunk
+from caseflow.ml.ann import IvfFlatIndex, recall_at_k
+from caseflow.ml.vector_store import FileVectorStore
+
+_WORDS = ["income", "paystub", "appraisal", "liabilities", "escrow", "title"]
+
+
+@pytest.fixture(autouse=True)
+def _reset_settings_cache():
+    yield
+    clear_settings_cache()
+
+
+def _chunks() -> list[EvidenceChunk]:
+    rng = np.random.default_rng(3)
+    chunks = []
+    for case_index in range(6):
+        case_id = f"case_{case_index}"
+        for chunk_index in range(20):
+            text = " ".join(rng.choice(_WORDS, size=5))
+            chunks.append(
+                make_chunk(
+                    case_id, f"doc_{chunk_index % 3}", f"{case_id}_{chunk_index}", text
+                )
+            )
+    return chunks
+
+
+def _ids(store: FileVectorStore, query: str, **kwargs) -> list[tuple[str, float]]:
+    return [
+        (item.chunk.chunk_id, round(item.score, 6))
+        for item in store.search(query, top_k=10, **kwargs)
+    ]
+
+
+def test_exact_search_is_the_default(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.delenv("EVIDENCE_ANN_MODE", raising=False)
+    clear_settings_cache()
+    assert FileVectorStore(index_file=tmp_path / "index.json")._ann_mode == "exact"
+
+    with pytest.raises(ValueError):
+        FileVectorStore(index_file=tmp_path / "index.json", ann_mode="hnsw")
+
+
+def test_ivf_probing_every_list_matches_exact(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("EVIDENCE_ANN_NLIST", "4")
+    monkeypatch.setenv("EVIDENCE_ANN_NPROBE", "4")
+    clear_settings_cache()
+
+    exact = FileVectorStore(index_file=tmp_path / "index.json", ann_mode="exact")
+    exact.add_documents(_chunks())
+    ivf = FileVectorStore(index_file=tmp_path / "index.json", ann_mode="ivf")
+
+    for query in ["income paystub", "escrow title", "appraisal"]:
+        assert _ids(ivf, query) == _ids(exact, query)
+        assert _ids(ivf, query, min_score=0.5) == _ids(exact, query, min_score=0.5)
+
+    # Case-scoped search never goes through the IVF lists.
+    assert _ids(ivf, "income", case_id="case_2") == _ids(
+        exact, "income", case_id="case_2"
+    )
+
+
+def test_ivf_view_is_rebuilt_after_writes(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("EVIDENCE_ANN_NPROBE", "64")
+    clear_settings_cache()
+
+    store = FileVectorStore(index_file=tmp_path / "index.json", ann_mode="ivf")
+    store.add_documents(_chunks()[:10])
+    assert len(store.search("income", top_k=50)) == 10
+
+    store.add_documents(_chunks()[10:30])
+    assert len(store.search("income", top_k=50)) == 30
+
+    store.delete_case("case_0")
+    assert {item.chunk.case_id for item in store.search("income", top_k=50)} == {
+        "case_1"
+    }
+
+
+def test_ivf_candidates_cover_probed_lists() -> None:
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(200, 16)).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    index = IvfFlatIndex.build(matrix, nlist=8)
+    assert index.nlist == 8
+    assert index.list_offsets[-1] == 200
+    assert np.array_equal(index.candidates(matrix[0], nprobe=8), np.arange(200))
+    assert 0 in index.candidates(matrix[0], nprobe=1)
+
+    assert recall_at_k([["a", "b"]], [["b", "c"]]) == 0.5
+    assert recall_at_k([[]], [[]]) == 1.0
+
+
+def test_ivf_view_reuses_centroids_until_enough_rows_change(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("EVIDENCE_ANN_NLIST", "4")
+    monkeypatch.setenv("EVIDENCE_ANN_NPROBE", "4")
+    clear_settings_cache()
+
+    exact = FileVectorStore(index_file=tmp_path / "index.json", ann_mode="exact")
+    ivf = FileVectorStore(index_file=tmp_path / "index.json", ann_mode="ivf")
+    chunks = _chunks()
+    exact.add_documents(chunks[:100])
+    ivf.search("income", top_k=10)
+    first = ivf._portfolio_view()
+
+    # A small write places the new rows on the trained centroids and keeps
+    # every untouched case as it was.
+    exact.add_documents(chunks[100:110])
+    second = ivf._portfolio_view()
+    assert second.ivf.centroids is first.ivf.centroids
+    assert second.untrained_rows == 10
+    assert second.assignments[:80].tolist() == first.assignments[:80].tolist()
+    assert _ids(ivf, "escrow title") == _ids(exact, "escrow title")
+
+    # Past the retrain fraction the centroids are trained again.
+    exact.add_documents(chunks[110:])
+    exact.delete_case("case_0")
+    exact.add_documents(chunks[:20])
+    third = ivf._portfolio_view()
+    assert third.ivf.centroids is not first.ivf.centroids
+    assert third.untrained_rows == 0
+    assert _ids(ivf, "appraisal") == _ids(exact, "appraisal")
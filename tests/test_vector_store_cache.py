@@ -0,0 +1,111 @@
+import multiprocessing
+from pathlib import Path
+
+import pytest
+from evidence_helpers import make_chunk
+
+from caseflow.core.metrics import clear_metrics, render_metrics_text
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml.vector_store import FileVectorStore
+
+
+@pytest.fixture(autouse=True)
+def _reset_settings_cache():
+    yield
+    clear_settings_cache()
+
+
+def _metric(name: str) -> float:
+    for line in render_metrics_text().splitlines():
+        if line.startswith(name + " "):
+            return float(line.split()[1])
+    return 0.0
+
+
+def _compact_as_int8(index_file: str) -> None:
+    FileVectorStore(index_file=Path(index_file), storage="int8").compact("case_1")
+
+
+def _reset(monkeypatch, result_cache_size: str) -> None:
+    monkeypatch.setenv("EVIDENCE_RESULT_CACHE_SIZE", result_cache_size)
+    clear_settings_cache()
+    clear_metrics()
+    FileVectorStore._QUERY_CACHE.clear()
+    FileVectorStore._RESULT_CACHE.clear()
+
+
+def test_query_vectors_are_cached_per_dims(monkeypatch, tmp_path: Path) -> None:
+    _reset(monkeypatch, "0")
+    store = FileVectorStore(index_file=tmp_path / "index.json", dims=16)
+    store.add_documents([make_chunk("case_1", "doc_a", "c1", "income verified")])
+
+    first = store.search("income", case_id="case_1")
+    assert store.search("income", case_id="case_1") == first
+    FileVectorStore(index_file=tmp_path / "other" / "index.json", dims=32).search(
+        "income"
+    )
+
+    assert _metric("evidence_query_cache_hits_total") == 1.0
+    assert _metric("evidence_query_cache_misses_total") == 2.0
+    assert _metric("evidence_result_cache_hits_total") == 0.0
+
+
+def test_result_cache_is_invalidated_by_writes(monkeypatch, tmp_path: Path) -> None:
+    _reset(monkeypatch, "8")
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents([make_chunk("case_1", "doc_a", "c1", "income verified")])
+
+    first = store.search("income", top_k=5, case_id="case_1")
+    assert store.search("income", top_k=5, case_id="case_1") == first
+    assert _metric("evidence_result_cache_hits_total") == 1.0
+    assert _metric("evidence_result_cache_hit_ratio") == 0.5
+
+    store.add_documents([make_chunk("case_1", "doc_b", "c2", "income and liabilities")])
+    assert len(store.search("income", top_k=5, case_id="case_1")) == 2
+
+    store.delete_case("case_1")
+    store.add_documents([make_chunk("case_1", "doc_c", "c3", "income statement")])
+    results = store.search("income", top_k=5, case_id="case_1")
+    assert [item.chunk.chunk_id for item in results] == ["c3"]
+    assert _metric("evidence_result_cache_hits_total") == 1.0
+
+
+def test_result_cache_sees_writes_from_other_store_instances(
+    monkeypatch, tmp_path: Path
+) -> None:
+    _reset(monkeypatch, "8")
+    reader = FileVectorStore(index_file=tmp_path / "index.json")
+    writer = FileVectorStore(index_file=tmp_path / "index.json")
+    writer.add_documents([make_chunk("case_1", "doc_a", "c1", "income verified")])
+    assert len(reader.search("income", top_k=5)) == 1
+
+    writer.add_documents([make_chunk("case_2", "doc_a", "c2", "income verified")])
+    assert len(reader.search("income", top_k=5)) == 2
+
+
+def test_result_cache_follows_compaction_by_another_process(
+    monkeypatch, tmp_path: Path
+) -> None:
+    _reset(monkeypatch, "8")
+    index_file = tmp_path / "index.json"
+    store = FileVectorStore(index_file=index_file)
+    store.add_documents(
+        [
+            make_chunk(
+                "case_1", "doc_a", "c1", "income income verified by payroll records"
+            ),
+            make_chunk("case_1", "doc_b", "c2", "income and liabilities summary"),
+        ]
+    )
+    before = store.search("income payroll", top_k=5, case_id="case_1")
+
+    process = multiprocessing.get_context("spawn").Process(
+        target=_compact_as_int8, args=(str(index_file),)
+    )
+    process.start()
+    process.join(timeout=60)
+    assert process.exitcode == 0
+
+    after = store.search("income payroll", top_k=5, case_id="case_1")
+    assert after == store._search_uncached("income payroll", 5, "case_1", None)
+    assert after != before
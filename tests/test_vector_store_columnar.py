@@ -0,0 +1,127 @@
+import json
+from pathlib import Path
+
+from evidence_helpers import make_chunk
+
+from caseflow.domain.mortgage.evidence import EvidenceChunk
+from caseflow.ml.embeddings import embed_text
+from caseflow.ml.vector_store import FileVectorStore
+
+
+def _reference_order(
+    chunks: list[EvidenceChunk], query: str, case_id: str
+) -> list[tuple[str, str]]:
+    query_vector = embed_text(query)
+    scored = []
+    for chunk in chunks:
+        if chunk.case_id != case_id:
+            continue
+        vector = embed_text(chunk.text)
+        score = sum(left * right for left, right in zip(query_vector, vector))
+        scored.append((-score, chunk.document_id, chunk.chunk_id))
+    scored.sort()
+    return [(document_id, chunk_id) for _, document_id, chunk_id in scored]
+
+
+def test_columnar_search_matches_reference_ordering_with_ties(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    chunks = [
+        make_chunk("case_1", "doc_b", "c2", "income verified by paystub"),
+        make_chunk("case_1", "doc_a", "c9", "income verified by paystub"),
+        make_chunk("case_1", "doc_a", "c1", "income verified by paystub"),
+        make_chunk("case_1", "doc_c", "c3", "appraisal shows stable property value"),
+        make_chunk("case_1", "doc_d", "c4", "monthly income and monthly debt summary"),
+        make_chunk("case_2", "doc_a", "c5", "income verified by paystub"),
+    ]
+    store.add_documents(chunks)
+
+    expected = _reference_order(chunks, "income paystub", "case_1")
+    for top_k in range(1, 6):
+        results = store.search("income paystub", top_k=top_k, case_id="case_1")
+        assert [
+            (item.chunk.document_id, item.chunk.chunk_id) for item in results
+        ] == expected[:top_k]
+
+    tied = store.search("income paystub", top_k=2, case_id="case_1")
+    assert [item.chunk.chunk_id for item in tied] == ["c1", "c9"]
+    assert tied[0].score == tied[1].score
+
+
+def test_scores_equal_up_to_rounding_fall_back_to_id_order(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    # Both cosines are sqrt(3/5); with a few more rows in the matrix product
+    # their float32 scores come out one ulp apart.
+    store.add_documents(
+        [
+            make_chunk("case_1", "doc_d", "c1", "w1 w22 w22"),
+            make_chunk("case_1", "doc_b", "c2", "w1 w51 w51"),
+            make_chunk("case_1", "doc_z", "c3", "w2 w3 w4 w5"),
+            make_chunk("case_1", "doc_z", "c4", "w3 w4 w5 w6"),
+        ]
+    )
+
+    for case_id in ("case_1", None):
+        results = store.search("w1 w23 w22", top_k=2, case_id=case_id)
+        assert [item.chunk.document_id for item in results] == ["doc_b", "doc_d"]
+        assert abs(results[0].score - results[1].score) < 1e-6
+
+
+def test_columnar_search_applies_min_score_and_case_filter(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents(
+        [
+            make_chunk("case_1", "doc_a", "c1", "income verified"),
+            make_chunk("case_1", "doc_b", "c2", "collateral appraisal notes"),
+            make_chunk("case_2", "doc_c", "c3", "income verified"),
+        ]
+    )
+
+    results = store.search("income", top_k=5, case_id="case_1", min_score=0.1)
+    assert [item.chunk.chunk_id for item in results] == ["c1"]
+    assert results[0].chunk.case_id == "case_1"
+    assert isinstance(results[0].score, float)
+
+    everywhere = store.search("income", top_k=5, min_score=0.1)
+    assert [item.chunk.chunk_id for item in everywhere] == ["c1", "c3"]
+
+
+def test_columnar_index_skips_records_with_mismatched_dims(tmp_path: Path) -> None:
+    index_file = tmp_path / "index.json"
+    records = [
+        {
+            "case_id": "case_1",
+            "document_id": "doc_a",
+            "chunk_id": "good",
+            "text": "income",
+            "start_char": 0,
+            "end_char": 6,
+            "source": "provenance",
+            "page": 2,
+            "embedding": embed_text("income", dims=8),
+        },
+        {
+            "case_id": "case_1",
+            "document_id": "doc_a",
+            "chunk_id": "short",
+            "text": "income",
+            "start_char": 0,
+            "end_char": 6,
+            "source": "provenance",
+            "page": None,
+            "embedding": embed_text("income", dims=4),
+        },
+        {
+            "case_id": "case_1",
+            "document_id": "doc_a",
+            "chunk_id": "garbage",
+            "text": "income",
+            "embedding": ["x"] * 8,
+        },
+    ]
+    index_file.write_text(json.dumps(records), encoding="utf-8")
+
+    results = FileVectorStore(index_file=index_file, dims=8).search(
+        "income", top_k=5, case_id="case_1"
+    )
+    assert [item.chunk.chunk_id for item in results] == ["good"]
+    assert results[0].chunk.page == 2
@@ -0,0 +1,111 @@
+import multiprocessing
+from pathlib import Path
+
+from evidence_helpers import make_chunk
+
+from caseflow.ml.vector_store import FileVectorStore
+
+
+def _write_rounds(index_file: str, rounds: int) -> None:
+    store = FileVectorStore(index_file=Path(index_file))
+    for round_id in range(rounds):
+        store.add_documents(
+            [
+                make_chunk(
+                    "case_1", f"doc_{round_id}", "c1", "income verified payroll"
+                ),
+                make_chunk("case_2", f"doc_{round_id}", "c1", "liabilities summary"),
+            ]
+        )
+        if round_id % 5 == 4:
+            store.compact()
+
+
+def _read_case(index_file: str, commands, results) -> None:
+    store = FileVectorStore(index_file=Path(index_file))
+    while commands.get() == "read":
+        results.put(
+            (
+                store.wal_bytes("case_1"),
+                [chunk.text for chunk in store.case_chunks("case_1")],
+            )
+        )
+
+
+def test_readers_never_see_torn_writes_from_another_process(tmp_path: Path) -> None:
+    index_file = tmp_path / "index.json"
+    FileVectorStore(index_file=index_file).add_documents(
+        [make_chunk("case_1", "seed", "c1", "income verified payroll")]
+    )
+
+    context = multiprocessing.get_context("spawn")
+    writer = context.Process(target=_write_rounds, args=(str(index_file), 40))
+    writer.start()
+    reader = FileVectorStore(index_file=index_file)
+    seen = 0
+    while writer.is_alive() or seen == 0:
+        results = reader.search("income payroll", top_k=50, case_id="case_1")
+        assert results
+        assert all(item.chunk.case_id == "case_1" for item in results)
+        reader.search("liabilities", top_k=5)
+        seen += 1
+    writer.join(timeout=30)
+
+    assert writer.exitcode == 0
+    assert reader.case_stats("case_1")["num_chunks"] == 41
+
+
+def test_reader_process_drops_a_case_deleted_and_recreated_elsewhere(
+    tmp_path: Path,
+) -> None:
+    index_file = tmp_path / "index.json"
+    store = FileVectorStore(index_file=index_file)
+    store.add_documents([make_chunk("case_1", "doc_a", "c1", "bravo income")])
+
+    context = multiprocessing.get_context("spawn")
+    commands, results = context.Queue(), context.Queue()
+    reader = context.Process(
+        target=_read_case, args=(str(index_file), commands, results)
+    )
+    reader.start()
+    try:
+        commands.put("read")
+        first_bytes, first = results.get(timeout=60)
+
+        # Same shard, generation and WAL size as before the delete.
+        store.delete_case("case_1")
+        store.add_documents([make_chunk("case_1", "doc_a", "c1", "omega income")])
+        commands.put("read")
+        second_bytes, second = results.get(timeout=60)
+    finally:
+        commands.put("stop")
+        reader.join(timeout=30)
+        if reader.is_alive():
+            reader.kill()
+
+    assert first == ["bravo income"]
+    assert second_bytes == first_bytes
+    assert second == ["omega income"]
+
+
+def test_stale_manifest_snapshot_follows_compaction(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents([make_chunk("case_1", "doc_a", "c1", "income verified")])
+    store.compact()
+    store.add_documents([make_chunk("case_1", "doc_b", "c1", "liabilities summary")])
+    stale = dict(store._load_manifest())
+
+    store.compact()
+    FileVectorStore._INDEX_CACHE.clear()
+
+    assert len(store._load_case_index("case_1", stale)) == 2
+
+
+def test_writer_lock_is_reentrant(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents([make_chunk("case_1", "doc_a", "c1", "income verified")])
+
+    with store.writer_lock():
+        assert store.write_case_batches("case_1", [[]], overwrite=True) == 0
+
+    assert store.list_case_ids() == []
@@ -0,0 +1,97 @@
+import json
+from pathlib import Path
+
+import pytest
+from evidence_helpers import make_chunk
+
+from caseflow.ml import evidence_indexer
+from caseflow.ml.embeddings import EMBEDDER_VERSION
+from caseflow.ml.evidence_indexer import reembed_index
+from caseflow.ml.vector_store import FileVectorStore
+
+
+def _seed(root: Path, dims: int) -> FileVectorStore:
+    store = FileVectorStore(index_file=root / "index.json", dims=dims)
+    store.write_case_batches(
+        "case_1",
+        [
+            [
+                make_chunk("case_1", "doc_a", "c1", "income verified by paystub"),
+                make_chunk("case_1", "doc_b", "c2", "appraisal came in above contract"),
+            ]
+        ],
+        fingerprints={"doc_a": "fp-a", "doc_b": "fp-b"},
+    )
+    store.add_documents(
+        [make_chunk("case_2", "doc_c", "c3", "liabilities include an auto loan")]
+    )
+    return store
+
+
+def test_manifest_header_records_dims_and_embedder(tmp_path: Path) -> None:
+    store = _seed(tmp_path, dims=32)
+    manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+
+    assert manifest["dims"] == 32
+    assert manifest["embedder"] == EMBEDDER_VERSION
+    assert FileVectorStore.for_existing_index(tmp_path / "index.json").dims == 32
+    assert store.search("paystub", top_k=1, case_id="case_1")[0].chunk.chunk_id == "c1"
+
+
+def test_opening_an_index_with_other_dims_is_rejected(tmp_path: Path) -> None:
+    _seed(tmp_path, dims=32)
+    FileVectorStore._CACHE.clear()
+    FileVectorStore._INDEX_CACHE.clear()
+
+    with pytest.raises(ValueError, match="reembed"):
+        FileVectorStore(index_file=tmp_path / "index.json", dims=64).search(
+            "income", top_k=1, case_id="case_1"
+        )
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_reembed_index_copies_cases_at_new_dims(tmp_path: Path, workers: int) -> None:
+    source = _seed(tmp_path / "live", dims=32)
+    target = FileVectorStore(index_file=tmp_path / "next" / "index.json", dims=64)
+
+    written = reembed_index(source=source, target=target, workers=workers, batch_size=1)
+
+    assert written == 3
+    assert sorted(target.list_case_ids()) == ["case_1", "case_2"]
+    assert target.document_fingerprints("case_1") == {"doc_a": "fp-a", "doc_b": "fp-b"}
+    hit = target.search("paystub", top_k=1, case_id="case_1")[0]
+    assert hit.chunk.chunk_id == "c1"
+    assert (
+        FileVectorStore.for_existing_index(tmp_path / "next" / "index.json").dims == 64
+    )
+    assert source.search("paystub", top_k=1, case_id="case_1")[0].chunk.chunk_id == "c1"
+
+
+def test_reembed_index_refuses_to_overwrite_its_source(tmp_path: Path) -> None:
+    source = _seed(tmp_path, dims=32)
+
+    with pytest.raises(ValueError, match="different index directory"):
+        reembed_index(source=source, target=source)
+
+
+def test_reembed_index_recopies_a_case_written_during_the_copy(
+    monkeypatch, tmp_path: Path
+) -> None:
+    source = _seed(tmp_path, dims=32)
+    target = FileVectorStore(index_file=tmp_path / "next" / "index.json", dims=64)
+    copy_rows = evidence_indexer.reembed_rows
+    writes = iter(["paystub reissued by employer"])
+
+    def write_between_slices(*args):
+        batch = copy_rows(*args)
+        for text in writes:
+            source.add_documents([make_chunk("case_1", "doc_a", "c0", text)])
+        return batch
+
+    monkeypatch.setattr(evidence_indexer, "reembed_rows", write_between_slices)
+    written = reembed_index(source=source, target=target, batch_size=1)
+
+    assert written == 4
+    assert [chunk.text for chunk in target.case_chunks("case_1")] == [
+        chunk.text for chunk in source.case_chunks("case_1")
+    ]
@@ -0,0 +1,149 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from evidence_helpers import make_chunk
+
+from caseflow.ml import lexical
+from caseflow.ml.lexical import Bm25Index, Bm25Runs, query_terms, reciprocal_rank_fusion
+from caseflow.ml.vector_store import FileVectorStore
+
+_FILLER = "borrower file notes reviewed by processing team during intake"
+
+
+def test_bm25_prefers_rare_terms_and_shorter_documents() -> None:
+    index = Bm25Index.build(
+        [
+            "escrow escrow payment",
+            "escrow payment schedule with many other unrelated words here",
+            "payment payment payment",
+            "",
+        ]
+    )
+
+    scores = index.scores("escrow")
+
+    assert scores[0] > scores[1] > 0
+    assert scores[2] == scores[3] == 0
+    assert index.scores("unknownterm").sum() == 0
+    assert len(Bm25Index.build([]).scores("escrow")) == 0
+
+
+def test_bm25_runs_score_like_one_index_over_the_same_rows() -> None:
+    texts = [f"escrow {'payment ' * (item % 3)}notes {item}" for item in range(23)]
+    runs = Bm25Runs()
+    for start in range(0, len(texts), 4):
+        runs = runs.append(Bm25Runs.build(texts[start : start + 4]))
+
+    assert 1 < len(runs.runs) <= 4
+    np.testing.assert_allclose(
+        runs.scores("escrow payment"),
+        Bm25Index.build(texts).scores("escrow payment"),
+        rtol=1e-6,
+    )
+    rows = np.array([20, 3, 7, 11])
+    np.testing.assert_allclose(
+        runs.take(rows).scores("payment notes"),
+        Bm25Index.build([texts[row] for row in rows]).scores("payment notes"),
+        rtol=1e-6,
+    )
+
+
+def test_summed_stats_score_indexes_as_one_corpus() -> None:
+    first = ["escrow escrow shortage", "escrow notes", "escrow review"]
+    second = ["escrow shortage", "title notes", "appraisal", "income"]
+    terms = query_terms("escrow shortage")
+    stats = Bm25Runs.build(first).stats(terms) + Bm25Runs.build(second).stats(terms)
+
+    scores = np.concatenate(
+        [
+            Bm25Runs.build(first).scores("escrow shortage", stats=stats),
+            Bm25Runs.build(second).scores("escrow shortage", stats=stats),
+        ]
+    )
+
+    np.testing.assert_allclose(
+        scores, Bm25Index.build(first + second).scores("escrow shortage"), rtol=1e-6
+    )
+    # Scored on its own, "escrow" is nearly free in the first case.
+    assert Bm25Runs.build(first).scores("escrow shortage")[0] < scores[0]
+
+
+def test_reciprocal_rank_fusion_rewards_agreement() -> None:
+    fused = reciprocal_rank_fusion([np.array([0, 1, 2]), np.array([1, 3])], 4)
+
+    assert np.argmax(fused) == 1
+    assert fused[2] > 0 and fused[3] > 0
+
+
+def test_unknown_search_mode_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        FileVectorStore(index_file=tmp_path / "index.json", search_mode="bm25")
+
+
+def test_hybrid_search_rescues_lexical_matches_below_min_score(
+    tmp_path: Path,
+) -> None:
+    chunks = [
+        make_chunk("case_1", "doc_a", "target", f"{_FILLER} {_FILLER} escrow shortage"),
+        *[
+            make_chunk("case_1", "doc_a", f"filler_{item}", f"{_FILLER} item {item}")
+            for item in range(8)
+        ],
+        make_chunk("case_2", "doc_a", "other", "escrow shortage escrow shortage"),
+    ]
+    vector = FileVectorStore(index_file=tmp_path / "index.json")
+    vector.add_documents(chunks)
+    hybrid = FileVectorStore(index_file=tmp_path / "index.json", search_mode="hybrid")
+
+    cosine = next(
+        item.score
+        for item in vector.search("escrow shortage", top_k=20, case_id="case_1")
+        if item.chunk.chunk_id == "target"
+    )
+    threshold = cosine + 0.01
+    vector_hits = vector.search(
+        "escrow shortage", top_k=5, case_id="case_1", min_score=threshold
+    )
+    hybrid_hits = hybrid.search(
+        "escrow shortage", top_k=5, case_id="case_1", min_score=threshold
+    )
+
+    assert "target" not in [item.chunk.chunk_id for item in vector_hits]
+    assert hybrid_hits[0].chunk.chunk_id == "target"
+    assert all(item.chunk.case_id == "case_1" for item in hybrid_hits)
+    assert [item.chunk.chunk_id for item in hybrid.search("escrow", top_k=2)] == [
+        "other",
+        "target",
+    ]
+
+
+def test_hybrid_search_reads_persisted_postings_and_tokenizes_only_appends(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    chunks = [
+        make_chunk("case_1", "doc_a", f"c{item}", f"{_FILLER} item {item}")
+        for item in range(6)
+    ]
+    writer = FileVectorStore(index_file=tmp_path / "index.json", search_mode="hybrid")
+    writer.add_documents(chunks)
+    writer.compact()
+    FileVectorStore._INDEX_CACHE.clear()
+    FileVectorStore._LEXICAL_CACHE.clear()
+
+    tokenized: list[str] = []
+    tokenize = lexical.tokenize
+
+    def recording_tokenize(text: str) -> list[str]:
+        tokenized.append(text)
+        return tokenize(text)
+
+    monkeypatch.setattr(lexical, "tokenize", recording_tokenize)
+    store = FileVectorStore(index_file=tmp_path / "index.json", search_mode="hybrid")
+    assert store.search("item 4", top_k=1)[0].chunk.chunk_id == "c4"
+    assert tokenized == ["item 4"]
+
+    tokenized.clear()
+    store.add_documents([make_chunk("case_1", "doc_b", "new", "escrow shortage")])
+    assert store.search("escrow", top_k=1)[0].chunk.chunk_id == "new"
+    assert tokenized == ["escrow shortage", "escrow"]
@@ -0,0 +1,188 @@
+import json
+from pathlib import Path
+
+from evidence_helpers import make_chunk, read_manifest, write_manifest
+
+from caseflow.ml import vector_store
+from caseflow.ml.embeddings import embed_text
+from caseflow.ml.vector_store import FileVectorStore
+
+
+def test_case_writes_only_touch_their_own_shard(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents(
+        [
+            make_chunk("case_1", "doc_a", "c1", "income verified"),
+            make_chunk("case_2", "doc_b", "c2", "appraisal notes"),
+        ]
+    )
+    store.compact()
+
+    cases = read_manifest(tmp_path)["cases"]
+    assert set(cases) == {"case_1", "case_2"}
+    assert cases["case_1"]["num_chunks"] == 1
+    shard_2 = (
+        tmp_path
+        / "cases"
+        / cases["case_2"]["shard"]
+        / f"seg-{cases['case_2']['segment']:08d}.f32"
+    )
+    before = shard_2.read_bytes()
+    before_mtime = shard_2.stat().st_mtime_ns
+
+    store.overwrite_case(
+        "case_1",
+        [
+            make_chunk("case_1", "doc_a", "c1", "income verified again"),
+            make_chunk("case_1", "doc_a", "c3", "liabilities summary"),
+        ],
+    )
+
+    assert shard_2.read_bytes() == before
+    assert shard_2.stat().st_mtime_ns == before_mtime
+    assert read_manifest(tmp_path)["cases"]["case_1"]["num_chunks"] == 2
+    assert store.case_stats("case_1")["num_chunks"] == 2
+    assert store.case_stats("case_2")["num_chunks"] == 1
+
+    results = store.search("income", top_k=5, min_score=0.1)
+    assert {item.chunk.case_id for item in results} == {"case_1"}
+
+    assert store.delete_case("case_2") == 1
+    assert not shard_2.exists()
+    assert set(read_manifest(tmp_path)["cases"]) == {"case_1"}
+    assert store.case_stats("case_2")["updated_at"] is None
+
+
+def test_monolithic_index_is_migrated_once(tmp_path: Path) -> None:
+    legacy = tmp_path / "index.json"
+    legacy.write_text(
+        json.dumps(
+            [
+                {
+                    "case_id": case_id,
+                    "document_id": "doc_a",
+                    "chunk_id": chunk_id,
+                    "text": "income verified",
+                    "start_char": 0,
+                    "end_char": 15,
+                    "source": "provenance",
+                    "page": None,
+                    "embedding": embed_text("income verified"),
+                }
+                for case_id, chunk_id in [("case_1", "c1"), ("case_2", "c2")]
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    store = FileVectorStore(index_file=legacy)
+    assert store.migrate_monolithic_index() == 2
+    assert not legacy.exists()
+    assert (tmp_path / "index.json.migrated").is_file()
+    assert store.list_case_ids() == ["case_1", "case_2"]
+    assert store.migrate_monolithic_index() == 0
+
+    results = store.search("income", top_k=5, case_id="case_2")
+    assert [item.chunk.chunk_id for item in results] == ["c2"]
+
+
+def test_overwrite_case_rejects_chunks_from_other_cases(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+
+    try:
+        store.overwrite_case("case_1", [make_chunk("case_2", "doc_a", "c1", "income")])
+        assert False, "Expected ValueError for foreign chunks"
+    except ValueError as exc:
+        assert "case_2" in str(exc)
+
+
+def test_case_stats_come_from_the_manifest_summary(monkeypatch, tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents(
+        [
+            make_chunk("case_1", "doc_a", "c1", "income verified"),
+            make_chunk("case_1", "doc_a", "c2", "payroll statement"),
+            make_chunk("case_1", "doc_b", "c1", "appraisal notes"),
+        ]
+    )
+    store.add_documents([make_chunk("case_1", "doc_a", "c2", "payroll updated")])
+    store.write_case_batches("case_1", [], replace_documents=["doc_b"])
+    store.compact()
+    store.add_documents([make_chunk("case_1", "doc_c", "c1", "title report")])
+    assert read_manifest(tmp_path)["cases"]["case_1"]["documents"] == {
+        "doc_a": 2,
+        "doc_c": 1,
+    }
+
+    def no_scans(*args, **kwargs):
+        raise AssertionError("case stats must not load the case index")
+
+    monkeypatch.setattr(FileVectorStore, "_load_case_index", no_scans)
+    stats = store.case_stats("case_1")
+    assert stats["num_chunks"] == 3
+    assert stats["documents"] == [
+        {"document_id": "doc_a", "num_chunks": 2},
+        {"document_id": "doc_c", "num_chunks": 1},
+    ]
+    assert store.case_stats("missing")["num_chunks"] == 0
+    monkeypatch.undo()
+
+    manifest = read_manifest(tmp_path)
+    del manifest["cases"]["case_1"]["documents"]
+    write_manifest(tmp_path, manifest)
+    assert store.case_stats("case_1")["num_chunks"] == 3
+    assert store.delete_case("case_1") == 3
+
+
+def test_commits_append_only_the_cases_they_change(monkeypatch, tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json", dims=16)
+    store.add_documents(
+        [
+            make_chunk(f"case_{n:02d}", "doc_a", "c1", "income verified")
+            for n in range(30)
+        ]
+    )
+    manifest_path = tmp_path / "manifest.json"
+    journal = tmp_path / json.loads(manifest_path.read_text("utf-8"))["journal"]
+    checkpoint = manifest_path.stat()
+
+    sizes = []
+    for n in (0, 29):
+        before = journal.stat().st_size
+        store.add_documents([make_chunk(f"case_{n:02d}", "doc_b", "c2", "title")])
+        sizes.append(journal.stat().st_size - before)
+        last = journal.read_bytes().splitlines()[-1]
+        assert set(json.loads(last)["cases"]) == {f"case_{n:02d}"}
+
+    assert manifest_path.stat().st_ino == checkpoint.st_ino
+    assert max(sizes) < checkpoint.st_size / 10
+    assert read_manifest(tmp_path)["cases"]["case_29"]["documents"] == {
+        "doc_a": 1,
+        "doc_b": 1,
+    }
+
+    # A torn append is invisible to readers and dropped by the next writer.
+    with journal.open("ab") as handle:
+        handle.write(b'{"revision": 999, "cases": {"case_00": nu')
+    FileVectorStore._CACHE.clear()
+    assert store.list_case_ids() == [f"case_{n:02d}" for n in range(30)]
+    assert store.delete_case("case_05") == 1
+    assert len(store.list_case_ids()) == 29
+    assert all(json.loads(line) for line in journal.read_bytes().splitlines())
+
+    # Once the journal outgrows the manifest, the manifest is rewritten with
+    # a fresh journal.
+    monkeypatch.setattr(vector_store, "_JOURNAL_CHECKPOINT_BYTES", 0)
+    for n in range(200):
+        store.add_documents([make_chunk("case_01", "doc_c", f"c{n}", "appraisal")])
+        if not journal.exists():
+            break
+
+    assert not journal.exists()
+    rewritten = json.loads(manifest_path.read_text("utf-8"))
+    assert rewritten["journal"] != journal.name
+    assert rewritten["cases"]["case_01"]["num_chunks"] == n + 2
+    FileVectorStore._CACHE.clear()
+    cold = FileVectorStore(index_file=tmp_path / "index.json", dims=16)
+    assert cold.list_case_ids() == store.list_case_ids()
+    assert cold.case_stats("case_01")["num_chunks"] == n + 2
@@ -0,0 +1,145 @@
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pytest
+from evidence_helpers import make_chunk, read_manifest
+
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml.quantization import dequantize, quantize, quantized_scores
+from caseflow.ml.vector_store import FileVectorStore
+
+CHUNKS = [
+    make_chunk("case_1", "doc_a", "c1", "income verified by paystub"),
+    make_chunk("case_1", "doc_a", "c2", "borrower employment letter"),
+    make_chunk("case_1", "doc_b", "c3", "appraisal came in above contract"),
+    make_chunk("case_1", "doc_b", "c4", "liabilities include an auto loan"),
+]
+
+
+def _reset_caches() -> None:
+    FileVectorStore._CACHE.clear()
+    FileVectorStore._INDEX_CACHE.clear()
+
+
+def test_int8_round_trip_keeps_per_row_scale() -> None:
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(6, 16)).astype(np.float32)
+    embeddings[2] *= 100.0
+    embeddings[4] = 0.0
+
+    codes, scales = quantize(embeddings, "int8")
+
+    assert codes.dtype == np.int8 and scales is not None
+    assert np.abs(codes).max(axis=1)[[0, 1, 2, 3, 5]].tolist() == [127] * 5
+    assert scales[4] == 0.0 and not codes[4].any()
+    restored = dequantize(codes, scales)
+    assert np.all(np.abs(restored - embeddings) <= scales[:, None] / 2 + 1e-6)
+
+    query = rng.normal(size=16).astype(np.float32)
+    np.testing.assert_allclose(
+        quantized_scores(codes, scales, query), restored @ query, rtol=1e-5, atol=1e-5
+    )
+
+
+@pytest.mark.parametrize("storage, suffix", [("float16", ".f16"), ("int8", ".i8")])
+def test_quantized_segments_track_float32_scores(
+    tmp_path: Path, storage: str, suffix: str
+) -> None:
+    exact = FileVectorStore(index_file=tmp_path / "f32" / "index.json")
+    exact.add_documents(CHUNKS)
+    exact.compact()
+    store = FileVectorStore(
+        index_file=tmp_path / storage / "index.json", storage=storage
+    )
+    store.add_documents(CHUNKS)
+    before_compaction = store.search("income paystub", top_k=4, case_id="case_1")
+    store.compact()
+
+    entry = read_manifest(tmp_path / storage)["cases"]["case_1"]
+    stem = tmp_path / storage / "cases" / entry["shard"] / f"seg-{entry['segment']:08d}"
+    assert stem.with_suffix(suffix).is_file()
+    assert not stem.with_suffix(".f32").exists()
+    assert stem.with_suffix(".scale").is_file() == (storage == "int8")
+
+    _reset_caches()
+    expected = exact.search("income paystub", top_k=4, case_id="case_1")
+    actual = store.search("income paystub", top_k=4, case_id="case_1")
+    assert actual[0].chunk == expected[0].chunk
+    assert [r.score for r in actual] == pytest.approx(
+        [r.score for r in before_compaction]
+    )
+    by_chunk = {r.chunk.chunk_id: r.score for r in expected}
+    for result in actual:
+        assert result.score == pytest.approx(by_chunk[result.chunk.chunk_id], abs=0.02)
+
+
+def test_float32_segments_move_to_configured_storage_on_compaction(
+    tmp_path: Path,
+) -> None:
+    index_file = tmp_path / "index.json"
+    legacy = FileVectorStore(index_file=index_file)
+    legacy.add_documents(CHUNKS)
+    legacy.compact()
+    _reset_caches()
+
+    store = FileVectorStore(index_file=index_file, storage="int8")
+    assert (
+        store.search("appraisal", top_k=1, case_id="case_1")[0].chunk.chunk_id == "c3"
+    )
+    store.add_documents([make_chunk("case_1", "doc_c", "c5", "appraisal review memo")])
+    assert len(store.case_chunks("case_1")) == 5
+    store.compact()
+
+    shard_dir = next((tmp_path / "cases").iterdir())
+    assert sorted(path.suffix for path in shard_dir.glob("seg-*")) == [
+        ".bm25",
+        ".i8",
+        ".json",
+        ".scale",
+        ".txt",
+    ]
+    _reset_caches()
+    assert len(store.case_chunks("case_1")) == 5
+    assert store.search("appraisal", top_k=1, case_id="case_1")[0].chunk.chunk_id in {
+        "c3",
+        "c5",
+    }
+
+
+def test_quantized_scoring_never_upcasts_the_whole_matrix() -> None:
+    rng = np.random.default_rng(1)
+    embeddings = rng.normal(size=(40_000, 64)).astype(np.float32)
+    codes, scales = quantize(embeddings, "int8")
+    query = embeddings[0] / np.linalg.norm(embeddings[0])
+
+    tracemalloc.start()
+    scores = quantized_scores(codes, scales, query)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    np.testing.assert_allclose(scores, dequantize(codes, scales) @ query, atol=1e-5)
+    # A float32 copy of the codes would be 40_000 * 64 * 4 bytes.
+    assert peak < codes.size
+
+
+def test_ivf_view_keeps_the_configured_storage(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("EVIDENCE_ANN_NLIST", "2")
+    monkeypatch.setenv("EVIDENCE_ANN_NPROBE", "2")
+    clear_settings_cache()
+    store = FileVectorStore(index_file=tmp_path / "index.json", storage="int8")
+    store.add_documents(CHUNKS)
+    store.compact()
+    ivf = FileVectorStore(
+        index_file=tmp_path / "index.json", storage="int8", ann_mode="ivf"
+    )
+
+    results = ivf.search("income paystub", top_k=4)
+    view = ivf._portfolio_view()
+
+    clear_settings_cache()
+    assert view.embeddings.dtype == np.int8
+    assert view.scales is not None
+    assert [(r.chunk.chunk_id, r.score) for r in results] == [
+        (r.chunk.chunk_id, r.score) for r in store.search("income paystub", top_k=4)
+    ]
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+from evidence_helpers import make_chunk
+
 from caseflow.domain.mortgage.evidence import EvidenceChunk
 from caseflow.ml.vector_store import FileVectorStore
 
@@ -50,3 +52,39 @@ def test_vector_store_search_orders_results_deterministically(tmp_path: Path) ->
     assert [item.chunk.chunk_id for item in results] == [
         item.chunk.chunk_id for item in results_again
     ]
+
+
+def test_search_many_matches_per_query_search(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    texts = [
+        "borrower income verified from payroll",
+        "credit score improved over the last year",
+        "appraisal supports the property value",
+        "monthly liabilities include an auto loan",
+    ]
+    store.add_documents(
+        [
+            make_chunk(f"case_{case_index}", f"doc_{row % 2}", f"c{row}", text)
+            for case_index in range(3)
+            for row, text in enumerate(texts)
+        ]
+    )
+    queries = [
+        ("case_0", "income payroll"),
+        ("case_1", "credit score"),
+        ("case_0", "auto loan liabilities"),
+        ("missing", "income"),
+        ("case_2", "appraisal value"),
+    ]
+
+    batched = store.search_many(queries, top_k=2, min_score=0.1)
+
+    assert len(batched) == len(queries)
+    assert batched[3] == []
+    for (case_id, query), results in zip(queries, batched):
+        expected = store.search(query, top_k=2, case_id=case_id, min_score=0.1)
+        assert [item.chunk for item in results] == [item.chunk for item in expected]
+        assert [round(item.score, 5) for item in results] == [
+            round(item.score, 5) for item in expected
+        ]
+    assert store.search_many([], top_k=2) == []
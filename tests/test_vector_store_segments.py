@@ -0,0 +1,155 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from evidence_helpers import is_memory_mapped, make_chunk, read_manifest
+
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml import vector_store
+from caseflow.ml.embeddings import embed_text
+from caseflow.ml.vector_store import FileVectorStore
+
+
+def test_segments_are_memory_mapped_after_cold_start(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json", dims=16)
+    store.add_documents(
+        [
+            make_chunk("case_1", "doc_a", "c1", "income verified — paystub ✓"),
+            make_chunk("case_1", "doc_b", "c2", "appraisal notes"),
+        ]
+    )
+    assert store.compact("case_1") == 1
+    warm = store.search("income", top_k=2, case_id="case_1")
+
+    manifest = read_manifest(tmp_path)
+    entry = manifest["cases"]["case_1"]
+    shard_dir = tmp_path / "cases" / entry["shard"]
+    stem = shard_dir / f"seg-{entry['segment']:08d}"
+    assert stem.with_suffix(".f32").stat().st_size == 2 * 16 * 4
+    assert "embedding" not in stem.with_suffix(".json").read_text(encoding="utf-8")
+
+    FileVectorStore._CACHE.clear()
+    FileVectorStore._INDEX_CACHE.clear()
+    cold_store = FileVectorStore(index_file=tmp_path / "index.json", dims=16)
+    cold = cold_store.search("income", top_k=2, case_id="case_1")
+
+    assert [(r.chunk, r.score) for r in cold] == [(r.chunk, r.score) for r in warm]
+    assert cold[0].chunk.text == "income verified — paystub ✓"
+    cached_index = FileVectorStore._INDEX_CACHE.get(str(shard_dir.resolve()))[1]
+    assert is_memory_mapped(cached_index.embeddings)
+
+
+def test_cross_case_search_keeps_a_bounded_number_of_segments_open(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if not Path("/proc/self/fd").is_dir():
+        pytest.skip("needs /proc/self/fd")
+    monkeypatch.setenv("EVIDENCE_INDEX_CACHE_SIZE", "4")
+    clear_settings_cache()
+    try:
+        store = FileVectorStore(index_file=tmp_path / "index.json", dims=256)
+        # Each case dilutes the query terms with a different number of
+        # fillers, so no two cases tie and only the top rows stay pooled.
+        store.add_documents(
+            [
+                make_chunk(
+                    f"case_{n:02d}",
+                    "doc_a",
+                    "c1",
+                    " ".join(["income verified", *(f"w{n}x{i}" for i in range(n))]),
+                )
+                for n in range(40)
+            ]
+        )
+        store.compact()
+        FileVectorStore._INDEX_CACHE.clear()
+        FileVectorStore._LEXICAL_CACHE.clear()
+
+        baseline = len(os.listdir("/proc/self/fd"))
+        peak = baseline
+        map_readonly = vector_store._map_readonly
+
+        def counting_map(path: Path):
+            nonlocal peak
+            mapped = map_readonly(path)
+            peak = max(peak, len(os.listdir("/proc/self/fd")))
+            return mapped
+
+        monkeypatch.setattr(vector_store, "_map_readonly", counting_map)
+        results = store.search("income verified", top_k=3)
+    finally:
+        clear_settings_cache()
+
+    assert [r.chunk.case_id for r in results] == ["case_00", "case_01", "case_02"]
+    assert len(FileVectorStore._INDEX_CACHE) <= 4
+    # Two mapped files per segment: the cache plus the pooled candidates.
+    assert peak - baseline <= 2 * (4 + 3) + 2
+
+
+def test_rewrites_publish_a_new_segment_and_drop_the_old_one(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents([make_chunk("case_1", "doc_a", "c1", "income verified")])
+    first = read_manifest(tmp_path)
+    shard_dir = tmp_path / "cases" / first["cases"]["case_1"]["shard"]
+
+    store.compact()
+    store.add_documents([make_chunk("case_1", "doc_a", "c2", "liabilities summary")])
+    store.compact()
+    second = read_manifest(tmp_path)
+
+    assert second["cases"]["case_1"]["segment"] == 2
+    assert second["cases"]["case_1"]["wal_bytes"] == 0
+    assert sorted(path.name for path in shard_dir.iterdir()) == [
+        "seg-00000002.bm25",
+        "seg-00000002.f32",
+        "seg-00000002.json",
+        "seg-00000002.txt",
+    ]
+    assert store.case_stats("case_1")["num_chunks"] == 2
+
+
+def test_legacy_record_shards_are_read_and_upgraded(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents([make_chunk("case_1", "doc_a", "c0", "placeholder")])
+    store.compact()
+    manifest = read_manifest(tmp_path)
+    shard_key = manifest["cases"]["case_1"]["shard"]
+    shard_dir = tmp_path / "cases" / shard_key
+    for path in shard_dir.iterdir():
+        path.unlink()
+    (shard_dir / "records.json").write_text(
+        json.dumps(
+            [
+                {
+                    "case_id": "case_1",
+                    "document_id": "doc_a",
+                    "chunk_id": "c1",
+                    "text": "income verified",
+                    "start_char": 0,
+                    "end_char": 15,
+                    "source": "provenance",
+                    "page": None,
+                    "embedding": embed_text("income verified"),
+                }
+            ]
+        ),
+        encoding="utf-8",
+    )
+    (tmp_path / "manifest.json").write_text(
+        json.dumps(
+            {"cases": {"case_1": {"shard": shard_key, "num_chunks": 1}}},
+        ),
+        encoding="utf-8",
+    )
+    FileVectorStore._CACHE.clear()
+    FileVectorStore._INDEX_CACHE.clear()
+
+    results = store.search("income", top_k=5, case_id="case_1")
+    assert [item.chunk.chunk_id for item in results] == ["c1"]
+
+    store.add_documents([make_chunk("case_1", "doc_b", "c2", "appraisal notes")])
+    assert store.case_stats("case_1")["num_chunks"] == 2
+    store.compact()
+    assert not (shard_dir / "records.json").exists()
+    assert store.case_stats("case_1")["num_chunks"] == 2
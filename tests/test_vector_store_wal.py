@@ -0,0 +1,324 @@
+import base64
+import json
+from pathlib import Path
+
+import numpy as np
+from evidence_helpers import (
+    is_memory_mapped,
+    make_chunk,
+    read_manifest,
+    write_manifest,
+)
+from fastapi.testclient import TestClient
+
+from caseflow.api.app import app
+from caseflow.core.settings import clear_settings_cache
+from caseflow.ml.vector_store import FileVectorStore
+
+
+def _entry(root: Path, case_id: str) -> dict:
+    return read_manifest(root)["cases"][case_id]
+
+
+def _snapshot(store: FileVectorStore, case_id: str) -> list[tuple[str, float]]:
+    return [
+        (item.chunk.chunk_id, item.score)
+        for item in store.search("income liabilities", top_k=10, case_id=case_id)
+    ]
+
+
+def _cold(root: Path) -> FileVectorStore:
+    FileVectorStore._CACHE.clear()
+    FileVectorStore._INDEX_CACHE.clear()
+    return FileVectorStore(index_file=root / "index.json")
+
+
+def test_appends_leave_the_base_segment_untouched(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents([make_chunk("case_1", "doc_a", "c1", "income verified")])
+    store.compact()
+    entry = _entry(tmp_path, "case_1")
+    shard_dir = tmp_path / "cases" / entry["shard"]
+    segment = shard_dir / f"seg-{entry['segment']:08d}.f32"
+    segment_bytes = segment.read_bytes()
+
+    store.add_documents([make_chunk("case_1", "doc_b", "c2", "liabilities summary")])
+    first_wal = _entry(tmp_path, "case_1")["wal_bytes"]
+    store.add_documents([make_chunk("case_1", "doc_c", "c3", "income and liabilities")])
+    second_wal = _entry(tmp_path, "case_1")["wal_bytes"]
+
+    assert segment.read_bytes() == segment_bytes
+    assert 0 < first_wal < second_wal < 2 * first_wal + 200
+    assert _entry(tmp_path, "case_1")["num_chunks"] == 3
+
+    warm = _snapshot(store, "case_1")
+    assert _snapshot(_cold(tmp_path), "case_1") == warm
+
+
+def test_readers_ignore_uncommitted_wal_bytes(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents([make_chunk("case_1", "doc_a", "c1", "income verified")])
+    entry = _entry(tmp_path, "case_1")
+    wal = tmp_path / "cases" / entry["shard"] / "wal-00000000.jsonl"
+    with wal.open("ab") as handle:
+        handle.write(b'{"op":"upsert","records":[{"chunk_')
+
+    cold = _cold(tmp_path)
+    assert [chunk_id for chunk_id, _ in _snapshot(cold, "case_1")] == ["c1"]
+
+    cold.add_documents([make_chunk("case_1", "doc_b", "c2", "liabilities summary")])
+    assert wal.stat().st_size == _entry(tmp_path, "case_1")["wal_bytes"]
+    assert len(_snapshot(_cold(tmp_path), "case_1")) == 2
+
+
+def test_compaction_folds_the_log_without_changing_results(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents(
+        [
+            make_chunk("case_1", "doc_a", "c1", "income verified"),
+            make_chunk("case_1", "doc_b", "c2", "liabilities summary"),
+        ]
+    )
+    store.add_documents([make_chunk("case_1", "doc_a", "c1", "income re-verified")])
+    store.overwrite_case(
+        "case_1",
+        [
+            make_chunk("case_1", "doc_a", "c1", "income verified by paystub"),
+            make_chunk("case_1", "doc_c", "c3", "liabilities and income"),
+        ],
+    )
+    store.add_documents([make_chunk("case_2", "doc_z", "c9", "income")])
+    before = _snapshot(store, "case_1")
+    assert [chunk_id for chunk_id, _ in before] == ["c3", "c1"]
+
+    assert store.compact(min_wal_bytes=10**9) == 0
+    assert store.compact("case_1") == 1
+    assert store.wal_bytes("case_1") == 0
+    assert store.wal_bytes("case_2") > 0
+
+    assert _snapshot(store, "case_1") == before
+    assert _snapshot(_cold(tmp_path), "case_1") == before
+    shard_dir = tmp_path / "cases" / _entry(tmp_path, "case_1")["shard"]
+    assert not any(path.suffix == ".jsonl" for path in shard_dir.iterdir())
+
+
+def test_case_batches_commit_only_after_the_last_batch(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents([make_chunk("case_1", "doc_a", "c1", "income verified")])
+    before = _snapshot(store, "case_1")
+
+    def batches():
+        yield [make_chunk("case_1", "doc_b", "c2", "liabilities summary")]
+        assert _snapshot(_cold(tmp_path), "case_1") == before
+        yield [make_chunk("case_2", "doc_z", "c9", "income")]
+
+    try:
+        store.write_case_batches("case_1", batches(), overwrite=True)
+        assert False, "Expected ValueError for foreign chunks"
+    except ValueError as exc:
+        assert "case_2" in str(exc)
+    # The index built for the uncommitted batch is not kept around.
+    assert not FileVectorStore._INDEX_CACHE
+    assert _snapshot(_cold(tmp_path), "case_1") == before
+
+    written = store.write_case_batches(
+        "case_1",
+        iter(
+            [
+                [make_chunk("case_1", "doc_b", "c2", "liabilities summary")],
+                [],
+                [make_chunk("case_1", "doc_c", "c3", "income and liabilities")],
+            ]
+        ),
+        overwrite=True,
+    )
+    assert written == 2
+    assert sorted(chunk_id for chunk_id, _ in _snapshot(_cold(tmp_path), "case_1")) == [
+        "c2",
+        "c3",
+    ]
+
+
+def test_index_endpoint_compacts_in_background_past_threshold(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("PROVENANCE_DIR", str(tmp_path / "provenance"))
+    monkeypatch.setenv("EVIDENCE_INDEX_DIR", str(tmp_path / "evidence_index"))
+    monkeypatch.setenv("EVIDENCE_WAL_COMPACT_BYTES", "1")
+    monkeypatch.setenv("OCR_ENGINE", "noop")
+    clear_settings_cache()
+
+    client = TestClient(app)
+    text = "Income verification for background compaction."
+    ocr = client.post(
+        "/ocr/extract",
+        json={
+            "case_id": "case_wal_1",
+            "document": {
+                "filename": "wal.txt",
+                "content_type": "text/plain",
+                "content_b64": base64.b64encode(text.encode("utf-8")).decode("ascii"),
+            },
+        },
+    )
+    assert ocr.status_code == 200
+
+    indexed = client.post(
+        "/mortgage/case_wal_1/evidence/index",
+        json={"documents": [{"document_id": ocr.json()["document_id"]}]},
+    )
+    assert indexed.status_code == 200
+
+    entry = _entry(tmp_path / "evidence_index", "case_wal_1")
+    assert entry["wal_bytes"] == 0
+    assert entry["segment"] == 1
+
+
+def test_fingerprints_survive_compaction_and_drop_on_rewrite(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.write_case_batches(
+        "case_1",
+        [
+            [
+                make_chunk("case_1", "doc_a", "c1", "income verified"),
+                make_chunk("case_1", "doc_b", "c1", "liabilities summary"),
+            ]
+        ],
+        fingerprints={"doc_a": "fp-a", "doc_b": "fp-b"},
+    )
+    store.compact()
+    assert store.document_fingerprints("case_1") == {"doc_a": "fp-a", "doc_b": "fp-b"}
+
+    store.write_case_batches("case_1", [], replace_documents=["doc_b"])
+    store.add_documents([make_chunk("case_1", "doc_a", "c2", "income and assets")])
+
+    assert store.document_fingerprints("case_1") == {}
+    assert [
+        item["document_id"] for item in store.case_stats("case_1")["documents"]
+    ] == ["doc_a"]
+    assert _cold(tmp_path).case_stats("case_1")["num_chunks"] == 2
+
+
+def test_appends_extend_the_cached_index_in_place(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents([make_chunk("case_1", "doc_a", "c1", "income verified")])
+    store.compact()
+    store.add_documents([make_chunk("case_1", "doc_b", "c2", "liabilities summary")])
+    older = store._load_case_index("case_1")
+
+    store.add_documents(
+        [
+            make_chunk("case_1", "doc_b", "c3", "income and liabilities"),
+            make_chunk("case_1", "doc_with_a_much_longer_id", "c4", "appraisal"),
+        ]
+    )
+    newer = store._load_case_index("case_1")
+
+    # Both snapshots share buffers; the older one still ends where it did.
+    assert newer.arena is older.arena
+    assert older.row_keys() == [("doc_a", "c1"), ("doc_b", "c2")]
+    assert newer.row_keys()[3] == ("doc_with_a_much_longer_id", "c4")
+    assert _entry(tmp_path, "case_1")["documents"] == {
+        "doc_a": 1,
+        "doc_b": 2,
+        "doc_with_a_much_longer_id": 1,
+    }
+
+    # Replacing a chunk copies the case once and keeps the counts right.
+    store.add_documents([make_chunk("case_1", "doc_b", "c2", "revised summary")])
+    replaced = store._load_case_index("case_1")
+    assert len(replaced) == 4
+    assert [chunk.text for chunk in store.case_chunks("case_1")].count(
+        "revised summary"
+    ) == 1
+    assert _entry(tmp_path, "case_1")["documents"]["doc_b"] == 2
+    assert _snapshot(_cold(tmp_path), "case_1") == _snapshot(store, "case_1")
+
+
+def test_wal_packs_embeddings_and_still_reads_list_entries(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    chunks = [
+        make_chunk("case_1", "doc_a", f"c{i}", f"income line {i}") for i in range(16)
+    ]
+    store.add_documents(chunks)
+    entry = _entry(tmp_path, "case_1")
+    wal_path = tmp_path / "cases" / entry["shard"] / "wal-00000000.jsonl"
+    line = json.loads(wal_path.read_text(encoding="utf-8").splitlines()[0])
+
+    assert line["embeddings"]["shape"] == [16, 128]
+    assert all("embedding" not in record for record in line["records"])
+    # 128 float32 values are 684 base64 characters per chunk.
+    assert entry["wal_bytes"] / len(chunks) < 900
+
+    # A WAL written with one embedding list per record stays readable.
+    expected = store._load_case_index("case_1").embeddings
+    packed = line.pop("embeddings")
+    vectors = np.frombuffer(base64.b64decode(packed["data"]), dtype="<f4")
+    for record, vector in zip(line["records"], vectors.reshape(16, 128)):
+        record["embedding"] = vector.tolist()
+    wal_path.write_text(json.dumps(line) + "\n", encoding="utf-8")
+    manifest = read_manifest(tmp_path)
+    manifest["cases"]["case_1"]["wal_bytes"] = wal_path.stat().st_size
+    write_manifest(tmp_path, manifest)
+
+    legacy = _cold(tmp_path)._load_case_index("case_1")
+    np.testing.assert_array_equal(legacy.embeddings, expected)
+
+
+def test_compaction_threshold_scales_with_the_base_segment(tmp_path: Path) -> None:
+    store = FileVectorStore(index_file=tmp_path / "index.json")
+    store.add_documents(
+        [make_chunk("case_1", "doc_a", f"c{i}", f"income line {i}") for i in range(8)]
+    )
+    # Without a base segment any WAL is worth compacting.
+    assert store.compact("case_1", min_wal_bytes=1 << 30, min_wal_ratio=0.25) == 1
+    segment_bytes = _entry(tmp_path, "case_1")["segment_bytes"]
+
+    store.add_documents([make_chunk("case_1", "doc_b", "c1", "appraisal")])
+    assert store.wal_bytes("case_1") < segment_bytes // 4
+    assert store.compact("case_1", min_wal_bytes=1 << 30, min_wal_ratio=0.25) == 0
+
+    store.add_documents(
+        [
+            make_chunk("case_1", "doc_b", f"c{i}", f"liabilities {i}")
+            for i in range(2, 5)
+        ]
+    )
+    assert store.wal_bytes("case_1") >= segment_bytes // 4
+    assert store.compact("case_1", min_wal_bytes=1 << 30, min_wal_ratio=0.25) == 1
+
+
+def test_index_endpoint_serves_cases_from_memory_mapped_segments(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("PROVENANCE_DIR", str(tmp_path / "provenance"))
+    monkeypatch.setenv("EVIDENCE_INDEX_DIR", str(tmp_path / "evidence_index"))
+    monkeypatch.delenv("EVIDENCE_WAL_COMPACT_BYTES", raising=False)
+    monkeypatch.delenv("EVIDENCE_WAL_COMPACT_RATIO", raising=False)
+    monkeypatch.setenv("OCR_ENGINE", "noop")
+    clear_settings_cache()
+
+    client = TestClient(app)
+    text = "Income verification served from a memory-mapped segment."
+    ocr = client.post(
+        "/ocr/extract",
+        json={
+            "case_id": "case_mmap_1",
+            "document": {
+                "filename": "mmap.txt",
+                "content_type": "text/plain",
+                "content_b64": base64.b64encode(text.encode("utf-8")).decode("ascii"),
+            },
+        },
+    )
+    indexed = client.post(
+        "/mortgage/case_mmap_1/evidence/index",
+        json={"documents": [{"document_id": ocr.json()["document_id"]}]},
+    )
+    assert indexed.status_code == 200
+
+    root = tmp_path / "evidence_index"
+    assert _entry(root, "case_mmap_1")["wal_bytes"] == 0
+    cold = _cold(root)
+    assert cold.search("income", top_k=1, case_id="case_mmap_1")
+    assert is_memory_mapped(cold._load_case_index("case_mmap_1").embeddings)